@@ -0,0 +1,59 @@
+"""Compare a `JSONSchema(cache=MemoryCache())` hit with generating the
+same document from scratch.
+
+A hit looks up the memoized fingerprint of the schema and returns the
+stored (frozen) document; a cold dump traverses every field.
+
+    python benchmarks/cache.py [--number N] [--repeat R]
+"""
+
+import argparse
+import timeit
+
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import JSONSchema
+from marshmallow_jsonschema.cache import MemoryCache
+
+
+class AddressSchema(Schema):
+    street = fields.String(required=True, validate=validate.Length(max=80))
+    city = fields.String(required=True)
+    zip_code = fields.String(validate=validate.Regexp(r"\d{5}"))
+
+
+class UserSchema(Schema):
+    name = fields.String(required=True, validate=validate.Length(min=1, max=40))
+    email = fields.Email(required=True)
+    age = fields.Integer(validate=validate.Range(min=0, max=150))
+    role = fields.String(validate=validate.OneOf(["admin", "user"]))
+    address = fields.Nested(AddressSchema)
+    previous = fields.List(fields.Nested(AddressSchema))
+    tags = fields.List(fields.String())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    memory = MemoryCache()
+    JSONSchema(cache=memory).dump(UserSchema())
+
+    def hit():
+        JSONSchema(cache=memory).dump(UserSchema())
+
+    def cold():
+        JSONSchema().dump(UserSchema())
+
+    results = []
+    for name, func in (("cold", cold), ("cache hit", hit)):
+        best = min(timeit.repeat(func, number=args.number, repeat=args.repeat))
+        results.append(best / args.number)
+        print("{:<10} {:>10.1f} us".format(name, best / args.number * 1e6))
+    print("speedup    {:>10.2f}x".format(results[0] / results[1]))
+
+
+if __name__ == "__main__":
+    main()
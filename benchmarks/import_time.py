@@ -0,0 +1,85 @@
+"""Measure the cost of `import marshmallow_jsonschema` in fresh interpreters.
+
+Compares the package import against the modules it used to import
+eagerly (`importlib.metadata` plus the optional marshmallow-union,
+marshmallow-enum and marshmallow-oneofschema integrations), which are
+now only loaded when a schema actually needs them.
+
+    python benchmarks/import_time.py [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+OPTIONAL_MODULES = (
+    "importlib.metadata",
+    "marshmallow_union",
+    "marshmallow_enum",
+    "marshmallow_oneofschema",
+)
+
+SCENARIOS = {
+    "marshmallow": "import marshmallow",
+    "marshmallow_jsonschema (lazy)": "import marshmallow_jsonschema",
+    "marshmallow_jsonschema + eager optionals": "; ".join(
+        ["import marshmallow_jsonschema"]
+        + ["import {}".format(module) for module in OPTIONAL_MODULES]
+    ),
+}
+
+TIMER = """
+import sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+loaded = [m for m in {optional!r} if m in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+
+def measure(statement, runs):
+    timings = []
+    loaded = ""
+    for _ in range(runs):
+        out = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                TIMER.format(statement=statement, optional=OPTIONAL_MODULES),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.split()
+        timings.append(float(out[0]))
+        loaded = out[1] if len(out) > 1 else ""
+    return statistics.median(timings), loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    results = {}
+    for label, statement in SCENARIOS.items():
+        results[label], loaded = measure(statement, args.runs)
+        print(
+            "{:<42} {:8.1f} ms   optional modules loaded: {}".format(
+                label, results[label] * 1000, loaded or "-"
+            )
+        )
+
+    lazy = results["marshmallow_jsonschema (lazy)"]
+    eager = results["marshmallow_jsonschema + eager optionals"]
+    print(
+        "saved per import: {:.1f} ms ({:.0%})".format(
+            (eager - lazy) * 1000, 1 - lazy / eager
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
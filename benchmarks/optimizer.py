@@ -0,0 +1,86 @@
+"""Compare `jsonschema` validation speed on raw vs optimized documents.
+
+Generates a schema that exercises every default optimizer pass
+(nullable tuples, `validate.Equal`, unions with repeated candidates),
+checks that the raw and optimized documents agree on every instance,
+then times validating the same batch of instances against each.
+
+    python benchmarks/optimizer.py [--instances N] [--repeat R]
+"""
+
+import argparse
+import random
+import time
+
+from jsonschema import Draft7Validator
+from marshmallow import Schema, fields, validate
+from marshmallow_union import Union
+
+from marshmallow_jsonschema import JSONSchema
+from marshmallow_jsonschema.optimizer import optimize
+
+FIELD_GROUPS = 10
+
+
+def build_schema():
+    attrs = {}
+    for i in range(FIELD_GROUPS):
+        attrs["pair_%d" % i] = fields.Tuple(
+            (fields.Integer(), fields.String()), allow_none=True
+        )
+        attrs["kind_%d" % i] = fields.String(validate=validate.Equal("kind"))
+        attrs["amount_%d" % i] = Union(
+            [fields.Integer(), fields.Integer(), fields.Float(), fields.Float()]
+        )
+    return Schema.from_dict(attrs, name="BenchmarkSchema")
+
+
+def make_instance(rng):
+    instance = {}
+    for i in range(FIELD_GROUPS):
+        instance["pair_%d" % i] = rng.choice([None, [1, "a"], ["a", 1]])
+        instance["kind_%d" % i] = rng.choice(["kind", "kind", "other"])
+        instance["amount_%d" % i] = rng.choice([1, 1.5, "x"])
+    return instance
+
+
+def time_validation(validator, instances, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for instance in instances:
+            for _error in validator.iter_errors(instance):
+                pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--instances", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    schema = build_schema()()
+    raw = JSONSchema().dump(schema)
+    optimized = optimize(raw)
+    instances = [make_instance(rng) for _ in range(args.instances)]
+
+    raw_validator = Draft7Validator(raw)
+    optimized_validator = Draft7Validator(optimized)
+    for instance in instances:
+        assert raw_validator.is_valid(instance) == optimized_validator.is_valid(
+            instance
+        ), instance
+
+    raw_seconds = time_validation(raw_validator, instances, args.repeat)
+    optimized_seconds = time_validation(optimized_validator, instances, args.repeat)
+    print("{:<10} {:>10}".format("document", "ms"))
+    print("{:<10} {:>10.1f}".format("raw", raw_seconds * 1000))
+    print("{:<10} {:>10.1f}".format("optimized", optimized_seconds * 1000))
+    print("speedup    {:>10.2f}x".format(raw_seconds / optimized_seconds))
+
+
+if __name__ == "__main__":
+    main()
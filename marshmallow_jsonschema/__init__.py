@@ -1,9 +1,26 @@
-from importlib.metadata import version
+import typing
 
-__version__ = version("marshmallow-jsonschema")
 __license__ = "MIT"
 
 from .base import JSONSchema
-from .exceptions import UnsupportedValueError
+from .exceptions import RegexComplexityWarning, UnsupportedValueError
 
-__all__ = ("JSONSchema", "UnsupportedValueError", "__version__", "__license__")
+__all__ = (
+    "JSONSchema",
+    "RegexComplexityWarning",
+    "UnsupportedValueError",
+    "__version__",
+    "__license__",
+)
+
+__version__: str
+
+
+def __getattr__(name: str) -> typing.Any:
+    # Resolved on first access: importing `importlib.metadata` costs more
+    # than the rest of the package import put together.
+    if name == "__version__":
+        from importlib.metadata import version
+
+        return version("marshmallow-jsonschema")
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
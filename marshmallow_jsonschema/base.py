@@ -1,19 +1,26 @@
 import datetime
 import decimal
+import importlib
 import json
+import time
 import uuid
+import warnings
 from enum import Enum
 from inspect import isclass, signature
 import typing
 
-from importlib.metadata import version as _pkg_version
-
 from marshmallow import fields, missing, Schema, validate
 from marshmallow.class_registry import get_class
 from marshmallow.decorators import post_dump
 
 from marshmallow import INCLUDE, EXCLUDE, RAISE
 
+# The module-level names below are annotated here but resolved lazily by
+# the module `__getattr__`: `importlib.metadata` and the optional
+# third-party integrations are comparatively slow to import, and most
+# schemas never need them. Internally we only import an integration the
+# first time a field or schema whose class comes from it shows up.
+
 # Major-version sniff so callers can branch on m3 vs m4 if they need to.
 # Used internally to gate features that the underlying marshmallow
 # release no longer provides (Schema(context=...), Schema.context, etc.).
@@ -21,10 +28,6 @@ from marshmallow import INCLUDE, EXCLUDE, RAISE
 # so read the installed distribution version instead. Fall back to 3 if
 # the metadata isn't present (e.g. a vendored copy with no dist-info).
 MARSHMALLOW_MAJOR: int
-try:
-    MARSHMALLOW_MAJOR = int(_pkg_version("marshmallow").split(".", 1)[0])
-except Exception:
-    MARSHMALLOW_MAJOR = 3
 
 # marshmallow 3.x exposed the private `_Missing` type on `marshmallow.utils`;
 # marshmallow 4.x removed it. Keep the runtime constant for any external
@@ -33,20 +36,12 @@ except Exception:
 _Missing = type(missing)
 
 ALLOW_UNIONS: bool
-try:
-    from marshmallow_union import Union
-
-    ALLOW_UNIONS = True
-except ImportError:
-    ALLOW_UNIONS = False
-
 ALLOW_MARSHMALLOW_ENUM: bool
-try:
-    from marshmallow_enum import EnumField, LoadDumpOptions
-
-    ALLOW_MARSHMALLOW_ENUM = True
-except ImportError:
-    ALLOW_MARSHMALLOW_ENUM = False
+ALLOW_ONEOFSCHEMA: bool
+# Backward-compat alias: historically this meant "marshmallow_enum is
+# importable", and external code has checked it as such. Keep it pointed
+# at the third-party flag so the semantic doesn't shift under callers.
+ALLOW_ENUMS: bool
 
 ALLOW_NATIVE_ENUM: bool
 try:
@@ -56,20 +51,116 @@ try:
 except ImportError:
     ALLOW_NATIVE_ENUM = False
 
-ALLOW_ONEOFSCHEMA: bool
-try:
-    from marshmallow_oneofschema import OneOfSchema
+# Lazily-resolved module attributes: name -> (module, attribute). The
+# `ALLOW_*` flags are true when the attribute can be imported; the class
+# names are re-exported for callers that used to import them from here.
+_OPTIONAL_FLAGS = {
+    "ALLOW_UNIONS": ("marshmallow_union", "Union"),
+    "ALLOW_MARSHMALLOW_ENUM": ("marshmallow_enum", "EnumField"),
+    "ALLOW_ENUMS": ("marshmallow_enum", "EnumField"),
+    "ALLOW_ONEOFSCHEMA": ("marshmallow_oneofschema", "OneOfSchema"),
+}
+_OPTIONAL_NAMES = {
+    "Union": ("marshmallow_union", "Union"),
+    "EnumField": ("marshmallow_enum", "EnumField"),
+    "LoadDumpOptions": ("marshmallow_enum", "LoadDumpOptions"),
+    "OneOfSchema": ("marshmallow_oneofschema", "OneOfSchema"),
+}
 
-    ALLOW_ONEOFSCHEMA = True
-except ImportError:
-    ALLOW_ONEOFSCHEMA = False
+_OPTIONAL_IMPORTS: typing.Dict[typing.Tuple[str, str], typing.Any] = {}
+_OPTIONAL_INSTANCE_CACHE: typing.Dict[typing.Tuple[type, str, str], bool] = {}
+_MARSHMALLOW_MAJOR: typing.Optional[int] = None
 
-# Backward-compat alias: historically this meant "marshmallow_enum is
-# importable", and external code has checked it as such. Keep it pointed
-# at the third-party flag so the semantic doesn't shift under callers.
-ALLOW_ENUMS: bool = ALLOW_MARSHMALLOW_ENUM
 
-from .exceptions import UnsupportedValueError
+def _load_optional(module: str, name: str) -> typing.Any:
+    """Import `module.name`, or return None when it isn't available.
+    The outcome is remembered, so each integration is imported at most
+    once."""
+    key = (module, name)
+    try:
+        return _OPTIONAL_IMPORTS[key]
+    except KeyError:
+        pass
+    try:
+        value = getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError):
+        value = None
+    _OPTIONAL_IMPORTS[key] = value
+    return value
+
+
+def _is_optional_instance(obj, module: str, name: str) -> bool:
+    """`isinstance(obj, module.name)` that only imports `module` when
+    something in `obj`'s class hierarchy was defined there. Cached per
+    class."""
+    cls = obj.__class__
+    key = (cls, module, name)
+    verdict = _OPTIONAL_INSTANCE_CACHE.get(key)
+    if verdict is None:
+        verdict = False
+        if any(
+            getattr(base, "__module__", "").partition(".")[0] == module
+            for base in cls.__mro__
+        ):
+            target = _load_optional(module, name)
+            verdict = target is not None and issubclass(cls, target)
+        _OPTIONAL_INSTANCE_CACHE[key] = verdict
+    return verdict
+
+
+def _is_union_field(field) -> bool:
+    return _is_optional_instance(field, "marshmallow_union", "Union")
+
+
+def _is_marshmallow_enum_field(field) -> bool:
+    return _is_optional_instance(field, "marshmallow_enum", "EnumField")
+
+
+def _is_oneof_schema(obj) -> bool:
+    return _is_optional_instance(obj, "marshmallow_oneofschema", "OneOfSchema")
+
+
+def _marshmallow_enum_by_value(field) -> bool:
+    """Whether a `marshmallow_enum.EnumField` loads by value."""
+    load_dump_options = _load_optional("marshmallow_enum", "LoadDumpOptions")
+    return field.load_by == load_dump_options.value
+
+
+def _marshmallow_major() -> int:
+    global _MARSHMALLOW_MAJOR
+    if _MARSHMALLOW_MAJOR is None:
+        from importlib.metadata import version
+
+        try:
+            _MARSHMALLOW_MAJOR = int(version("marshmallow").split(".", 1)[0])
+        except Exception:
+            _MARSHMALLOW_MAJOR = 3
+    return _MARSHMALLOW_MAJOR
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name == "MARSHMALLOW_MAJOR":
+        return _marshmallow_major()
+    if name in _OPTIONAL_FLAGS:
+        return _load_optional(*_OPTIONAL_FLAGS[name]) is not None
+    if name in _OPTIONAL_NAMES:
+        value = _load_optional(*_OPTIONAL_NAMES[name])
+        if value is not None:
+            return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+from .canonical import (
+    ANCHOR_PREFIX,
+    HASH_KEY,
+    canonicalize,
+    definition_hash,
+    definition_hashes,
+)
+from .exceptions import RegexComplexityWarning, UnsupportedValueError
+from .frozen import freeze, thaw
+from .hooks import _field_label, _global_hooks
+from .stats import GenerationStats
 from .validation import (
     handle_contains_only,
     handle_equal,
@@ -136,10 +227,6 @@ MARSHMALLOW_TO_PY_TYPES_PAIRS = [
     (fields.Nested, dict),
 ]
 
-if ALLOW_MARSHMALLOW_ENUM:
-    # We currently only support loading enum's from their names. So the possible
-    # values will always map to string in the JSONSchema
-    MARSHMALLOW_TO_PY_TYPES_PAIRS.append((EnumField, Enum))
 if ALLOW_NATIVE_ENUM:
     MARSHMALLOW_TO_PY_TYPES_PAIRS.append((NativeEnumField, Enum))
 
@@ -175,6 +262,37 @@ def _by_value_enum_strings(enum_cls) -> typing.List[str]:
     return values
 
 
+# Scalars `json.dumps` encodes natively. The same types are accepted as
+# dict keys (non-str keys are coerced to strings).
+_JSON_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+# Verdicts for deeply-immutable containers (tuples of scalars/tuples),
+# keyed by identity. The value is stored next to the verdict so its id
+# can't be recycled while the entry is alive.
+_SERIALIZABLE_CACHE: typing.Dict[int, typing.Tuple[typing.Any, bool]] = {}
+_SERIALIZABLE_CACHE_MAX = 1024
+
+
+_ENUM_VALUES_CACHE: typing.Dict[
+    typing.Tuple[typing.Any, bool], typing.Tuple[str, ...]
+] = {}
+
+
+def _enum_values(enum_cls, by_value: bool) -> typing.Tuple[str, ...]:
+    """The JSON Schema `enum` entries for `enum_cls`: member names, or
+    member values when `by_value` is set. Computed once per
+    (enum class, by_value)."""
+    key = (enum_cls, by_value)
+    values = _ENUM_VALUES_CACHE.get(key)
+    if values is None:
+        if by_value:
+            values = tuple(_by_value_enum_strings(enum_cls))
+        else:
+            values = tuple(member.name for member in enum_cls)
+        _ENUM_VALUES_CACHE[key] = values
+    return values
+
+
 def _is_json_serializable(value) -> bool:
     """Return True if `value` can be emitted into a JSON schema directly.
 
@@ -183,12 +301,262 @@ def _is_json_serializable(value) -> bool:
     only be serialized by marshmallow's own field-specific logic - they
     aren't valid JSON literals, so including them as `default` produces
     a schema that can't round-trip through `json.dumps`.
+
+    Agrees with `json.dumps` under its default settings, but walks the
+    value structurally instead of encoding it, stopping at the first node
+    that isn't JSON-native. Self-referencing containers are reported as
+    not serializable.
     """
-    try:
-        json.dumps(value)
+    if isinstance(value, _JSON_SCALAR_TYPES):
         return True
-    except TypeError:
-        return False
+    if type(value) is tuple:
+        cached = _SERIALIZABLE_CACHE.get(id(value))
+        if cached is not None and cached[0] is value:
+            return cached[1]
+        verdict, immutable = _check_json_node(value, set())
+        if immutable:
+            if len(_SERIALIZABLE_CACHE) >= _SERIALIZABLE_CACHE_MAX:
+                _SERIALIZABLE_CACHE.clear()
+            _SERIALIZABLE_CACHE[id(value)] = (value, verdict)
+        return verdict
+    return _check_json_node(value, set())[0]
+
+
+def _check_json_node(value, active: typing.Set[int]) -> typing.Tuple[bool, bool]:
+    """Structural half of `_is_json_serializable`. Returns
+    `(serializable, immutable)`, where `immutable` says whether the
+    verdict can be cached for this exact object. `active` holds the ids
+    of the containers currently being walked, for cycle detection."""
+    if isinstance(value, _JSON_SCALAR_TYPES):
+        return True, True
+    if isinstance(value, (list, tuple)):
+        items: typing.Iterable[typing.Any] = value
+        immutable = type(value) is tuple
+    elif isinstance(value, dict):
+        for key in value:
+            if not isinstance(key, _JSON_SCALAR_TYPES):
+                return False, False
+        items = value.values()
+        immutable = False
+    else:
+        return False, False
+
+    if id(value) in active:
+        return False, False
+    active.add(id(value))
+    try:
+        for item in items:
+            ok, item_immutable = _check_json_node(item, active)
+            if not ok:
+                return False, False
+            immutable = immutable and item_immutable
+    finally:
+        active.discard(id(value))
+    return True, immutable
+
+
+# Merged field-metadata views, keyed by the identity of `field.metadata`.
+# marshmallow shallow-copies declared fields for every Schema instance,
+# so the metadata dict is shared by all copies of a field and makes a
+# stable key across dumps. The dict itself is stored next to the view so
+# its id can't be recycled while the entry is alive.
+_FIELD_METADATA_CACHE: typing.Dict[
+    int, typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]]
+] = {}
+_FIELD_METADATA_CACHE_MAX = 4096
+# Keys that steer generation rather than describe the field, and so are
+# never copied into the emitted schema.
+_RESERVED_METADATA_KEYS = ("metadata", "name", "_jsonschema_type_mapping")
+
+
+def _field_metadata(field) -> typing.Dict[str, typing.Any]:
+    """Return the field's user metadata, flattened and filtered, ready to
+    be copied into a schema.
+
+    The legacy `metadata={"metadata": {...}}` nesting is merged under the
+    top-level keys (top-level wins), and reserved keys are dropped. The
+    result is computed once per field and shared: callers must treat it
+    as read-only. Neither `field.metadata` nor the nested dict is
+    modified. Mutating a field's metadata in place after it has been
+    dumped is not picked up.
+    """
+    raw = field.metadata
+    cached = _FIELD_METADATA_CACHE.get(id(raw))
+    if cached is not None and cached[0] is raw:
+        return cached[1]
+
+    # NOTE: doubled up to maintain backwards compatibility
+    merged = dict(raw.get("metadata", {}))
+    merged.update(raw)
+    for key in _RESERVED_METADATA_KEYS:
+        merged.pop(key, None)
+
+    if len(_FIELD_METADATA_CACHE) >= _FIELD_METADATA_CACHE_MAX:
+        _FIELD_METADATA_CACHE.clear()
+    _FIELD_METADATA_CACHE[id(raw)] = (raw, merged)
+    return merged
+
+
+# Dumped `Nested` defaults, keyed by the identity of the default object.
+# Each entry records what the dump depended on (the default itself, the
+# nested schema class and its only/exclude) and is only reused when all
+# of it still matches.
+_NESTED_DEFAULT_CACHE: typing.Dict[int, typing.Tuple[typing.Any, ...]] = {}
+_NESTED_DEFAULT_CACHE_MAX = 1024
+
+
+def _dump_nested_default(nested_instance, field):
+    """Return `nested_instance.dump(field.dump_default)`, cached per
+    (field, default identity).
+
+    The cached dump is frozen; callers get a plain copy, so the
+    generated document stays editable. When the nested schema carries a
+    marshmallow 3 `context`, the output may depend on it and the cache
+    is bypassed.
+    """
+    default = field.dump_default
+    if getattr(nested_instance, "context", None):
+        return nested_instance.dump(default)
+
+    nested_cls = type(nested_instance)
+    only = getattr(nested_instance, "only", None)
+    exclude = getattr(nested_instance, "exclude", None)
+    cached = _NESTED_DEFAULT_CACHE.get(id(default))
+    if (
+        cached is not None
+        and cached[0] is default
+        and cached[1] is nested_cls
+        and cached[2] == only
+        and cached[3] == exclude
+    ):
+        return thaw(cached[4])
+
+    dumped = freeze(nested_instance.dump(default))
+    if len(_NESTED_DEFAULT_CACHE) >= _NESTED_DEFAULT_CACHE_MAX:
+        _NESTED_DEFAULT_CACHE.clear()
+    _NESTED_DEFAULT_CACHE[id(default)] = (default, nested_cls, only, exclude, dumped)
+    return thaw(dumped)
+
+
+# `oneof_definitions=True` variant bodies and the nested definitions they
+# reference, keyed by generator options, OneOfSchema class, variant
+# class and discriminator name.
+_ONEOF_VARIANT_CACHE: typing.Dict[
+    typing.Tuple[typing.Any, ...],
+    typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]],
+] = {}
+_ONEOF_VARIANT_CACHE_MAX = 1024
+
+
+# Schema class -> the base class whose shape definition it extends
+# under `inheritance=True` (or None), see `_inheritance_base`.
+_INHERITANCE_BASES: typing.Dict[type, typing.Optional[typing.Type[Schema]]] = {}
+_INHERITANCE_BASES_MAX = 1024
+
+
+def _inheritance_base(obj) -> typing.Optional[typing.Type[Schema]]:
+    """The nearest base schema class of `obj` with fields, if `obj`
+    inherits all of them unchanged (same field objects, not removed by
+    `only`/`exclude` or either class's `Meta.fields`/`Meta.exclude`, no
+    instance-level `dump_only`/`load_only`/`partial` changing how they
+    are described); otherwise None."""
+    if obj.only or obj.exclude or obj.dump_only or obj.load_only or obj.partial:
+        return None
+    cls = type(obj)
+    if cls in _INHERITANCE_BASES:
+        return _INHERITANCE_BASES[cls]
+    base = None
+    for parent in cls.__mro__[1:]:
+        if not issubclass(parent, Schema) or not parent._declared_fields:
+            continue
+        declared = cls._declared_fields
+        inherited = parent._declared_fields
+        if (
+            not _is_oneof_schema(obj)
+            and all(declared.get(name) is field for name, field in inherited.items())
+            and parent.opts.dump_only == cls.opts.dump_only
+            and parent.opts.load_only == cls.opts.load_only
+            # The shape is generated from `parent()` and describes its
+            # effective fields; `obj` must have every one of them.
+            and set(inherited) <= set(obj.fields)
+            and set(parent().fields) == set(inherited)
+        ):
+            base = parent
+        break
+    if len(_INHERITANCE_BASES) >= _INHERITANCE_BASES_MAX:
+        _INHERITANCE_BASES.clear()
+    _INHERITANCE_BASES[cls] = base
+    return base
+
+
+def _definitions_entry(
+    definitions_path: str, definitions: typing.Dict[str, typing.Any]
+) -> typing.Tuple[str, typing.Any]:
+    """The top-level `(key, value)` pair that holds `definitions` at
+    `definitions_path`: `"components/schemas"` gives
+    `("components", {"schemas": definitions})`."""
+    segments = definitions_path.split("/")
+    value: typing.Any = definitions
+    for segment in reversed(segments[1:]):
+        value = {segment: value}
+    return segments[0], value
+
+
+def _lookup_definitions(document, definitions_path: str) -> typing.Any:
+    """The definitions stored at `definitions_path` in `document`, or
+    `{}` if there are none."""
+    definitions = document
+    for segment in definitions_path.split("/"):
+        if not isinstance(definitions, dict):
+            return {}
+        definitions = definitions.get(segment, {})
+    return definitions
+
+
+# `JSONSchema.dump_views` record of one definition's fields:
+# (property key, required key, attribute name, field, inherited).
+_FieldRecord = typing.Tuple[str, str, str, typing.Any, bool]
+
+
+def _view_definition(
+    definition, records: typing.Optional[typing.List[_FieldRecord]], view: str
+):
+    """`definition` as seen by `view` (`"load"` or `"dump"`): without the
+    properties that side never sees, with `required` to match. The
+    remaining property schemas are shared, not copied."""
+    if records is None or not isinstance(definition.get("properties"), dict):
+        return definition
+    if view == "load":
+        hidden = [record for record in records if record[3].dump_only]
+        hidden_required = {record[1] for record in hidden}
+        # The generated list already honors `partial`.
+        required = [
+            key for key in definition.get("required", ()) if key not in hidden_required
+        ]
+    else:
+        hidden = [record for record in records if record[3].load_only]
+        # `partial` only applies to `load`.
+        required = [
+            required_key
+            for _, required_key, _, field, inherited in sorted(
+                records, key=lambda record: record[2]
+            )
+            if field.required and not field.load_only and not inherited
+        ]
+    if not hidden and required == list(definition.get("required", ())):
+        return definition
+    hidden_keys = {record[0] for record in hidden}
+    result = dict(definition)
+    result["properties"] = {
+        key: schema
+        for key, schema in definition["properties"].items()
+        if key not in hidden_keys
+    }
+    if required:
+        result["required"] = required
+    else:
+        result.pop("required", None)
+    return result
 
 
 def _resolve_additional_properties(cls) -> bool:
@@ -241,34 +609,140 @@ class JSONSchema(Schema):
                                    else will using sorting, default is `False`.
                                    Note: For the marshmallow scheme, also need to enable
                                    ordering of fields too (via `class Meta`, attribute `ordered`).
-        :param str definitions_path: name of the top-level dict key holding nested
-                                     schema definitions and the JSON pointer segment
-                                     used in $ref strings. Default is `"definitions"`.
-                                     Must be a single segment (no `/`); rejected with
-                                     `UnsupportedValueError` otherwise.
+        :param str definitions_path: where nested schema definitions are kept,
+                                     and the JSON pointer used in $ref strings.
+                                     Default is `"definitions"`. A multi-segment
+                                     path such as `"components/schemas"` nests the
+                                     definitions accordingly. Empty segments are
+                                     rejected with `UnsupportedValueError`.
+        :param bool enum_definitions: if `True`, each enum class is emitted once
+                                      as a definition and enum fields reference it
+                                      via `$ref` instead of inlining the member
+                                      list. Definitions are named after the
+                                      enum class, so an enum sharing its name
+                                      with another enum or a schema raises
+                                      `UnsupportedValueError`. Default is
+                                      `False`.
+        :param bool oneof_definitions: if `True`, each `OneOfSchema` variant is
+                                       emitted once as a definition and the `oneOf`
+                                       entries reference it via `allOf` + `$ref`
+                                       instead of inlining the variant body.
+                                       Default is `False`.
+        :param stats: `True` to collect generation counters into a new
+                      `GenerationStats` exposed as `.stats`, or a
+                      `GenerationStats` instance to aggregate into. Default
+                      is `None` (no bookkeeping).
+        :param hooks: iterable of `marshmallow_jsonschema.hooks.GenerationHook`
+                      instances notified around each field and definition.
+                      Hooks registered globally with `register_hook` are
+                      added automatically.
+        :param cache: a persistent cache backend such as
+                      `marshmallow_jsonschema.cache.DirectoryCache` or
+                      `SQLiteCache`. Top-level dumps are loaded from it when
+                      the schema's fingerprint is unchanged and stored in it
+                      otherwise. Default is `None`.
+        :param optimize: `True` to run the top-level output through
+                         `marshmallow_jsonschema.optimizer.optimize`, or an
+                         iterable of optimizer pass names to run. Default is
+                         `False`.
+        :param bool inheritance: if `True`, a schema that inherits every
+                                 field of a base schema class unchanged is
+                                 emitted as `allOf` over a shared
+                                 `<Base>.shape` definition (the base's
+                                 properties and required list) plus its own
+                                 properties, so inherited fields are
+                                 generated once per base. Default is `False`.
+        :param bool canonical: if `True`, the top-level output has the keys of
+                               every object in sorted order (see
+                               `marshmallow_jsonschema.canonical`), so equal
+                               documents iterate and serialize identically
+                               however they were generated. Can't be combined
+                               with `props_ordered`. Default is `False`.
+        :param content_hashes: `True` to compute the content hash of every
+                               definition (see
+                               `marshmallow_jsonschema.canonical.definition_hash`)
+                               during generation, exposed by name as
+                               `.definition_hashes`; `"x-content-hash"` or
+                               `"$id"` to also embed it in each definition, as
+                               a vendor key or as a `"#sha256-<hash>"` anchor.
+                               Anchors are unique: a definition identical to
+                               an earlier one (by name) becomes a `$ref` to
+                               its anchor. Default is `False`.
+        :param str regex_safety: what to do with `Regexp` patterns that risk
+                                 catastrophic backtracking (nested quantifiers,
+                                 ambiguous alternation): `"warn"` (the default)
+                                 emits a `RegexComplexityWarning`, `"error"`
+                                 raises `UnsupportedValueError`, `"off"` skips
+                                 the check. Findings are also recorded in
+                                 `stats`.
         """
         self._nested_schema_classes: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+        # `inheritance=True` shape definitions: name -> (shape, the
+        # definitions it references), shared with nested generators.
+        self._base_shapes: typing.Dict[str, typing.Tuple[typing.Any, typing.Any]] = {}
+        # Definition name -> the schema or enum class it describes, shared
+        # with nested generators (see `_claim_definition`).
+        self._definition_owners: typing.Dict[str, typing.Type[typing.Any]] = {}
+        # Field records collected for `dump_views`, shared with nested
+        # generators; `None` outside of it.
+        self._view_records: typing.Optional[
+            typing.Dict[str, typing.List[_FieldRecord]]
+        ] = None
         self.nested = kwargs.pop("nested", False)
         self.props_ordered = kwargs.pop("props_ordered", False)
         self.definitions_path = kwargs.pop("definitions_path", "definitions")
-        # `definitions_path` ends up both as a JSON-pointer segment in $ref
-        # strings AND as a top-level dict key in the output. Validate it
-        # up-front so we surface a clear error instead of a confusing
-        # downstream crash:
+        self.enum_definitions = kwargs.pop("enum_definitions", False)
+        self.oneof_definitions = kwargs.pop("oneof_definitions", False)
+        self.inheritance = kwargs.pop("inheritance", False)
+        self.canonical = kwargs.pop("canonical", False)
+        self.content_hashes = kwargs.pop("content_hashes", False)
+        if self.content_hashes not in (False, True, HASH_KEY, "$id"):
+            raise UnsupportedValueError(
+                "`content_hashes` must be a bool, %r or '$id' (got %r)"
+                % (HASH_KEY, self.content_hashes)
+            )
+        #: Definition name -> content hash, with `content_hashes` set.
+        self.definition_hashes: typing.Dict[str, str] = {}
+        if self.canonical and self.props_ordered:
+            raise UnsupportedValueError(
+                "`canonical` sorts properties; it can't be combined with "
+                "`props_ordered`"
+            )
+        stats = kwargs.pop("stats", None)
+        self.cache = kwargs.pop("cache", None)
+        self.regex_safety = kwargs.pop("regex_safety", "warn")
+        if self.regex_safety not in ("off", "warn", "error"):
+            raise UnsupportedValueError(
+                "`regex_safety` must be 'off', 'warn' or 'error' (got %r)"
+                % (self.regex_safety,)
+            )
+        optimize = kwargs.pop("optimize", False)
+        self.optimize: typing.Union[bool, typing.Tuple[str, ...]] = (
+            optimize if isinstance(optimize, bool) else tuple(optimize)
+        )
+        self.hooks: typing.Tuple[typing.Any, ...] = tuple(kwargs.pop("hooks", ()))
+        if not self.nested:
+            # Nested generators inherit the parent's full set.
+            self.hooks += tuple(h for h in _global_hooks() if h not in self.hooks)
+        self.stats: typing.Optional[GenerationStats] = (
+            GenerationStats() if stats is True else stats or None
+        )
+        # `definitions_path` ends up both as a JSON pointer in $ref
+        # strings AND as the (possibly nested) dict keys in the output.
+        # Validate it up-front so we surface a clear error instead of a
+        # confusing downstream crash:
         #  - must be a non-empty str (rules out None / int / "")
-        #  - must be a single segment (multi-segment paths like
-        #    "components/schemas" produce a flat dict key with a slash in
-        #    it rather than the nested structure consumers expect)
+        #  - every `/`-separated segment must be non-empty (rules out
+        #    "/defs", "defs/" and "a//b", which have no nested shape)
         if not isinstance(self.definitions_path, str) or not self.definitions_path:
             raise UnsupportedValueError(
                 "`definitions_path` must be a non-empty str (got %r)"
                 % (self.definitions_path,)
             )
-        if "/" in self.definitions_path:
+        if not all(self.definitions_path.split("/")):
             raise UnsupportedValueError(
-                "`definitions_path` must be a single segment (got "
-                "%r); nested paths require post-processing the output."
-                % self.definitions_path
+                "`definitions_path` must not contain empty segments (got %r)"
+                % (self.definitions_path,)
             )
         setattr(self.opts, "ordered", self.props_ordered)
         super().__init__(*args, **kwargs)
@@ -285,12 +759,30 @@ class JSONSchema(Schema):
             else:
                 fields_items_sequence = sorted(obj.fields.items())
 
+        inherited = self._inherited_fields(obj)
+        records = []
         for field_name, field in fields_items_sequence:
-            schema = self._get_schema_for_field(obj, field)
-            properties[field.metadata.get("name") or field.data_key or field.name] = (
-                schema
+            if field_name in inherited:
+                # Described by the base's shape definition; listed so
+                # `additionalProperties` still knows the name.
+                schema = {}
+            else:
+                schema = self._get_schema_for_field(obj, field)
+            key = field.metadata.get("name") or field.data_key or field.name
+            properties[key] = schema
+            records.append(
+                (
+                    key,
+                    field.data_key or field.name,
+                    field_name,
+                    field,
+                    field_name in inherited,
+                )
             )
 
+        if self._view_records is not None:
+            name = obj.__name__ if callable(obj) else obj.__class__.__name__
+            self._view_records[name] = records
         return properties
 
     def get_required(self, obj) -> typing.Union[typing.List[str], typing.Any]:
@@ -311,8 +803,9 @@ class JSONSchema(Schema):
             field_items_iterable = sorted(obj.fields.items())
             partial = getattr(obj, "partial", None)
 
+        inherited = self._inherited_fields(obj)
         for field_name, field in field_items_iterable:
-            if not field.required:
+            if not field.required or field_name in inherited:
                 continue
             # `partial=True` makes every field optional.
             if partial is True:
@@ -343,21 +836,14 @@ class JSONSchema(Schema):
 
         if ALLOW_NATIVE_ENUM and isinstance(field, NativeEnumField):
             json_schema["enum"] = self._get_native_enum_values(field)
-        elif ALLOW_MARSHMALLOW_ENUM and isinstance(field, EnumField):
+        elif _is_marshmallow_enum_field(field):
             json_schema["enum"] = self._get_enum_values(field)
 
         if field.allow_none:
             previous_type = json_schema["type"]
             json_schema["type"] = [previous_type, "null"]
 
-        # NOTE: doubled up to maintain backwards compatibility
-        metadata = field.metadata.get("metadata", {})
-        metadata.update(field.metadata)
-
-        for md_key, md_val in metadata.items():
-            if md_key in ("metadata", "name"):
-                continue
-            json_schema[md_key] = md_val
+        json_schema.update(_field_metadata(field))
 
         if isinstance(field, fields.List):
             json_schema["items"] = self._get_schema_for_field(obj, field.inner)
@@ -371,26 +857,71 @@ class JSONSchema(Schema):
         return json_schema
 
     def _get_enum_values(self, field) -> typing.List[str]:
-        assert ALLOW_MARSHMALLOW_ENUM and isinstance(field, EnumField)
+        assert _is_marshmallow_enum_field(field)
 
-        if field.load_by == LoadDumpOptions.value:
-            return _by_value_enum_strings(field.enum)
-
-        return [value.name for value in field.enum]
+        return list(_enum_values(field.enum, _marshmallow_enum_by_value(field)))
 
     def _get_native_enum_values(self, field) -> typing.List[str]:
         assert ALLOW_NATIVE_ENUM and isinstance(field, NativeEnumField)
 
-        if field.by_value:
-            return _by_value_enum_strings(field.enum)
+        return list(_enum_values(field.enum, bool(field.by_value)))
+
+    def _enum_field_spec(self, field):
+        """Return `(enum_cls, by_value)` for an enum field, or None for
+        any other field."""
+        if ALLOW_NATIVE_ENUM and isinstance(field, NativeEnumField):
+            return field.enum, bool(field.by_value)
+        if _is_marshmallow_enum_field(field):
+            return field.enum, _marshmallow_enum_by_value(field)
+        return None
 
-        return [value.name for value in field.enum]
+    def _from_enum_definition(self, obj, field, enum_cls, by_value):
+        """Emit an enum field as a `$ref` to a shared definition holding
+        the member list, registering the definition on first use.
+
+        Used when `enum_definitions=True`. As with nested schemas, keys
+        next to the `$ref` (title, description, ...) are annotations
+        only; Draft-07 validators ignore them.
+        """
+        name = enum_cls.__name__ + ("ByValue" if by_value else "")
+        self._claim_definition(name, enum_cls)
+        if self.stats is not None:
+            self.stats.record_definition(reused=name in self._nested_schema_classes)
+        if name not in self._nested_schema_classes:
+            definition = dict(PY_TO_JSON_TYPES_MAP[Enum])
+            definition["enum"] = list(_enum_values(enum_cls, by_value))
+            self._nested_schema_classes[name] = definition
+        schema = {"$ref": "#/{}/{}".format(self.definitions_path, name)}
+        self._apply_custom_field_attributes(schema, field)
+        schema.setdefault("title", field.attribute or field.name or "")
+        return self._wrap_allow_none(schema, field)
+
+    def _claim_definition(self, name: str, owner: typing.Type[typing.Any]) -> None:
+        """Note that definition `name` describes `owner`, a schema or enum
+        class. Definitions are named after bare class names, so an enum
+        and another enum or schema with the same name would silently
+        share one definition; raise instead."""
+        current = self._definition_owners.setdefault(name, owner)
+        if current is not owner and (
+            issubclass(current, Enum) or issubclass(owner, Enum)
+        ):
+            raise UnsupportedValueError(
+                "%s.%s and %s.%s would share the definition %r; rename one of "
+                "them or dump with `enum_definitions=False`"
+                % (
+                    current.__module__,
+                    current.__qualname__,
+                    owner.__module__,
+                    owner.__qualname__,
+                    name,
+                )
+            )
 
     def _from_union_schema(
         self, obj, field
     ) -> typing.Dict[str, typing.List[typing.Any]]:
         """Get a union type schema. Uses anyOf to allow the value to be any of the provided sub fields"""
-        assert ALLOW_UNIONS and isinstance(field, Union)
+        assert _is_union_field(field)
 
         return {
             "anyOf": [
@@ -497,12 +1028,7 @@ class JSONSchema(Schema):
         if field.dump_default is not missing and not callable(field.dump_default):
             if _is_json_serializable(field.dump_default):
                 schema["default"] = field.dump_default
-        metadata = field.metadata.get("metadata", {})
-        metadata.update(field.metadata)
-        for md_key, md_val in metadata.items():
-            if md_key in ("metadata", "name"):
-                continue
-            schema[md_key] = md_val
+        schema.update(_field_metadata(field))
 
         schema = self._wrap_allow_none(schema, field)
 
@@ -522,6 +1048,11 @@ class JSONSchema(Schema):
             if issubclass(field.__class__, map_class):
                 return pytype
 
+        if _is_marshmallow_enum_field(field):
+            # We currently only support loading enum's from their names. So the
+            # possible values will always map to string in the JSONSchema
+            return Enum
+
         raise UnsupportedValueError(
             "Cannot derive a JSON Schema type for field "
             "%s (class %s). To support a custom field, either "
@@ -562,37 +1093,59 @@ class JSONSchema(Schema):
             if _is_json_serializable(field.dump_default):
                 schema["default"] = field.dump_default
 
-        # NOTE: doubled up to maintain backwards compatibility
-        metadata = field.metadata.get("metadata", {})
-        metadata.update(field.metadata)
-        for md_key, md_val in metadata.items():
-            if md_key in ("metadata", "name", "_jsonschema_type_mapping"):
-                continue
+        for md_key, md_val in _field_metadata(field).items():
             schema.setdefault(md_key, md_val)
 
     def _get_schema_for_field(self, obj, field):
         """Get schema and validators for field."""
+        if not self.hooks:
+            return self._build_field_schema(obj, field)
+        for hook in self.hooks:
+            hook.before_field(self, obj, field)
+        schema = None
+        try:
+            schema = self._build_field_schema(obj, field)
+            return schema
+        finally:
+            for hook in reversed(self.hooks):
+                hook.after_field(self, obj, field, schema)
+
+    def _build_field_schema(self, obj, field):
+        """`_get_schema_for_field` without the hook calls."""
+        # `handler` names the branch that built the schema, for stats.
+        handler = "custom_mapping"
         if hasattr(field, "_jsonschema_type_mapping"):
             schema = self._call_jsonschema_type_mapping(obj, field)
             self._apply_custom_field_attributes(schema, field)
         elif "_jsonschema_type_mapping" in field.metadata:
-            schema = field.metadata["_jsonschema_type_mapping"]
+            # Copy so the attribute pass below doesn't write into the
+            # user's mapping (and leak into every later dump).
+            schema = dict(field.metadata["_jsonschema_type_mapping"])
             self._apply_custom_field_attributes(schema, field)
         else:
             # Pluck is a Nested subclass, so it must be checked first.
             if isinstance(field, fields.Pluck):
+                handler = "pluck"
                 schema = self._from_pluck_field(obj, field)
             elif isinstance(field, fields.Nested):
                 # Special treatment for nested fields.
+                handler = "nested"
                 schema = self._from_nested_schema(obj, field)
             elif hasattr(fields, "Tuple") and isinstance(field, fields.Tuple):
                 # `fields.Tuple` was added in marshmallow 3.16; the
                 # hasattr guard keeps us importable on 3.13-3.15.
+                handler = "tuple"
                 schema = self._from_tuple_field(obj, field)
             elif isinstance(field, fields.Constant):
+                handler = "constant"
                 schema = self._from_constant_field(obj, field)
-            elif ALLOW_UNIONS and isinstance(field, Union):
+            elif _is_union_field(field):
+                handler = "union"
                 schema = self._from_union_schema(obj, field)
+            elif self.enum_definitions and self._enum_field_spec(field):
+                handler = "enum_definition"
+                enum_cls, by_value = self._enum_field_spec(field)
+                schema = self._from_enum_definition(obj, field, enum_cls, by_value)
             elif type(field) is fields.Raw:
                 # `fields.Raw` is "any value, no formatting" - emit a
                 # type-less schema so any JSON value validates. The
@@ -601,24 +1154,54 @@ class JSONSchema(Schema):
                 # type check (not isinstance) so user subclasses of
                 # Raw with their own intent still go through the
                 # normal `_get_python_type` path.
+                handler = "raw"
                 schema = self._from_raw_field(obj, field)
             else:
+                handler = "python_type"
                 pytype = self._get_python_type(field)
                 schema = self._from_python_type(obj, field, pytype)
+        if self.stats is not None:
+            self.stats.record_field(handler)
         # Apply any and all validators that field may have
         for validator in field.validators:
-            if validator.__class__ in FIELD_VALIDATORS:
-                schema = FIELD_VALIDATORS[validator.__class__](
-                    schema, field, validator, obj
-                )
-            else:
-                base_class = getattr(
+            validator_cls = validator.__class__
+            if validator_cls not in FIELD_VALIDATORS:
+                validator_cls = getattr(
                     validator, "_jsonschema_base_validator_class", None
                 )
-                if base_class is not None and base_class in FIELD_VALIDATORS:
-                    schema = FIELD_VALIDATORS[base_class](schema, field, validator, obj)
+                if validator_cls not in FIELD_VALIDATORS:
+                    continue
+            schema = FIELD_VALIDATORS[validator_cls](schema, field, validator, obj)
+            if validator_cls is validate.Regexp and self.regex_safety != "off":
+                self._check_regex(obj, field, validator)
+            if self.stats is not None:
+                self.stats.record_validator(validator_cls.__name__)
+            for hook in self.hooks:
+                hook.on_validator(self, field, validator, schema)
         return schema
 
+    def _check_regex(self, obj, field, validator) -> None:
+        """Apply `regex_safety` to a `Regexp` validator's pattern."""
+        from .regex_analysis import analyze_pattern
+
+        pattern = validator.regex.pattern
+        if not isinstance(pattern, str):
+            return
+        issues = analyze_pattern(pattern, validator.regex.flags)
+        if not issues:
+            return
+        label = _field_label(obj, field)
+        if self.stats is not None:
+            self.stats.record_regex_finding(label, pattern, issues)
+        message = "Regexp pattern %r on %s risks catastrophic backtracking (%s)" % (
+            pattern,
+            label,
+            ", ".join(issues),
+        )
+        if self.regex_safety == "error":
+            raise UnsupportedValueError(message)
+        warnings.warn(message, RegexComplexityWarning, stacklevel=2)
+
     def _from_nested_schema(self, obj, field):
         """Support nested field."""
         if isinstance(field.nested, (str, bytes)):
@@ -656,48 +1239,31 @@ class JSONSchema(Schema):
         # class itself wouldn't describe any actual instance. Emit
         # `oneOf` over the variants instead. The many / allow_none /
         # metadata wrap below still applies to the resulting schema.
-        if ALLOW_ONEOFSCHEMA and isinstance(nested_instance, OneOfSchema):
+        if _is_oneof_schema(nested_instance):
             schema = self._oneof_body(nested_instance)
         else:
             outer_name = obj.__class__.__name__
+            self._claim_definition(name, type(nested_instance))
             # If this is not a schema we've seen, and it's not this schema (checking this for recursive schemas),
             # put it in our list of schema defs
-            if name not in self._nested_schema_classes and name != outer_name:
-                wrapped_nested = self.__class__(
-                    nested=True,
-                    props_ordered=self.props_ordered,
-                    definitions_path=self.definitions_path,
+            is_new = name not in self._nested_schema_classes and name != outer_name
+            if self.stats is not None:
+                self.stats.record_definition(reused=not is_new)
+            if is_new:
+                wrapped_dumped, definitions = self._generate_definition(
+                    name,
+                    lambda: self._dump_nested_definition(nested_instance, nested_cls),
                 )
-                wrapped_dumped = wrapped_nested.dump(nested_instance)
-
-                wrapped_dumped["additionalProperties"] = _resolve_additional_properties(
-                    nested_cls
-                )
-                for meta_key in ("title", "description"):
-                    value = _resolve_schema_meta_string(nested_cls, meta_key)
-                    if value is not None:
-                        wrapped_dumped[meta_key] = value
-
                 self._nested_schema_classes[name] = wrapped_dumped
-
-                self._nested_schema_classes.update(
-                    wrapped_nested._nested_schema_classes
-                )
+                self._nested_schema_classes.update(definitions)
 
             # and the schema is just a reference to the def
             schema = self._schema_base(name)
 
-        # NOTE: doubled up to maintain backwards compatibility
-        metadata = field.metadata.get("metadata", {})
-        metadata.update(field.metadata)
-
-        for md_key, md_val in metadata.items():
-            if md_key in ("metadata", "name"):
-                continue
-            schema[md_key] = md_val
+        schema.update(_field_metadata(field))
 
         if field.dump_default is not missing and not callable(field.dump_default):
-            schema["default"] = nested_instance.dump(field.dump_default)
+            schema["default"] = _dump_nested_default(nested_instance, field)
 
         if field.allow_none:
             schema = {"anyOf": [schema, {"type": "null"}]}
@@ -710,6 +1276,105 @@ class JSONSchema(Schema):
 
         return schema
 
+    def _dump_nested_definition(self, nested_instance, nested_cls):
+        """Dump a nested schema as an object definition. Returns the
+        definition and the further definitions it references."""
+        wrapped_nested = self._nested_generator()
+        wrapped_dumped = wrapped_nested.dump(nested_instance)
+
+        wrapped_dumped["additionalProperties"] = _resolve_additional_properties(
+            nested_cls
+        )
+        for meta_key in ("title", "description"):
+            value = _resolve_schema_meta_string(nested_cls, meta_key)
+            if value is not None:
+                wrapped_dumped[meta_key] = value
+        return wrapped_dumped, wrapped_nested._nested_schema_classes
+
+    def _generate_definition(self, name, build):
+        """Run `build()`, which returns `(definition, definitions)` for
+        definition `name`, between the definition hooks when any are
+        registered."""
+        if not self.hooks:
+            return build()
+        for hook in self.hooks:
+            hook.before_definition(self, name)
+        result = None
+        try:
+            result = build()
+            return result
+        finally:
+            for hook in reversed(self.hooks):
+                hook.after_definition(self, name, result[0] if result else None)
+
+    def _nested_generator(self):
+        """A generator for a nested schema's definition, configured like
+        this one. Its definitions are merged back by the caller."""
+        generator = self.__class__(
+            nested=True,
+            props_ordered=self.props_ordered,
+            definitions_path=self.definitions_path,
+            enum_definitions=self.enum_definitions,
+            oneof_definitions=self.oneof_definitions,
+            inheritance=self.inheritance,
+            stats=self.stats,
+            hooks=self.hooks,
+            regex_safety=self.regex_safety,
+        )
+        generator._base_shapes = self._base_shapes
+        generator._definition_owners = self._definition_owners
+        generator._view_records = self._view_records
+        return generator
+
+    def _inherited_fields(self, obj) -> typing.FrozenSet[str]:
+        """Names of the fields `obj` takes from its shape base (see
+        `_inheritance_base`); empty when `inheritance` is off."""
+        if not self.inheritance or callable(obj):
+            return frozenset()
+        base = _inheritance_base(obj)
+        if base is None:
+            return frozenset()
+        return frozenset(base._declared_fields)
+
+    def _add_base_shape(self, data, obj) -> None:
+        """Point definition `data` at the shape definition of `obj`'s
+        base schema, generating that on first use."""
+        if callable(obj):
+            return
+        base = _inheritance_base(obj)
+        if base is None:
+            return
+        name = "{}.shape".format(base.__name__)
+        # Shapes are shared by every generator of a dump, so a base
+        # reached from several nested definitions is generated once.
+        cached = self._base_shapes.get(name)
+        if self.stats is not None:
+            self.stats.record_definition(reused=cached is not None)
+        if cached is None:
+            generator = self._nested_generator()
+            cached = (generator.dump(base()), generator._nested_schema_classes)
+            self._base_shapes[name] = cached
+        self._nested_schema_classes.update(cached[1])
+        self._nested_schema_classes[name] = cached[0]
+        data["allOf"] = [{"$ref": "#/{}/{}".format(self.definitions_path, name)}]
+
+    def _options_key(self) -> typing.Tuple[typing.Any, ...]:
+        """Everything about this generator's configuration that shapes
+        its output; used to key caches shared between instances."""
+        return (
+            self.__class__,
+            self.props_ordered,
+            self.definitions_path,
+            self.enum_definitions,
+            self.oneof_definitions,
+            self.optimize,
+            self.inheritance,
+            self.canonical,
+            self.content_hashes,
+            # Cached output skips the checks `regex_safety` runs.
+            self.regex_safety,
+        )
+
     def _schema_base(self, name):
         return {
             "type": "object",
@@ -768,56 +1433,121 @@ class JSONSchema(Schema):
         type_field = oneof_obj.type_field
         variants = []
         for type_value, schema_cls in oneof_obj.type_schemas.items():
-            wrapped_nested = self.__class__(
-                nested=True,
-                props_ordered=self.props_ordered,
-                definitions_path=self.definitions_path,
-            )
-            # Share the recursion guard set so re-entry is detected
-            # across the wrapped instance's own dump pipeline.
-            wrapped_nested._oneof_in_progress = in_progress
-            variant_schema = wrapped_nested.dump(schema_cls())
-            variant_schema["additionalProperties"] = _resolve_additional_properties(
-                schema_cls
-            )
-            for meta_key in ("title", "description"):
-                value = _resolve_schema_meta_string(schema_cls, meta_key)
-                if value is not None:
-                    variant_schema[meta_key] = value
-
-            # Inject the discriminator field as a const-valued property
-            # and add it to required so consumers can rely on it.
-            variant_schema.setdefault("properties", {})
-            if type_field in variant_schema["properties"]:
-                # The variant declares its own field with the same name as
-                # the OneOfSchema discriminator. Silently overwriting would
-                # mask a real schema mismatch (the variant's declared type
-                # might not even be a string), so refuse and force the user
-                # to rename one or the other.
-                raise UnsupportedValueError(
-                    "OneOfSchema variant {!r} (type_value={!r}) declares a "
-                    "field named {!r}, which collides with the OneOfSchema "
-                    "discriminator. Rename the field or change "
-                    "`type_field` on the OneOfSchema.".format(
-                        schema_cls.__name__, type_value, type_field
+            if self.oneof_definitions:
+                variants.append(
+                    self._oneof_variant_ref(
+                        oneof_obj, type_value, schema_cls, in_progress
                     )
                 )
-            variant_schema["properties"][type_field] = {
-                "type": "string",
-                "const": type_value,
-                "title": type_field,
-            }
-            existing_required = list(variant_schema.get("required", []))
-            if type_field not in existing_required:
-                variant_schema["required"] = sorted(existing_required + [type_field])
+                continue
 
+            variant_schema, definitions = self._dump_oneof_variant(
+                schema_cls, in_progress
+            )
+            # Inject the discriminator field as a const-valued property
+            # and add it to required so consumers can rely on it.
+            self._add_oneof_discriminator(
+                variant_schema,
+                schema_cls,
+                type_field,
+                type_value,
+                {"type": "string", "const": type_value, "title": type_field},
+            )
             # Carry through any nested definitions discovered inside
             # the variant - the inlined variant may still reference
             # them via `$ref`.
-            self._nested_schema_classes.update(wrapped_nested._nested_schema_classes)
+            self._nested_schema_classes.update(definitions)
             variants.append(variant_schema)
         return variants
 
+    def _dump_oneof_variant(self, schema_cls, in_progress):
+        """Dump one `OneOfSchema` variant as an object schema. Returns the
+        schema and the nested definitions it references."""
+        wrapped_nested = self._nested_generator()
+        # Share the recursion guard set so re-entry is detected
+        # across the wrapped instance's own dump pipeline.
+        wrapped_nested._oneof_in_progress = in_progress
+        variant_schema = wrapped_nested.dump(schema_cls())
+        variant_schema["additionalProperties"] = _resolve_additional_properties(
+            schema_cls
+        )
+        for meta_key in ("title", "description"):
+            value = _resolve_schema_meta_string(schema_cls, meta_key)
+            if value is not None:
+                variant_schema[meta_key] = value
+        return variant_schema, wrapped_nested._nested_schema_classes
+
+    def _add_oneof_discriminator(
+        self, variant_schema, schema_cls, type_field, type_value, prop
+    ):
+        """Declare the discriminator `prop` on a variant schema and mark it
+        required."""
+        variant_schema.setdefault("properties", {})
+        if type_field in variant_schema["properties"]:
+            # The variant declares its own field with the same name as
+            # the OneOfSchema discriminator. Silently overwriting would
+            # mask a real schema mismatch (the variant's declared type
+            # might not even be a string), so refuse and force the user
+            # to rename one or the other.
+            raise UnsupportedValueError(
+                "OneOfSchema variant {!r} (type_value={!r}) declares a "
+                "field named {!r}, which collides with the OneOfSchema "
+                "discriminator. Rename the field or change "
+                "`type_field` on the OneOfSchema.".format(
+                    schema_cls.__name__, type_value, type_field
+                )
+            )
+        variant_schema["properties"][type_field] = prop
+        existing_required = list(variant_schema.get("required", []))
+        if type_field not in existing_required:
+            variant_schema["required"] = sorted(existing_required + [type_field])
+
+    def _oneof_variant_ref(self, oneof_obj, type_value, schema_cls, in_progress):
+        """`oneof_definitions=True` counterpart of an inlined variant: the
+        variant body is registered once as the `<OneOf>.<Variant>`
+        definition and each `oneOf` entry pins the discriminator next to
+        a `$ref` to it.
+
+        The definition declares the discriminator as a plain required
+        string, so `additionalProperties: false` on the variant still
+        admits it; the `allOf` sibling narrows it to `type_value`. Bodies
+        are cached (frozen) across dumps per generator configuration and
+        copied into each document.
+        """
+        type_field = oneof_obj.type_field
+        name = "{}.{}".format(oneof_obj.__class__.__name__, schema_cls.__name__)
+        if name not in self._nested_schema_classes:
+            key = (self._options_key(), oneof_obj.__class__, schema_cls, type_field)
+            cached = _ONEOF_VARIANT_CACHE.get(key)
+            if self.stats is not None:
+                self.stats.record_definition(reused=cached is not None)
+            if cached is None:
+                body, definitions = self._generate_definition(
+                    name, lambda: self._dump_oneof_variant(schema_cls, in_progress)
+                )
+                self._add_oneof_discriminator(
+                    body,
+                    schema_cls,
+                    type_field,
+                    type_value,
+                    {"type": "string", "title": type_field},
+                )
+                cached = (freeze(body), freeze(definitions))
+                if len(_ONEOF_VARIANT_CACHE) >= _ONEOF_VARIANT_CACHE_MAX:
+                    _ONEOF_VARIANT_CACHE.clear()
+                _ONEOF_VARIANT_CACHE[key] = cached
+            body, definitions = cached
+            self._nested_schema_classes.update(thaw(definitions))
+            self._nested_schema_classes[name] = thaw(body)
+        elif self.stats is not None:
+            self.stats.record_definition(reused=True)
+        return {
+            "allOf": [
+                {"$ref": "#/{}/{}".format(self.definitions_path, name)},
+                {"properties": {type_field: {"const": type_value}}},
+            ]
+        }
+
     def dump(self, obj, **kwargs) -> typing.Dict[str, typing.Any]:
         """Render `obj` as a JSON Schema dict.
 
@@ -827,9 +1557,205 @@ class JSONSchema(Schema):
         `$ref`).
         """
         self.obj = obj
-        if ALLOW_ONEOFSCHEMA and isinstance(obj, OneOfSchema):
-            return self._dump_oneof_root(obj)
-        return super().dump(obj, **kwargs)
+        if self.nested or (self.stats is None and not self.hooks):
+            return self._dump(obj, **kwargs)
+        return self._dump_instrumented(obj, **kwargs)
+
+    def dump_definitions(self, schemas) -> typing.Dict[str, typing.Any]:
+        """Dump several schemas (classes or instances) into a single
+        definitions section, e.g. an OpenAPI `components` object:
+
+            JSONSchema(definitions_path="components/schemas").dump_definitions(
+                [UserSchema, OrderSchema]
+            )
+            # {"components": {"schemas": {"UserSchema": ..., "OrderSchema": ...,
+            #                             "AddressSchema": ...}}}
+
+        Each definition is generated once, however many of the schemas
+        reference it.
+        """
+        definitions = self._nested_schema_classes
+        for schema in schemas:
+            if isinstance(schema, type):
+                schema = schema()
+            document = self.dump(schema)
+            # Cached and optimized dumps hand back their own definitions.
+            definitions.update(_lookup_definitions(document, self.definitions_path))
+            self._nested_schema_classes = definitions
+        key, value = _definitions_entry(self.definitions_path, definitions)
+        return {key: value}
+
+    def _fresh_dump(self, obj, **kwargs) -> typing.Dict[str, typing.Any]:
+        """`dump(obj)` without this instance's earlier definitions, base
+        shapes or persistent `cache`, so every definition of the result
+        is generated by this traversal (for callers that record while
+        fields are generated). The new definitions are merged into the
+        instance's afterwards, as a plain `dump` would leave them."""
+        definitions, owners, shapes, cache = (
+            self._nested_schema_classes,
+            self._definition_owners,
+            self._base_shapes,
+            self.cache,
+        )
+        self._nested_schema_classes, self._definition_owners = {}, {}
+        self._base_shapes, self.cache = {}, None
+        try:
+            document = self.dump(obj, **kwargs)
+            definitions.update(self._nested_schema_classes)
+            owners.update(self._definition_owners)
+        finally:
+            self._nested_schema_classes = definitions
+            self._definition_owners = owners
+            self._base_shapes = shapes
+            self.cache = cache
+        return document
+
+    def dump_views(
+        self, obj
+    ) -> typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any]]:
+        """Dump `obj` once and return its `(load_view, dump_view)`: the
+        request and response schemas of an API.
+
+            request, response = JSONSchema().dump_views(UserSchema())
+
+        The load view leaves out `dump_only` fields and keeps the
+        `required` lists `dump` generates (so `partial` is honored); the
+        dump view leaves out `load_only` fields and requires every
+        `required=True` field that is dumped, whatever `partial` says.
+        Both come from a single traversal and share every field schema
+        they have in common, so they are frozen (see
+        `marshmallow_jsonschema.frozen`). Definitions the traversal
+        doesn't describe field by field (`OneOfSchema` variants, those
+        renamed by `optimize`) are the same in both views.
+
+        The persistent `cache` and definitions from earlier dumps on this
+        instance are bypassed: neither carries field information.
+        """
+        if isinstance(obj, type):
+            obj = obj()
+        records: typing.Dict[str, typing.List[_FieldRecord]] = {}
+        self._view_records = records
+        try:
+            # Frozen first, so both views are built from the same parts.
+            document = freeze(self._fresh_dump(obj))
+        finally:
+            self._view_records = None
+
+        definitions = _lookup_definitions(document, self.definitions_path)
+        views = []
+        for view in ("load", "dump"):
+            view_definitions = {}
+            for name, definition in definitions.items():
+                # `inheritance=True` shapes describe their base's fields.
+                owner = name[: -len(".shape")] if name.endswith(".shape") else name
+                view_definitions[name] = _view_definition(
+                    definition, records.get(owner), view
+                )
+            key, value = _definitions_entry(self.definitions_path, view_definitions)
+            result = dict(document)
+            result[key] = value
+            views.append(freeze(result))
+        return views[0], views[1]
+
+    def _dump_instrumented(self, obj, **kwargs) -> typing.Dict[str, typing.Any]:
+        """Top-level `dump` with stats and/or hooks enabled. The root
+        schema is reported to hooks as a definition of its own."""
+        name = obj.__class__.__name__
+        for hook in self.hooks:
+            hook.before_definition(self, name)
+        try:
+            start = time.perf_counter()
+            result = self._dump(obj, **kwargs)
+            elapsed = time.perf_counter() - start
+        finally:
+            for hook in reversed(self.hooks):
+                hook.after_definition(self, name, self._nested_schema_classes.get(name))
+        if self.stats is not None:
+            output_bytes = len(json.dumps(result, default=repr).encode("utf-8"))
+            self.stats.record_dump(elapsed, output_bytes)
+        return result
+
+    def _dump(self, obj, **kwargs) -> typing.Dict[str, typing.Any]:
+        if self.cache is not None and not self.nested:
+            return self._dump_cached(obj, **kwargs)
+        return self._generate(obj, **kwargs)
+
+    def _dump_cached(self, obj, **kwargs) -> typing.Dict[str, typing.Any]:
+        """Top-level dump through `self.cache`: reuse the stored document
+        if `obj`'s fingerprint matches, else generate and store it."""
+        from .cache import cached_fingerprint, schema_cache_key
+
+        key = schema_cache_key(obj, self)
+        digest = cached_fingerprint(obj, self)
+        document = self.cache.get(key, digest)
+        if document is None:
+            document = self._generate(obj, **kwargs)
+            self.cache.set(key, digest, document)
+        else:
+            # Stored documents are frozen; later dumps on this instance
+            # add their definitions to this dict.
+            self._nested_schema_classes = dict(
+                _lookup_definitions(document, self.definitions_path)
+            )
+            if self.content_hashes:
+                self.definition_hashes = definition_hashes(
+                    document, self.definitions_path
+                )
+        return document
+
+    def _add_content_hashes(self, result) -> typing.Dict[str, typing.Any]:
+        """Hash every definition of top-level output `result` into
+        `self.definition_hashes`, embedding the hashes if configured."""
+        definitions = _lookup_definitions(result, self.definitions_path)
+        hashes = {
+            name: definition_hash(definition)
+            for name, definition in definitions.items()
+        }
+        self.definition_hashes = hashes
+        if self.content_hashes is True:
+            return result
+        # `$id`s must be unique: identical definitions after the first
+        # (by name) refer to its anchor instead of repeating it.
+        anchored = {}
+        for name in sorted(hashes, reverse=True):
+            anchored[hashes[name]] = name
+        embedded = {}
+        for name, definition in definitions.items():
+            if self.content_hashes == HASH_KEY:
+                definition = dict(definition)
+                definition[HASH_KEY] = hashes[name]
+            elif anchored[hashes[name]] == name:
+                definition = dict(definition)
+                definition["$id"] = ANCHOR_PREFIX + hashes[name]
+            else:
+                definition = {"$ref": ANCHOR_PREFIX + hashes[name]}
+            embedded[name] = definition
+        key, value = _definitions_entry(self.definitions_path, embedded)
+        result[key] = value
+        self._nested_schema_classes = embedded
+        return result
+
+    def _generate(self, obj, **kwargs) -> typing.Dict[str, typing.Any]:
+        if _is_oneof_schema(obj):
+            result = self._dump_oneof_root(obj)
+        else:
+            result = super().dump(obj, **kwargs)
+        if self.optimize and not self.nested and isinstance(result, dict):
+            from .optimizer import optimize
+
+            passes = self.optimize if isinstance(self.optimize, tuple) else None
+            result = optimize(result, passes, definitions_path=self.definitions_path)
+            self._nested_schema_classes = _lookup_definitions(
+                result, self.definitions_path
+            )
+        if self.content_hashes and not self.nested:
+            result = self._add_content_hashes(result)
+        if self.canonical and not self.nested:
+            result = canonicalize(result)
+            self._nested_schema_classes = _lookup_definitions(
+                result, self.definitions_path
+            )
+        return result
 
     def _oneof_body(self, obj) -> typing.Dict[str, typing.Any]:
         """The `oneOf` envelope dict for a `OneOfSchema` instance,
@@ -850,9 +1776,12 @@ class JSONSchema(Schema):
         body = self._oneof_body(obj)
         if self.nested:
             return body
+        key, value = _definitions_entry(
+            self.definitions_path, self._nested_schema_classes
+        )
         root: typing.Dict[str, typing.Any] = {
             "$schema": "http://json-schema.org/draft-07/schema#",
-            self.definitions_path: self._nested_schema_classes,
+            key: value,
         }
         if getattr(obj, "many", False):
             root["type"] = "array"
@@ -864,11 +1793,14 @@ class JSONSchema(Schema):
     @post_dump
     def wrap(self, data, **_) -> typing.Dict[str, typing.Any]:
         """Wrap this with the root schema definitions."""
+        if self.inheritance:
+            self._add_base_shape(data, self.obj)
         if self.nested:  # no need to wrap, will be in outer defs
             return data
 
         cls = self.obj.__class__
         name = cls.__name__
+        self._claim_definition(name, cls)
 
         data["additionalProperties"] = _resolve_additional_properties(cls)
         for meta_key in ("title", "description"):
@@ -877,19 +1809,24 @@ class JSONSchema(Schema):
                 data[meta_key] = value
 
         self._nested_schema_classes[name] = data
+        if self.stats is not None:
+            self.stats.record_definition(reused=False)
         ref = "#/{path}/{name}".format(path=self.definitions_path, name=name)
+        key, value = _definitions_entry(
+            self.definitions_path, self._nested_schema_classes
+        )
         # `Schema(many=True)` describes a list of objects rather than a
         # single one; emit Draft-7's array envelope so consumers don't
         # have to post-process the output. Closes #92.
         if getattr(self.obj, "many", False):
             return {
                 "$schema": "http://json-schema.org/draft-07/schema#",
-                self.definitions_path: self._nested_schema_classes,
+                key: value,
                 "type": "array",
                 "items": {"$ref": ref},
             }
         return {
             "$schema": "http://json-schema.org/draft-07/schema#",
-            self.definitions_path: self._nested_schema_classes,
+            key: value,
             "$ref": ref,
         }
@@ -0,0 +1,288 @@
+import typing
+
+from marshmallow import ValidationError, validate
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised when numpy is absent
+    np = None  # type: ignore[assignment]
+
+__all__ = ("BatchResult", "BatchValidator")
+
+Column = typing.Any  # a list/sequence of values or a 1-d numpy array
+
+
+class BatchResult:
+    """Outcome of `BatchValidator.validate`.
+
+    `mask[i]` is True when row `i` fails validation, `field_masks[name]`
+    narrows that to one field. Masks are numpy boolean arrays when the
+    input held any numpy array, lists of bools otherwise.
+    """
+
+    def __init__(self, mask, field_masks: typing.Dict[str, typing.Any]) -> None:
+        self.mask = mask
+        self.field_masks = field_masks
+
+    @property
+    def error_count(self) -> int:
+        return int(sum(self.mask))
+
+    def invalid_rows(self) -> typing.List[int]:
+        return [row for row, invalid in enumerate(self.mask) if invalid]
+
+
+# Each check takes the non-null values of a column and returns a
+# same-length sequence of bools, True where marshmallow's validator would
+# raise. The `_py_*` versions work on lists, the `_np_*` ones on arrays.
+
+
+def _py_range(validator, values):
+    low, high = validator.min, validator.max
+    low_inclusive = getattr(validator, "min_inclusive", True)
+    high_inclusive = getattr(validator, "max_inclusive", True)
+    result = [False] * len(values)
+    if low is not None:
+        if low_inclusive:
+            result = [bad or v < low for bad, v in zip(result, values)]
+        else:
+            result = [bad or v <= low for bad, v in zip(result, values)]
+    if high is not None:
+        if high_inclusive:
+            result = [bad or v > high for bad, v in zip(result, values)]
+        else:
+            result = [bad or v >= high for bad, v in zip(result, values)]
+    return result
+
+
+def _length_errors(validator, lengths):
+    result = [False] * len(lengths)
+    if validator.equal is not None:
+        return [n != validator.equal for n in lengths]
+    if validator.min is not None:
+        result = [bad or n < validator.min for bad, n in zip(result, lengths)]
+    if validator.max is not None:
+        result = [bad or n > validator.max for bad, n in zip(result, lengths)]
+    return result
+
+
+def _py_length(validator, values):
+    return _length_errors(validator, [len(v) for v in values])
+
+
+def _py_one_of(validator, values):
+    choices = validator.choices
+
+    def rejected(value):
+        try:
+            return value not in choices
+        except TypeError:
+            return True
+
+    return [rejected(v) for v in values]
+
+
+def _py_equal(validator, values):
+    return [v != validator.comparable for v in values]
+
+
+def _py_regexp(validator, values):
+    # Columns repeat values a lot; match each distinct value once.
+    verdicts: typing.Dict[typing.Any, bool] = {}
+    match = validator.regex.match
+    result = []
+    for value in values:
+        verdict = verdicts.get(value)
+        if verdict is None:
+            verdict = verdicts[value] = match(value) is None
+        result.append(verdict)
+    return result
+
+
+def _np_range(validator, values):
+    result = np.zeros(len(values), dtype=bool)
+    if validator.min is not None:
+        if getattr(validator, "min_inclusive", True):
+            result |= values < validator.min
+        else:
+            result |= values <= validator.min
+    if validator.max is not None:
+        if getattr(validator, "max_inclusive", True):
+            result |= values > validator.max
+        else:
+            result |= values >= validator.max
+    return result
+
+
+def _np_length(validator, values):
+    if values.dtype.kind in "US":
+        lengths = np.char.str_len(values)
+    else:
+        lengths = np.fromiter(
+            (len(v) for v in values), dtype=np.int64, count=len(values)
+        )
+    result = np.zeros(len(values), dtype=bool)
+    if validator.equal is not None:
+        return lengths != validator.equal
+    if validator.min is not None:
+        result |= lengths < validator.min
+    if validator.max is not None:
+        result |= lengths > validator.max
+    return result
+
+
+def _np_one_of(validator, values):
+    # Check each distinct value with Python's `in`, so `1 in ("1",)` and
+    # friends get exactly marshmallow's answer, then broadcast back.
+    uniques, inverse = np.unique(values, return_inverse=True)
+    verdicts = np.array(_py_one_of(validator, uniques.tolist()), dtype=bool)
+    return verdicts[inverse]
+
+
+def _np_equal(validator, values):
+    return np.asarray(values != validator.comparable, dtype=bool)
+
+
+def _np_regexp(validator, values):
+    uniques, inverse = np.unique(values, return_inverse=True)
+    match = validator.regex.match
+    verdicts = np.fromiter(
+        (match(value) is None for value in uniques.tolist()),
+        dtype=bool,
+        count=len(uniques),
+    )
+    return verdicts[inverse]
+
+
+# Only these exact classes are vectorized: a subclass may override
+# `__call__`, so it is applied value by value like any other validator.
+_CHECKS = {
+    validate.Range: (_py_range, _np_range),
+    validate.Length: (_py_length, _np_length),
+    validate.OneOf: (_py_one_of, _np_one_of),
+    validate.Equal: (_py_equal, _np_equal),
+    validate.Regexp: (_py_regexp, _np_regexp),
+}
+
+
+def _call_validator(validator, values):
+    def rejected(value):
+        try:
+            result = validator(value)
+        except ValidationError:
+            return True
+        # marshmallow treats a validator returning False as a failure.
+        return result is False
+
+    return [rejected(v) for v in values]
+
+
+class BatchValidator:
+    """Check columns of already-deserialized values against the field
+    validators of a marshmallow schema, one column at a time.
+
+        validator = BatchValidator(UserSchema())
+        result = validator.validate({"name": names, "age": ages})
+        result.mask          # True for every row marshmallow would reject
+
+    `Range`, `Length`, `OneOf`, `Equal` and `Regexp` are evaluated as
+    one operation over the whole column - vectorized with numpy when a
+    column is a 1-d numpy array of scalars (not `dtype=object`), as a
+    single pass over the values otherwise.
+    Any other validator is called once per value. `None` is accepted
+    only for `allow_none` fields, as in `Schema.load`; a missing
+    column fails every row for a required field and is skipped
+    otherwise.
+
+    Only field validators are checked: columns must already hold the
+    deserialized values (e.g. ints for an `Integer` field), and schema
+    level `@validates_schema` hooks are not run.
+    """
+
+    def __init__(self, schema) -> None:
+        if isinstance(schema, type):
+            schema = schema()
+        self.schema = schema
+        self._fields = [
+            (name, field)
+            for name, field in schema.fields.items()
+            if not field.dump_only
+        ]
+
+    def validate(self, columns: typing.Mapping[str, Column]) -> BatchResult:
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length")
+        rows = lengths.pop() if lengths else 0
+        use_numpy = np is not None and any(
+            isinstance(column, np.ndarray) for column in columns.values()
+        )
+
+        field_masks = {}
+        for name, field in self._fields:
+            if name in columns:
+                field_masks[name] = self._validate_column(
+                    field, columns[name], use_numpy
+                )
+            elif field.required:
+                field_masks[name] = (
+                    np.ones(rows, dtype=bool) if use_numpy else [True] * rows
+                )
+
+        mask: typing.Any
+        if use_numpy:
+            mask = np.zeros(rows, dtype=bool)
+            for field_mask in field_masks.values():
+                mask |= field_mask
+        else:
+            mask = [any(flags) for flags in zip(*field_masks.values())] or [
+                False
+            ] * rows
+        return BatchResult(mask, field_masks)
+
+    def _validate_column(self, field, column, use_numpy):
+        if not use_numpy:
+            return self._validate_list(field, column)
+        # Only 1-d arrays of scalars are vectorized. `np.asarray` would
+        # turn a list of equal-length lists (a `List` field) into a 2-d
+        # array, and object arrays may hold `None`s or unorderable values.
+        if (
+            isinstance(column, np.ndarray)
+            and column.ndim == 1
+            and column.dtype.kind != "O"
+        ):
+            return self._validate_array(field, column)
+        return np.array(self._validate_list(field, column), dtype=bool)
+
+    def _validate_array(self, field, column):
+        mask = np.zeros(len(column), dtype=bool)
+        if not len(column):
+            return mask
+        for validator in field.validators:
+            check = _CHECKS.get(type(validator))
+            if check is None:
+                mask |= np.array(
+                    _call_validator(validator, column.tolist()), dtype=bool
+                )
+            else:
+                mask |= check[1](validator, column)
+        return mask
+
+    def _validate_list(self, field, column):
+        column = list(column)
+        present = [row for row, value in enumerate(column) if value is not None]
+        mask = [value is None and not field.allow_none for value in column]
+        values = [column[row] for row in present]
+        if not values:
+            return mask
+        for validator in field.validators:
+            check = _CHECKS.get(type(validator))
+            errors = (
+                _call_validator(validator, values)
+                if check is None
+                else check[0](validator, values)
+            )
+            for row, error in zip(present, errors):
+                if error:
+                    mask[row] = True
+        return mask
@@ -0,0 +1,416 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import typing
+import weakref
+from enum import Enum
+from inspect import isclass
+
+import marshmallow
+from marshmallow import fields
+
+from .canonical import canonical_dumps, content_hash
+from .frozen import freeze
+
+__all__ = (
+    "DirectoryCache",
+    "MemoryCache",
+    "SQLiteCache",
+    "cached_fingerprint",
+    "fingerprint",
+    "invalidate_fingerprints",
+    "schema_cache_key",
+)
+
+# Field attributes that shape the generated property. Anything not
+# listed here (error messages, deserialization-only knobs) cannot change
+# the output and is left out so it does not churn fingerprints.
+_FIELD_ATTRIBUTES = (
+    "data_key",
+    "attribute",
+    "required",
+    "allow_none",
+    "dump_only",
+    "load_only",
+    "only",
+    "exclude",
+    "many",
+    "field_name",
+    "constant",
+    "enum",
+    "by_value",
+    "strict",
+    "format",
+    "as_string",
+    "places",
+)
+
+# Attributes holding inner fields of container fields.
+_INNER_FIELD_ATTRIBUTES = ("inner", "key_field", "value_field")
+_INNER_FIELD_LIST_ATTRIBUTES = ("tuple_fields", "_candidate_fields")
+
+
+def _qualified_name(obj) -> str:
+    return "{}.{}".format(obj.__module__, obj.__qualname__)
+
+
+def _distribution_version(name: str) -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def _describe_value(value) -> typing.Any:
+    """A stable, JSON-serializable stand-in for an arbitrary attribute
+    value. Falls back to `repr`, which for objects without a custom
+    repr includes an address: that only costs a cache miss."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if value is marshmallow.missing:
+        return "<missing>"
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_describe_value(item) for item in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort(key=repr)
+        return items
+    if isinstance(value, dict):
+        return sorted(
+            ([str(key), _describe_value(item)] for key, item in value.items()),
+            key=lambda pair: pair[0],
+        )
+    if isclass(value) and issubclass(value, Enum):
+        return [_qualified_name(value)] + [
+            [member.name, _describe_value(member.value)] for member in value
+        ]
+    if isclass(value):
+        return _qualified_name(value)
+    if callable(value) and hasattr(value, "__code__"):
+        return _describe_code(value)
+    return repr(value)
+
+
+def _describe_code(func) -> typing.List[typing.Any]:
+    """Identify a function by its bytecode, so editing a custom field's
+    `_jsonschema_type_mapping` invalidates cached documents."""
+    code = func.__code__
+    return [
+        _qualified_name(func),
+        hashlib.sha256(code.co_code).hexdigest(),
+        repr(code.co_consts),
+    ]
+
+
+def _describe_field(field, seen) -> typing.List[typing.Any]:
+    field_cls = field.__class__
+    description: typing.List[typing.Any] = [_qualified_name(field_cls)]
+    mapping = getattr(field_cls, "_jsonschema_type_mapping", None)
+    if mapping is not None:
+        description.append(_describe_code(mapping))
+    for attribute in _FIELD_ATTRIBUTES:
+        if hasattr(field, attribute):
+            description.append([attribute, _describe_value(getattr(field, attribute))])
+    description.append(["default", _describe_value(field.dump_default)])
+    description.append(["metadata", _describe_value(field.metadata)])
+    description.append(
+        ["validators", [_describe_validator(v) for v in field.validators]]
+    )
+    for attribute in _INNER_FIELD_ATTRIBUTES:
+        inner = getattr(field, attribute, None)
+        if isinstance(inner, fields.Field):
+            description.append([attribute, _describe_field(inner, seen)])
+    for attribute in _INNER_FIELD_LIST_ATTRIBUTES:
+        inner_fields = getattr(field, attribute, None)
+        if inner_fields:
+            description.append(
+                [attribute, [_describe_field(inner, seen) for inner in inner_fields]]
+            )
+    if isinstance(field, fields.Nested):
+        description.append(["nested", _describe_schema(field.schema, seen)])
+    return description
+
+
+def _describe_validator(validator) -> typing.List[typing.Any]:
+    if hasattr(validator, "__code__"):
+        return _describe_code(validator)
+    return [
+        _qualified_name(validator.__class__),
+        sorted(
+            [key, _describe_value(value)]
+            for key, value in vars(validator).items()
+            if not key.startswith("_")
+        ),
+    ]
+
+
+def _describe_meta(schema_cls) -> typing.List[typing.Any]:
+    meta = getattr(schema_cls, "Meta", None)
+    if meta is None:
+        return []
+    names = sorted(
+        name
+        for klass in meta.__mro__
+        for name in vars(klass)
+        if not name.startswith("__")
+    )
+    return [[name, _describe_value(getattr(meta, name))] for name in names]
+
+
+def _describe_schema(schema, seen) -> typing.Any:
+    schema_cls = schema.__class__
+    name = _qualified_name(schema_cls)
+    if name in seen:
+        # Recursive reference; its body is already part of the digest.
+        return ["ref", name]
+    seen.add(name)
+    return [
+        name,
+        _describe_meta(schema_cls),
+        [
+            _describe_value(getattr(schema, option, None))
+            for option in ("many", "partial", "only", "exclude", "dump_only")
+        ],
+        [
+            [field_name, _describe_field(field, seen)]
+            for field_name, field in schema.fields.items()
+        ],
+        [
+            ["variant", type_value, _describe_schema(variant(), seen)]
+            for type_value, variant in sorted(
+                getattr(schema_cls, "type_schemas", {}).items()
+            )
+        ],
+    ]
+
+
+def _describe_generator(generator) -> typing.List[typing.Any]:
+    return [_describe_value(option) for option in generator._options_key()]
+
+
+def _digest(description) -> str:
+    return content_hash(description)
+
+
+# Schema instance options that shape the generated document.
+_INSTANCE_OPTIONS = ("many", "partial", "only", "exclude", "dump_only", "load_only")
+
+
+def _describe_instance(schema) -> typing.List[typing.Any]:
+    return [
+        _describe_value(getattr(schema, option, None)) for option in _INSTANCE_OPTIONS
+    ]
+
+
+def schema_cache_key(schema, generator) -> str:
+    """Which cache slot `generator.dump(schema)` occupies: the schema
+    class, the instance's `many` / `only` / `exclude` / `partial` /
+    `dump_only` / `load_only` and the generator's options. Independent
+    of the schema's contents, so a changed schema overwrites its
+    previous entry."""
+    return _digest(
+        [
+            _qualified_name(schema.__class__),
+            _describe_instance(schema),
+            _describe_generator(generator),
+        ]
+    )
+
+
+def fingerprint(schema, generator) -> str:
+    """A digest of everything that shapes `generator.dump(schema)`: the
+    fields of `schema` and of every schema nested in it (types,
+    attributes, metadata, defaults and validators), their `Meta`
+    options, the generator's options and the marshmallow and
+    marshmallow-jsonschema versions."""
+    return _digest(
+        [
+            _distribution_version("marshmallow-jsonschema"),
+            _distribution_version("marshmallow"),
+            _describe_generator(generator),
+            _describe_schema(schema, set()),
+        ]
+    )
+
+
+# `cached_fingerprint` results: schema class -> {instance and generator
+# options: fingerprint}. Weak, so classes created on the fly don't leak.
+_FINGERPRINTS: "weakref.WeakKeyDictionary[type, typing.Dict[bytes, str]]"
+_FINGERPRINTS = weakref.WeakKeyDictionary()
+
+
+def cached_fingerprint(schema, generator) -> str:
+    """`fingerprint(schema, generator)`, computed once per schema class,
+    instance options and generator options in this process. Describing
+    a schema walks every field and nested schema, which costs more than
+    generating it; cache lookups (`JSONSchema(cache=...)`) go through
+    here so that a hit stays cheap.
+
+    Schema classes are assumed not to change once used. Call
+    `invalidate_fingerprints` after modifying one (or a schema nested in
+    it) at runtime.
+    """
+    options = canonical_dumps(
+        [_describe_instance(schema), _describe_generator(generator)]
+    )
+    fingerprints = _FINGERPRINTS.get(schema.__class__)
+    if fingerprints is None:
+        fingerprints = _FINGERPRINTS[schema.__class__] = {}
+    digest = fingerprints.get(options)
+    if digest is None:
+        digest = fingerprints[options] = fingerprint(schema, generator)
+    return digest
+
+
+def invalidate_fingerprints(schema_cls: typing.Optional[type] = None) -> None:
+    """Forget the fingerprints `cached_fingerprint` computed for
+    `schema_cls`, or for every schema class if `None`."""
+    if schema_cls is None:
+        _FINGERPRINTS.clear()
+    else:
+        _FINGERPRINTS.pop(schema_cls, None)
+
+
+class MemoryCache:
+    """In-process cache of frozen documents.
+
+        cache = MemoryCache()
+        JSONSchema(cache=cache).dump(UserSchema())
+
+    Documents are frozen once when stored (see
+    `marshmallow_jsonschema.frozen`), so a hit returns the stored object
+    itself without copying or parsing, and mutating it raises
+    `TypeError` instead of corrupting the cache.
+    """
+
+    def __init__(self) -> None:
+        self._entries: typing.Dict[str, typing.Tuple[str, typing.Dict]] = {}
+
+    def get(self, key: str, fingerprint: str) -> typing.Optional[typing.Dict]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != fingerprint:
+            return None
+        return entry[1]
+
+    def set(self, key: str, fingerprint: str, document: typing.Dict) -> None:
+        self._entries[key] = (fingerprint, freeze(document))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class DirectoryCache:
+    """Persistent cache storing one JSON file per cache key in `path`.
+
+        JSONSchema(cache=DirectoryCache(".jsonschema-cache")).dump(UserSchema())
+
+    Writes go to a temporary file that is atomically renamed into
+    place, so concurrent writers (several worker processes warming up
+    at once) never leave a partially written entry behind; the last
+    write wins, and all writers produce the same document anyway.
+    """
+
+    def __init__(self, path: typing.Union[str, "os.PathLike[str]"]) -> None:
+        self.path = os.fspath(path)
+        os.makedirs(self.path, exist_ok=True)
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.path, key + ".json")
+
+    def get(self, key: str, fingerprint: str) -> typing.Optional[typing.Dict]:
+        """The document stored under `key`, or None if there is none or
+        it was generated from a schema with a different fingerprint."""
+        try:
+            with open(self._entry_path(key), encoding="utf-8") as fp:
+                entry = json.load(fp)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry.get("document")
+
+    def set(self, key: str, fingerprint: str, document: typing.Dict) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump({"fingerprint": fingerprint, "document": document}, fp)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def clear(self) -> None:
+        for name in os.listdir(self.path):
+            if name.endswith(".json"):
+                try:
+                    os.unlink(os.path.join(self.path, name))
+                except FileNotFoundError:
+                    pass
+
+
+class SQLiteCache:
+    """Persistent cache in a single sqlite3 database file.
+
+        JSONSchema(cache=SQLiteCache("jsonschema-cache.sqlite3"))
+
+    The database runs in WAL mode so readers never block on a writer,
+    and writers from several processes are serialized by SQLite's own
+    locking (waiting up to `timeout` seconds). Connections are opened
+    per thread and per process, so a cache created before a fork keeps
+    working in the children.
+    """
+
+    def __init__(
+        self, path: typing.Union[str, "os.PathLike[str]"], timeout: float = 30.0
+    ) -> None:
+        self.path = os.fspath(path)
+        self.timeout = timeout
+        self._local = threading.local()
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS jsonschema_cache ("
+                "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                "document TEXT NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        if getattr(self._local, "pid", None) != pid:
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def get(self, key: str, fingerprint: str) -> typing.Optional[typing.Dict]:
+        """The document stored under `key`, or None if there is none or
+        it was generated from a schema with a different fingerprint."""
+        row = (
+            self._connect()
+            .execute(
+                "SELECT document FROM jsonschema_cache "
+                "WHERE key = ? AND fingerprint = ?",
+                (key, fingerprint),
+            )
+            .fetchone()
+        )
+        return None if row is None else json.loads(row[0])
+
+    def set(self, key: str, fingerprint: str, document: typing.Dict) -> None:
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO jsonschema_cache "
+                "(key, fingerprint, document) VALUES (?, ?, ?)",
+                (key, fingerprint, json.dumps(document)),
+            )
+
+    def clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM jsonschema_cache")
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import typing
+
+__all__ = (
+    "canonical_dumps",
+    "canonicalize",
+    "content_hash",
+    "definition_hash",
+    "definition_hashes",
+)
+
+_ENCODER = json.JSONEncoder(ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+# Where `JSONSchema(content_hashes=...)` embeds a definition's hash: a
+# vendor key, or a Draft-07 plain-name `$id` (a location-independent
+# anchor, which unlike a URI doesn't change how `$ref`s inside the
+# definition resolve).
+HASH_KEY = "x-content-hash"
+ANCHOR_PREFIX = "#sha256-"
+
+
+def _json_key(key: typing.Any) -> str:
+    """`key` as `json` writes an object key."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        if key != key:
+            return "NaN"
+        if key in (float("inf"), float("-inf")):
+            return "Infinity" if key > 0 else "-Infinity"
+        return float.__repr__(key)
+    raise TypeError(
+        "keys must be str, int, float, bool or None, not {}".format(
+            key.__class__.__name__
+        )
+    )
+
+
+def _json_items(value: typing.Mapping[typing.Any, typing.Any]):
+    """The items of `value` with `json`-converted keys. Two keys that
+    convert to the same string (`1` and `"1"`) raise `ValueError`: which
+    one `json` would emit last is an accident of insertion order."""
+    items: typing.Dict[str, typing.Any] = {}
+    for key, item in value.items():
+        json_key = _json_key(key)
+        if json_key in items:
+            raise ValueError(
+                "Keys {!r} collide once converted to JSON strings".format(json_key)
+            )
+        items[json_key] = item
+    return items
+
+
+def _has_non_str_keys(value: typing.Any) -> bool:
+    if isinstance(value, dict):
+        return any(
+            not isinstance(key, str) or _has_non_str_keys(item)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_str_keys(item) for item in value)
+    return False
+
+
+def _with_str_keys(value: typing.Any) -> typing.Any:
+    if isinstance(value, dict):
+        return {key: _with_str_keys(item) for key, item in _json_items(value).items()}
+    if isinstance(value, (list, tuple)):
+        return [_with_str_keys(item) for item in value]
+    return value
+
+
+def canonicalize(value: typing.Any) -> typing.Any:
+    """A copy of the JSON-like structure `value` with the keys of every
+    object in sorted order, so equal documents iterate - and `json.dumps`
+    - identically however they were built. Non-string keys (e.g. in a
+    `Dict` field's default) are converted to strings first, as `json`
+    does. Arrays keep their order (it is significant in `required`,
+    `enum`, tuple `items`...). Frozen containers (see
+    `marshmallow_jsonschema.frozen`) stay frozen."""
+    if isinstance(value, dict):
+        items = _json_items(value)
+        return value.__class__((key, canonicalize(items[key])) for key in sorted(items))
+    if isinstance(value, list):
+        return value.__class__(canonicalize(item) for item in value)
+    if isinstance(value, tuple):
+        return [canonicalize(item) for item in value]
+    return value
+
+
+def canonical_dumps(document: typing.Any) -> bytes:
+    """The canonical serialization of `document`: sorted keys, no
+    whitespace, UTF-8 without escaping. Equal documents always produce
+    the same bytes, whatever their key order.
+
+    Non-string keys are converted to strings as `json` does, and sorted
+    as such; keys that collide once converted raise `ValueError`. Values
+    that aren't JSON raise `TypeError` rather than being encoded in some
+    process-dependent way.
+    """
+    if _has_non_str_keys(document):
+        # `sort_keys` would compare the raw keys.
+        document = _with_str_keys(document)
+    return _ENCODER.encode(document).encode("utf-8")
+
+
+def content_hash(document: typing.Any) -> str:
+    """The SHA-256 hex digest of `canonical_dumps(document)`."""
+    return hashlib.sha256(canonical_dumps(document)).hexdigest()
+
+
+def _embedded_hash_key(key: str, value: typing.Any) -> bool:
+    return key == HASH_KEY or (
+        key == "$id" and isinstance(value, str) and value.startswith(ANCHOR_PREFIX)
+    )
+
+
+def definition_hash(definition: typing.Mapping[str, typing.Any]) -> str:
+    """The content hash of one definition, leaving out a hash embedded
+    in it by `JSONSchema(content_hashes=...)` (a definition that only
+    refers to the anchor of an identical one has that one's hash).
+    Definitions reference each other by name, so a definition's hash
+    only changes when its own body does."""
+    ref = definition.get("$ref")
+    if len(definition) == 1 and isinstance(ref, str) and ref.startswith(ANCHOR_PREFIX):
+        return ref[len(ANCHOR_PREFIX) :]
+    if HASH_KEY in definition or "$id" in definition:
+        definition = {
+            key: value
+            for key, value in definition.items()
+            if not _embedded_hash_key(key, value)
+        }
+    return content_hash(definition)
+
+
+def definition_hashes(
+    document: typing.Mapping[str, typing.Any], definitions_path: str = "definitions"
+) -> typing.Dict[str, str]:
+    """`definition_hash` of every definition in a generated document,
+    by definition name."""
+    from .base import _lookup_definitions
+
+    return {
+        name: definition_hash(definition)
+        for name, definition in _lookup_definitions(document, definitions_path).items()
+    }
@@ -0,0 +1,224 @@
+import typing
+
+from .base import JSONSchema, _lookup_definitions
+from .canonical import canonical_dumps
+from .exceptions import UnsupportedValueError
+from .frozen import freeze
+from .optimizer import _optimize_schema
+
+__all__ = ("DIALECTS", "register_dialect", "render", "schema_ir")
+
+Document = typing.Dict[str, typing.Any]
+Renderer = typing.Callable[[Document, str], Document]
+
+# Intermediate documents and their renderings, keyed by `_cache_key`.
+CacheKey = typing.Tuple[typing.Any, ...]
+_IR_CACHE: typing.Dict[CacheKey, Document] = {}
+_RENDER_CACHE: typing.Dict[
+    typing.Tuple[CacheKey, str], typing.Tuple[Renderer, Document]
+] = {}
+_CACHE_MAX = 256
+
+_COMPONENTS_PREFIX = "#/components/schemas/"
+
+# `{"type": "null"}` as rendered for OpenAPI 3.0.
+_OPENAPI30_NULL = {"enum": [None], "nullable": True}
+
+
+def schema_ir(schema, generator: typing.Optional[JSONSchema] = None) -> Document:
+    """The intermediate representation of `schema` every dialect is
+    rendered from: the generator's output (`JSONSchema()` by default),
+    built once per schema class and configuration and shared, so it is
+    frozen (see `marshmallow_jsonschema.frozen`)."""
+    if isinstance(schema, type):
+        schema = schema()
+    if generator is None:
+        generator = JSONSchema()
+    return _schema_ir(schema, generator, _cache_key(schema, generator))
+
+
+def _cache_key(schema, generator) -> typing.Optional[CacheKey]:
+    """The schema class itself (names aren't unique: every
+    `Schema.from_dict` class is a `GeneratedSchema`), the instance
+    options and the generator options."""
+    if getattr(schema, "context", None):
+        # The output may depend on the context; don't cache it.
+        return None
+    from .cache import _describe_instance
+
+    return (
+        schema.__class__,
+        canonical_dumps(_describe_instance(schema)),
+        generator._options_key(),
+    )
+
+
+def _schema_ir(schema, generator, key) -> Document:
+    if key is None:
+        return freeze(generator.dump(schema))
+    document = _IR_CACHE.get(key)
+    if document is None:
+        document = freeze(generator.dump(schema))
+        if len(_IR_CACHE) >= _CACHE_MAX:
+            _IR_CACHE.clear()
+        _IR_CACHE[key] = document
+    return document
+
+
+def _split(document: Document, definitions_path: str):
+    entry = definitions_path.split("/")[0]
+    root = {
+        key: value for key, value in document.items() if key not in ("$schema", entry)
+    }
+    return root, _lookup_definitions(document, definitions_path)
+
+
+def _components(root, definitions, node) -> Document:
+    return {
+        "schema": _optimize_schema(root, [node]),
+        "components": {
+            "schemas": {
+                name: _optimize_schema(definition, [node])
+                for name, definition in definitions.items()
+            }
+        },
+    }
+
+
+def render_draft07(document: Document, definitions_path: str) -> Document:
+    """The generator's own output."""
+    return document
+
+
+def _openapi_ref(node: Document, definitions_path: str) -> Document:
+    ref = node.get("$ref")
+    prefix = "#/{}/".format(definitions_path)
+    if isinstance(ref, str) and ref.startswith(prefix):
+        node["$ref"] = _COMPONENTS_PREFIX + ref[len(prefix) :]
+    if "enumNames" in node:
+        node["x-enumNames"] = node.pop("enumNames")
+    return node
+
+
+def render_openapi30(document: Document, definitions_path: str) -> Document:
+    """OpenAPI 3.0 Schema Objects: `{"schema": ..., "components":
+    {"schemas": ...}}`. `null` types become `nullable`, `const` a
+    one-element `enum`, numeric `exclusiveMinimum`/`exclusiveMaximum`
+    the boolean form and tuple `items` an `anyOf` of the positions."""
+
+    def node(schema: Document) -> Document:
+        schema = _openapi_ref(dict(schema), definitions_path)
+        if "const" in schema:
+            schema["enum"] = [schema.pop("const")]
+        for exclusive, bound in (
+            ("exclusiveMinimum", "minimum"),
+            ("exclusiveMaximum", "maximum"),
+        ):
+            value = schema.get(exclusive)
+            if not isinstance(value, bool) and value is not None:
+                schema[bound] = value
+                schema[exclusive] = True
+        if isinstance(schema.get("items"), list):
+            schema["items"] = {"anyOf": schema["items"]}
+        types = schema.get("type")
+        if isinstance(types, list):
+            if "null" in types:
+                schema["nullable"] = True
+                types = [t for t in types if t != "null"]
+            if len(types) == 1:
+                schema["type"] = types[0]
+            else:
+                del schema["type"]
+                if types:
+                    schema["anyOf"] = [{"type": t} for t in types]
+        elif types == "null":
+            del schema["type"]
+            schema.update(_OPENAPI30_NULL)
+        any_of = schema.get("anyOf")
+        if isinstance(any_of, list) and _OPENAPI30_NULL in any_of:
+            rest = [candidate for candidate in any_of if candidate != _OPENAPI30_NULL]
+            del schema["anyOf"]
+            schema["nullable"] = True
+            if len(rest) == 1 and not set(rest[0]) & set(schema):
+                if "$ref" in rest[0]:
+                    schema["allOf"] = rest
+                else:
+                    schema.update(rest[0])
+            elif rest:
+                schema["anyOf"] = rest
+        if "$ref" in schema and len(schema) > 1:
+            # Siblings of `$ref` are ignored in OpenAPI 3.0.
+            ref = {"$ref": schema.pop("$ref")}
+            if schema.get("type") == "object":
+                del schema["type"]
+            if schema:
+                schema["allOf"] = [ref]
+            else:
+                schema = ref
+        return schema
+
+    root, definitions = _split(document, definitions_path)
+    return _components(root, definitions, node)
+
+
+def render_openapi31(document: Document, definitions_path: str) -> Document:
+    """OpenAPI 3.1 (JSON Schema 2020-12) Schema Objects: `{"schema": ...,
+    "components": {"schemas": ...}}`, with tuple `items` as
+    `prefixItems`."""
+
+    def node(schema: Document) -> Document:
+        schema = _openapi_ref(dict(schema), definitions_path)
+        if isinstance(schema.get("items"), list):
+            schema["prefixItems"] = schema.pop("items")
+            if "additionalItems" in schema:
+                schema["items"] = schema.pop("additionalItems")
+        return schema
+
+    root, definitions = _split(document, definitions_path)
+    return _components(root, definitions, node)
+
+
+#: Dialect name -> renderer, called with the intermediate document and
+#: the generator's `definitions_path`.
+DIALECTS: typing.Dict[str, Renderer] = {
+    "draft-07": render_draft07,
+    "openapi-3.0": render_openapi30,
+    "openapi-3.1": render_openapi31,
+}
+
+
+def register_dialect(name: str, renderer: Renderer) -> None:
+    """Make `renderer` available as `render(schema, name)`. It receives
+    the (frozen) intermediate document and must not modify it."""
+    DIALECTS[name] = renderer
+
+
+def render(
+    schema, dialect: str = "draft-07", generator: typing.Optional[JSONSchema] = None
+) -> Document:
+    """Render `schema` in `dialect` from its cached intermediate
+    representation; every dialect shares one traversal of the schema.
+
+        render(UserSchema(), "openapi-3.0")["components"]["schemas"]["UserSchema"]
+
+    The result is cached and shared too, so it is frozen.
+    """
+    if dialect not in DIALECTS:
+        raise UnsupportedValueError("Unknown dialect %r" % (dialect,))
+    if isinstance(schema, type):
+        schema = schema()
+    if generator is None:
+        generator = JSONSchema()
+    key = _cache_key(schema, generator)
+    document = _schema_ir(schema, generator, key)
+    renderer = DIALECTS[dialect]
+    if key is None:
+        return freeze(renderer(document, generator.definitions_path))
+    rendered = _RENDER_CACHE.get((key, dialect))
+    # A re-registered dialect invalidates what its predecessor rendered.
+    if rendered is None or rendered[0] is not renderer:
+        rendered = (renderer, freeze(renderer(document, generator.definitions_path)))
+        if len(_RENDER_CACHE) >= _CACHE_MAX:
+            _RENDER_CACHE.clear()
+        _RENDER_CACHE[(key, dialect)] = rendered
+    return rendered[1]
@@ -1,2 +1,6 @@
 class UnsupportedValueError(Exception):
     pass
+
+
+class RegexComplexityWarning(UserWarning):
+    """A `Regexp` validator's pattern risks catastrophic backtracking."""
@@ -1,4 +1,22 @@
-from marshmallow_jsonschema.base import JSONSchema
+import typing
+
+from marshmallow import fields
+
+from marshmallow_jsonschema.base import JSONSchema, _field_metadata
+from marshmallow_jsonschema.frozen import freeze
+
+# `(json_schema, uischema)` pairs, frozen, keyed by generator options,
+# schema class and the schema instance options that shape the output.
+_UISCHEMA_CACHE: typing.Dict[
+    typing.Tuple[typing.Any, ...], typing.Tuple[dict, dict]
+] = {}
+_UISCHEMA_CACHE_MAX = 256
+
+
+def _frozen_option(value):
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    return frozenset(value)
 
 
 class ReactJsonSchemaFormJSONSchema(JSONSchema):
@@ -26,9 +44,53 @@ class ReactJsonSchemaFormJSONSchema(JSONSchema):
     json_schema, uischema = json_schema_obj.dump_with_uischema(MySchema())
     """
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # schema class -> [(property, ui options, nested schema class,
+        # nested is a list)], filled in while generating when set.
+        self._uischema_records: typing.Optional[typing.Dict[type, list]] = None
+
     def dump_with_uischema(self, obj, *, many=None):
-        """Runs both dump and dump_uischema."""
-        return self.dump(obj, many=many), self.dump_uischema(obj, many=many)
+        """Return `(json_schema, uischema)`, both built from a single
+        traversal of the schema. Results are cached per schema class
+        and generator configuration and shared between callers, so both
+        documents are frozen (see `marshmallow_jsonschema.frozen`)."""
+        if getattr(obj, "context", None):
+            # The output may depend on the context; don't cache it.
+            return self._dump_with_uischema(obj, many=many)
+        key = (
+            self._options_key(),
+            obj.__class__,
+            many,
+            obj.many,
+            _frozen_option(obj.only),
+            _frozen_option(obj.exclude),
+            _frozen_option(obj.partial),
+            _frozen_option(obj.load_only),
+            _frozen_option(obj.dump_only),
+        )
+        cached = _UISCHEMA_CACHE.get(key)
+        if cached is None:
+            json_schema, uischema = self._dump_with_uischema(obj, many=many)
+            cached = (freeze(json_schema), freeze(uischema))
+            if len(_UISCHEMA_CACHE) >= _UISCHEMA_CACHE_MAX:
+                _UISCHEMA_CACHE.clear()
+            _UISCHEMA_CACHE[key] = cached
+        return cached
+
+    def _dump_with_uischema(self, obj, *, many=None):
+        # The uiSchema is recorded while fields are generated, which a
+        # persistent cache hit or a definition left over from an earlier
+        # dump on this instance would skip.
+        self._uischema_records = {}
+        try:
+            json_schema = self._fresh_dump(obj, many=many)
+            uischema = self._assemble_uischema(
+                obj.__class__, self._uischema_records, frozenset([obj.__class__])
+            )
+        finally:
+            self._uischema_records = None
+        return json_schema, uischema
 
     def dump_uischema(self, obj, *, many=None):
         """
@@ -37,21 +99,55 @@ class ReactJsonSchemaFormJSONSchema(JSONSchema):
 
         See: https://rjsf-team.github.io/react-jsonschema-form/docs/api-reference/uiSchema
         """
-        return dict(self._dump_uischema_iter(obj, many=many))
+        return self.dump_with_uischema(obj, many=many)[1]
 
-    def _dump_uischema_iter(self, obj, *, many=None):
-        """
-        Dictionary-iterator backing ``dump_uischema``. ``many`` is accepted
-        for signature parity with ``dump`` but is currently unused — uiSchema
-        layout doesn't change for many-style dumps.
-        """
-        del many  # accepted for signature parity, intentionally unused
+    def _nested_generator(self):
+        generator = super()._nested_generator()
+        generator._uischema_records = self._uischema_records
+        return generator
+
+    def _get_schema_for_field(self, obj, field):
+        schema = super()._get_schema_for_field(obj, field)
+        # Container fields build their inner fields' schemas through
+        # here too; only the schema's own fields get an entry.
+        records = self._uischema_records
+        if records is not None and obj.fields.get(field.name) is field:
+            self._record_uischema(records, obj, field)
+        return schema
 
-        for k, v in getattr(obj.Meta, "react_uischema_extra", {}).items():
-            yield k, v
+    def _record_uischema(self, records, obj, field) -> None:
+        """Note `field`'s `ui:` metadata and any nested schema it
+        points at, to be assembled into the uiSchema after the dump."""
+        options = {
+            k: v for k, v in _field_metadata(field).items() if k.startswith("ui:")
+        }
+        nested_cls, items = None, False
+        if isinstance(field, fields.Nested) and not isinstance(field, fields.Pluck):
+            nested_cls, items = field.schema.__class__, bool(field.many)
+        elif (
+            isinstance(field, fields.List)
+            and isinstance(field.inner, fields.Nested)
+            and not isinstance(field.inner, fields.Pluck)
+        ):
+            nested_cls, items = field.inner.schema.__class__, True
+        name = field.metadata.get("name") or field.data_key or field.name
+        records.setdefault(obj.__class__, []).append((name, options, nested_cls, items))
 
-        for field_name, field in obj.fields.items():
-            # NOTE: doubled up to maintain backwards compatibility
-            metadata = field.metadata.get("metadata", {})
-            metadata.update(field.metadata)
-            yield field_name, {k: v for k, v in metadata.items() if k.startswith("ui:")}
+    def _assemble_uischema(self, schema_cls, records, active):
+        """The uiSchema for `schema_cls`: its `Meta.react_uischema_extra`
+        plus an entry per field. Nested schemas are merged into their
+        field's entry, under `items` for lists; a schema nested in itself
+        is not expanded again."""
+        uischema = dict(getattr(schema_cls.Meta, "react_uischema_extra", {}))
+        for name, options, nested_cls, items in records.get(schema_cls, ()):
+            entry = dict(options)
+            if nested_cls is not None and nested_cls not in active:
+                nested = self._assemble_uischema(
+                    nested_cls, records, active | {nested_cls}
+                )
+                if items:
+                    entry["items"] = nested
+                else:
+                    entry.update(nested)
+            uischema[name] = entry
+        return uischema
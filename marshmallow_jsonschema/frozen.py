@@ -0,0 +1,98 @@
+import typing
+
+__all__ = ("FrozenDict", "FrozenList", "freeze", "thaw")
+
+
+def _read_only(self, *args, **kwargs) -> typing.NoReturn:
+    raise TypeError(
+        "{} is read-only; use marshmallow_jsonschema.frozen.thaw() for a "
+        "mutable copy".format(type(self).__name__)
+    )
+
+
+class FrozenDict(dict):
+    """A `dict` whose mutating methods raise `TypeError`.
+
+    Still a `dict`, so lookups, iteration, `==`, `json.dumps` and
+    `isinstance(value, dict)` work unchanged and cost nothing extra.
+    Copying returns the same object; pickling round-trips to a
+    `FrozenDict`.
+    """
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __ior__ = _read_only
+    clear = _read_only
+    pop = _read_only
+    popitem = _read_only
+    setdefault = _read_only
+    update = _read_only
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo) -> "FrozenDict":
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (dict(self),))
+
+    def __repr__(self) -> str:
+        return "FrozenDict({})".format(dict.__repr__(self))
+
+
+class FrozenList(list):
+    """A `list` whose mutating methods raise `TypeError`; see
+    `FrozenDict`."""
+
+    __slots__ = ()
+
+    __setitem__ = _read_only
+    __delitem__ = _read_only
+    __iadd__ = _read_only
+    __imul__ = _read_only
+    append = _read_only
+    clear = _read_only
+    extend = _read_only
+    insert = _read_only
+    pop = _read_only
+    remove = _read_only
+    reverse = _read_only
+    sort = _read_only
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo) -> "FrozenList":
+        return self
+
+    def __reduce__(self):
+        return (self.__class__, (list(self),))
+
+    def __repr__(self) -> str:
+        return "FrozenList({})".format(list.__repr__(self))
+
+
+def freeze(value: typing.Any) -> typing.Any:
+    """A read-only version of the JSON-like structure `value`: dicts and
+    lists become `FrozenDict` / `FrozenList`, recursively, and tuples
+    become `FrozenList`. Already frozen containers are returned as is,
+    so freezing a document made of frozen parts only copies the rest."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: typing.Any) -> typing.Any:
+    """A mutable deep copy of `value` made of plain dicts and lists."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [thaw(item) for item in value]
+    return value
@@ -0,0 +1,174 @@
+import contextlib
+import threading
+import time
+import typing
+
+__all__ = (
+    "GenerationHook",
+    "SpanHook",
+    "TopNReporter",
+    "register_hook",
+    "unregister_hook",
+)
+
+# Hooks subscribed to every generator created after registration, on top
+# of the ones passed to `JSONSchema(hooks=...)`.
+_GLOBAL_HOOKS: typing.List["GenerationHook"] = []
+
+
+def register_hook(hook: "GenerationHook") -> None:
+    """Subscribe `hook` to every `JSONSchema` created from now on."""
+    if hook not in _GLOBAL_HOOKS:
+        _GLOBAL_HOOKS.append(hook)
+
+
+def unregister_hook(hook: "GenerationHook") -> None:
+    """Undo `register_hook`. Generators that already exist keep the hook."""
+    if hook in _GLOBAL_HOOKS:
+        _GLOBAL_HOOKS.remove(hook)
+
+
+def _global_hooks() -> typing.Tuple["GenerationHook", ...]:
+    return tuple(_GLOBAL_HOOKS)
+
+
+def _field_label(obj, field) -> str:
+    """`SchemaName.field_name`, for reporting."""
+    schema_cls = obj if isinstance(obj, type) else obj.__class__
+    return "{}.{}".format(schema_cls.__name__, field.name)
+
+
+class GenerationHook:
+    """Callbacks invoked while a `JSONSchema` generates a document.
+
+    Subclass and override whichever methods you need; the defaults do
+    nothing. `generator` is the `JSONSchema` instance doing the work (a
+    nested definition is generated by a child generator that shares the
+    parent's hooks), `obj` is the marshmallow schema being described.
+
+    `after_field` and `after_definition` run even if generation raises,
+    in which case `schema` / `definition` is None.
+    """
+
+    def before_field(self, generator, obj, field) -> None:
+        pass
+
+    def after_field(self, generator, obj, field, schema) -> None:
+        pass
+
+    def before_definition(self, generator, name: str) -> None:
+        pass
+
+    def after_definition(self, generator, name: str, definition) -> None:
+        pass
+
+    def on_validator(self, generator, field, validator, schema) -> None:
+        """Called after a validator handler has been applied to `schema`."""
+
+
+class SpanHook(GenerationHook):
+    """Adapter for tracers that think in spans rather than callbacks.
+
+    Implement `span(kind, name)` to return a context manager; it is
+    entered before each field (`kind="field"`, `name="Schema.field"`) and
+    definition (`kind="definition"`, `name="Schema"`) is generated and
+    exited afterwards. An OpenTelemetry tracer can be plugged in with:
+
+        class TracingHook(SpanHook):
+            def span(self, kind, name):
+                return tracer.start_as_current_span(
+                    "jsonschema." + kind, attributes={"name": name}
+                )
+
+    Open spans are tracked per thread, so one hook (e.g. registered
+    globally) can serve concurrent dumps.
+    """
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+
+    def span(self, kind: str, name: str) -> typing.ContextManager[typing.Any]:
+        raise NotImplementedError
+
+    def _open_spans(self) -> typing.List[typing.ContextManager[typing.Any]]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, kind: str, name: str) -> None:
+        span = self.span(kind, name)
+        span.__enter__()
+        self._open_spans().append(span)
+
+    def _exit(self) -> None:
+        self._open_spans().pop().__exit__(None, None, None)
+
+    def before_field(self, generator, obj, field) -> None:
+        self._enter("field", _field_label(obj, field))
+
+    def after_field(self, generator, obj, field, schema) -> None:
+        self._exit()
+
+    def before_definition(self, generator, name: str) -> None:
+        self._enter("definition", name)
+
+    def after_definition(self, generator, name: str, definition) -> None:
+        self._exit()
+
+
+class TopNReporter(SpanHook):
+    """Time every field and definition and report the slowest ones.
+
+        reporter = TopNReporter()
+        JSONSchema(hooks=[reporter]).dump(UserSchema())
+        print(reporter.format(10))
+
+    Times are inclusive: a `Nested` field's time includes generating the
+    nested definition the first time it is seen.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        #: (kind, name) -> [total seconds, calls]
+        self.timings: typing.Dict[typing.Tuple[str, str], typing.List[float]] = {}
+        self._timings_lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, kind: str, name: str) -> typing.Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._timings_lock:
+                entry = self.timings.setdefault((kind, name), [0.0, 0])
+                entry[0] += elapsed
+                entry[1] += 1
+
+    def top(
+        self, n: int = 10, kind: typing.Optional[str] = None
+    ) -> typing.List[typing.Tuple[str, str, float, int]]:
+        """The `n` slowest `(kind, name, seconds, calls)` entries,
+        optionally restricted to `"field"` or `"definition"`."""
+        rows = [
+            (entry_kind, name, seconds, int(calls))
+            for (entry_kind, name), (seconds, calls) in self.timings.items()
+            if kind is None or entry_kind == kind
+        ]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:n]
+
+    def format(self, n: int = 10, kind: typing.Optional[str] = None) -> str:
+        """`top()` as a fixed-width text table."""
+        lines = ["{:<10} {:>10} {:>6}  {}".format("kind", "ms", "calls", "name")]
+        for entry_kind, name, seconds, calls in self.top(n, kind):
+            lines.append(
+                "{:<10} {:>10.3f} {:>6}  {}".format(
+                    entry_kind, seconds * 1000, calls, name
+                )
+            )
+        return "\n".join(lines)
+
+    def reset(self) -> None:
+        self.timings.clear()
@@ -0,0 +1,210 @@
+import collections
+import itertools
+import json
+import os
+import time
+import typing
+
+from .frozen import thaw
+
+__all__ = ("NDJSONReport", "validate_ndjson")
+
+ErrorSink = typing.Callable[[typing.Dict[str, typing.Any]], None]
+
+# Validator compiled by `_init_worker`, once per worker process.
+_WORKER_VALIDATOR = None
+
+
+class NDJSONReport:
+    """Counters describing one `validate_ndjson` run."""
+
+    def __init__(self, max_samples: int) -> None:
+        self.lines = 0
+        self.bytes = 0
+        self.invalid_lines = 0
+        #: Individual errors; a line may have several.
+        self.errors = 0
+        self.seconds = 0.0
+        #: The first `max_samples` errors, as passed to the error sink.
+        self.sample_errors: typing.List[typing.Dict[str, typing.Any]] = []
+        self._max_samples = max_samples
+
+    @property
+    def lines_per_second(self) -> float:
+        return self.lines / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.seconds if self.seconds else 0.0
+
+    def record_chunk(self, result, error_sink) -> None:
+        lines, size, errors = result
+        self.lines += lines
+        self.bytes += size
+        self.errors += len(errors)
+        self.invalid_lines += len({error["line"] for error in errors})
+        for error in errors:
+            if len(self.sample_errors) < self._max_samples:
+                self.sample_errors.append(error)
+            if error_sink is not None:
+                error_sink(error)
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        """A JSON-serializable snapshot of the counters."""
+        return {
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "invalid_lines": self.invalid_lines,
+            "errors": self.errors,
+            "seconds": self.seconds,
+            "lines_per_second": self.lines_per_second,
+            "bytes_per_second": self.bytes_per_second,
+            "sample_errors": list(self.sample_errors),
+        }
+
+
+def _compile(document):
+    from jsonschema.validators import Draft7Validator, validator_for
+
+    validator_class = validator_for(document, default=Draft7Validator)
+    return validator_class(document)
+
+
+def _init_worker(document) -> None:
+    global _WORKER_VALIDATOR
+    _WORKER_VALIDATOR = _compile(document)
+
+
+def _json_pointer(path) -> str:
+    return "".join(
+        "/" + str(part).replace("~", "~0").replace("/", "~1") for part in path
+    )
+
+
+def _validate_lines(validator, chunk):
+    size = 0
+    errors = []
+    for number, line in chunk:
+        size += len(line)
+        if not line.strip():
+            continue
+        try:
+            instance = json.loads(line)
+        except ValueError as exc:
+            errors.append(
+                {"line": number, "path": "", "message": "Invalid JSON: %s" % exc}
+            )
+            continue
+        for error in validator.iter_errors(instance):
+            errors.append(
+                {
+                    "line": number,
+                    "path": _json_pointer(error.absolute_path),
+                    "message": error.message,
+                }
+            )
+    return len(chunk), size, errors
+
+
+def _validate_chunk(chunk):
+    return _validate_lines(_WORKER_VALIDATOR, chunk)
+
+
+def _read_lines(source):
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fp:
+            yield from enumerate(fp, 1)
+    else:
+        for number, line in enumerate(source, 1):
+            yield number, line if isinstance(line, bytes) else line.encode("utf-8")
+
+
+def _chunks(lines, chunk_size):
+    while True:
+        chunk = list(itertools.islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_ndjson(
+    source,
+    document,
+    workers: typing.Optional[int] = None,
+    chunk_size: int = 1000,
+    max_pending: typing.Optional[int] = None,
+    error_sink: typing.Optional[ErrorSink] = None,
+    max_samples: int = 100,
+) -> NDJSONReport:
+    """Validate every line of an NDJSON stream against a JSON Schema
+    document, in parallel across a process pool.
+
+        document = JSONSchema().dump(UserSchema())
+        report = validate_ndjson("users.ndjson", document, error_sink=log)
+        report.as_dict()
+
+    `source` is a path, or a file object / iterable yielding lines (text
+    or bytes). `document` is the output of `JSONSchema.dump`, frozen or
+    not, or a marshmallow schema (class or instance) to generate it from
+    with a default `JSONSchema`; it is compiled once per worker, with the
+    `jsonschema` validator its `$schema` names.
+
+    Lines are read `chunk_size` at a time and at most `max_pending`
+    chunks (default: twice the number of workers) are in flight, so
+    memory stays bounded however large the input is. `workers=0`
+    validates in the calling process. Blank lines are skipped.
+
+    Each error is passed, in line order, to `error_sink` as
+    `{"line": 3, "path": "/tags/0", "message": "..."}` (`path` is a JSON
+    pointer into the instance; lines that aren't JSON report an empty
+    path). The returned report counts lines, bytes, invalid lines and
+    errors, throughput, and keeps the first `max_samples` errors.
+    """
+    from marshmallow import Schema
+
+    if isinstance(document, type) and issubclass(document, Schema):
+        document = document()
+    if isinstance(document, Schema):
+        from .base import JSONSchema
+
+        document = JSONSchema().dump(document)
+    # Plain dicts pickle and validate faster than frozen views.
+    document = thaw(document)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    report = NDJSONReport(max_samples)
+    chunks = _chunks(_read_lines(source), chunk_size)
+    start = time.perf_counter()
+
+    if workers == 0:
+        validator = _compile(document)
+        for chunk in chunks:
+            report.record_chunk(_validate_lines(validator, chunk), error_sink)
+        report.seconds = time.perf_counter() - start
+        return report
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    if max_pending is None:
+        max_pending = 2 * workers
+    pending: typing.Deque = collections.deque()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(document,)
+    ) as executor:
+        try:
+            for chunk in chunks:
+                if len(pending) >= max_pending:
+                    report.record_chunk(pending.popleft().result(), error_sink)
+                pending.append(executor.submit(_validate_chunk, chunk))
+            while pending:
+                report.record_chunk(pending.popleft().result(), error_sink)
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+    report.seconds = time.perf_counter() - start
+    return report
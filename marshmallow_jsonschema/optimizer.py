@@ -0,0 +1,203 @@
+import json
+import typing
+
+from .exceptions import UnsupportedValueError
+
+__all__ = (
+    "DEFAULT_PASSES",
+    "collapse_nullable",
+    "dedupe_any_of",
+    "optimize",
+    "register_pass",
+    "single_enum_to_const",
+)
+
+Schema = typing.Dict[str, typing.Any]
+OptimizerPass = typing.Callable[[Schema], Schema]
+
+# Keywords whose value is a subschema, a list of subschemas or a mapping
+# of names to subschemas. Only these are descended into, so literal
+# values (`default`, `enum`, `const`, `examples`, ...) are never
+# mistaken for schemas.
+_SCHEMA_KEYWORDS = (
+    "additionalItems",
+    "additionalProperties",
+    "contains",
+    "else",
+    "if",
+    "not",
+    "propertyNames",
+    "then",
+)
+_SCHEMA_LIST_KEYWORDS = ("allOf", "anyOf", "oneOf")
+_SCHEMA_MAP_KEYWORDS = (
+    "definitions",
+    "dependencies",
+    "patternProperties",
+    "properties",
+)
+
+# Keywords that apply to instances of every type (or that make a schema
+# depend on something else). A subschema using any of them may reject
+# `null` on its own, so it cannot absorb a sibling `{"type": "null"}`.
+_TYPE_INDEPENDENT_KEYWORDS = frozenset(
+    ("$ref", "allOf", "anyOf", "const", "else", "enum", "if", "not", "oneOf", "then")
+)
+
+_NULL_SCHEMA = {"type": "null"}
+
+
+def collapse_nullable(schema: Schema) -> Schema:
+    """`{"anyOf": [X, {"type": "null"}]}` -> X with `"null"` added to its
+    `type`, when X declares a `type` and uses no keyword that could
+    reject `null` by itself (`enum`, `const`, `$ref`, combinators)."""
+    if set(schema) != {"anyOf"} or len(schema["anyOf"]) != 2:
+        return schema
+    first, second = schema["anyOf"]
+    if first == _NULL_SCHEMA:
+        first, second = second, first
+    if second != _NULL_SCHEMA or not isinstance(first, dict):
+        return schema
+    types = first.get("type")
+    if isinstance(types, str):
+        types = [types]
+    if not types or _TYPE_INDEPENDENT_KEYWORDS.intersection(first):
+        return schema
+    collapsed = dict(first)
+    collapsed["type"] = list(types) if "null" in types else list(types) + ["null"]
+    return collapsed
+
+
+def single_enum_to_const(schema: Schema) -> Schema:
+    """`{"enum": [value]}` -> `{"const": value}`, as emitted for
+    `validate.Equal`. Note that `const` needs a Draft-06+ validator."""
+    enum = schema.get("enum")
+    if not isinstance(enum, list) or len(enum) != 1 or "const" in schema:
+        return schema
+    rewritten = {key: value for key, value in schema.items() if key != "enum"}
+    rewritten["const"] = enum[0]
+    return rewritten
+
+
+def _json_key(value) -> str:
+    # JSON equality: unlike `==`, keeps `true` and `1` apart.
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def dedupe_any_of(schema: Schema) -> Schema:
+    """Drop repeated `anyOf` entries (e.g. a `Union` with the same
+    candidate twice). A single remaining entry replaces the `anyOf`
+    schema altogether when it has no other keywords."""
+    candidates = schema.get("anyOf")
+    if not isinstance(candidates, list) or len(candidates) < 2:
+        return schema
+    seen = set()
+    unique = []
+    for candidate in candidates:
+        key = _json_key(candidate)
+        if key not in seen:
+            seen.add(key)
+            unique.append(candidate)
+    if len(unique) == len(candidates):
+        return schema
+    if len(unique) == 1 and len(schema) == 1 and isinstance(unique[0], dict):
+        return unique[0]
+    rewritten = dict(schema)
+    rewritten["anyOf"] = unique
+    return rewritten
+
+
+# name -> pass, in the order they run. `dedupe_any_of` runs first so a
+# duplicated null branch does not keep `collapse_nullable` from firing.
+_PASSES: typing.Dict[str, OptimizerPass] = {
+    "dedupe_any_of": dedupe_any_of,
+    "single_enum_to_const": single_enum_to_const,
+    "collapse_nullable": collapse_nullable,
+}
+
+DEFAULT_PASSES: typing.Tuple[str, ...] = tuple(_PASSES)
+
+
+def register_pass(name: str, optimizer_pass: OptimizerPass) -> None:
+    """Make `optimizer_pass` available to `optimize(passes=[..., name])`.
+
+    A pass is called with each subschema (a dict, children already
+    optimized) and returns it unchanged or a replacement. It must not
+    mutate its argument, and the replacement must accept exactly the
+    same instances."""
+    _PASSES[name] = optimizer_pass
+
+
+def _resolve_passes(passes, exclude) -> typing.List[OptimizerPass]:
+    names = DEFAULT_PASSES if passes is None else tuple(passes)
+    resolved = []
+    for name in names:
+        if name in exclude:
+            continue
+        if name not in _PASSES:
+            raise UnsupportedValueError("Unknown optimizer pass %r" % (name,))
+        resolved.append(_PASSES[name])
+    return resolved
+
+
+def _optimize_schema(schema, passes) -> typing.Any:
+    if not isinstance(schema, dict):
+        # `true` / `false` schemas and anything unexpected.
+        return schema
+    optimized = dict(schema)
+    for keyword in _SCHEMA_KEYWORDS:
+        if keyword in optimized:
+            optimized[keyword] = _optimize_schema(optimized[keyword], passes)
+    for keyword in _SCHEMA_LIST_KEYWORDS:
+        if isinstance(optimized.get(keyword), list):
+            optimized[keyword] = [
+                _optimize_schema(s, passes) for s in optimized[keyword]
+            ]
+    for keyword in _SCHEMA_MAP_KEYWORDS:
+        if isinstance(optimized.get(keyword), dict):
+            optimized[keyword] = {
+                name: _optimize_schema(s, passes)
+                for name, s in optimized[keyword].items()
+            }
+    items = optimized.get("items")
+    if isinstance(items, list):
+        optimized["items"] = [_optimize_schema(s, passes) for s in items]
+    elif items is not None:
+        optimized["items"] = _optimize_schema(items, passes)
+    for optimizer_pass in passes:
+        optimized = optimizer_pass(optimized)
+    return optimized
+
+
+def optimize(
+    document: Schema,
+    passes: typing.Optional[typing.Iterable[str]] = None,
+    exclude: typing.Iterable[str] = (),
+    definitions_path: str = "definitions",
+) -> Schema:
+    """Return a copy of `document` rewritten so validators can check it
+    faster while accepting exactly the same instances. The input (which
+    may be frozen) is not modified.
+
+        document = optimize(JSONSchema().dump(UserSchema()))
+
+    `passes` names the passes to run, in order (default:
+    `DEFAULT_PASSES`); `exclude` switches individual passes off.
+    `definitions_path` is where `document` keeps its definitions, as
+    passed to `JSONSchema`.
+    """
+    from .base import _definitions_entry, _lookup_definitions
+
+    resolved = _resolve_passes(passes, frozenset(exclude))
+    optimized = _optimize_schema(document, resolved)
+    definitions = _lookup_definitions(document, definitions_path)
+    if definitions_path not in _SCHEMA_MAP_KEYWORDS and isinstance(definitions, dict):
+        key, value = _definitions_entry(
+            definitions_path,
+            {
+                name: _optimize_schema(definition, resolved)
+                for name, definition in definitions.items()
+            },
+        )
+        optimized[key] = value
+    return optimized
@@ -0,0 +1,140 @@
+import typing
+
+from .base import JSONSchema, _definitions_entry, _is_oneof_schema, _lookup_definitions
+from .dialects import _cache_key, _schema_ir
+from .exceptions import UnsupportedValueError
+from .frozen import freeze
+
+__all__ = ("partial_variant",)
+
+Document = typing.Dict[str, typing.Any]
+
+# Variants keyed by (`dialects._cache_key` of the full document,
+# partial, recursive).
+_VARIANT_CACHE: typing.Dict[typing.Tuple[typing.Any, ...], Document] = {}
+_CACHE_MAX = 256
+
+_SHAPE_SUFFIX = ".shape"
+
+
+def partial_variant(
+    schema,
+    partial: typing.Union[bool, typing.Sequence[str]] = True,
+    recursive: bool = False,
+    generator: typing.Optional[JSONSchema] = None,
+) -> Document:
+    """The document `generator.dump(schema)` would produce with
+    `schema.partial = partial`, e.g. for a PATCH endpoint, derived from
+    the cached full document (see `dialects.schema_ir`):
+
+        patch = partial_variant(UserSchema(), partial=True)
+
+    Only `required` lists are rewritten, so the cost is one pass over
+    the definitions however many fields they hold, and the variant
+    shares every other part of the full document. As with `dump`,
+    `partial` applies to the root schema's fields (attribute names, not
+    `data_key`s); `recursive=True` (with `partial=True`) makes every
+    nested definition optional too, as `load(partial=True)` does.
+
+    Inherited `<Base>.shape` definitions (`inheritance=True`) are
+    shared with other definitions, so the root gets `<Base>.shape.partial`
+    copies instead. The result is cached and shared, so it is frozen.
+    """
+    if isinstance(schema, type):
+        schema = schema()
+    if _is_oneof_schema(schema):
+        raise UnsupportedValueError(
+            "partial_variant does not support OneOfSchema roots; dump "
+            "`%s(partial=...)` instead" % (schema.__class__.__name__,)
+        )
+    if partial is not True:
+        if recursive:
+            raise UnsupportedValueError("`recursive` requires `partial=True`")
+        partial = tuple(partial or ())
+    if generator is None:
+        generator = JSONSchema()
+    key = _cache_key(schema, generator)
+    document = _schema_ir(schema, generator, key)
+    if key is None:
+        return _variant(document, schema, partial, recursive, generator)
+    variant = _VARIANT_CACHE.get((key, partial, recursive))
+    if variant is None:
+        variant = _variant(document, schema, partial, recursive, generator)
+        if len(_VARIANT_CACHE) >= _CACHE_MAX:
+            _VARIANT_CACHE.clear()
+        _VARIANT_CACHE[(key, partial, recursive)] = variant
+    return variant
+
+
+def _variant(document, schema, partial, recursive, generator) -> Document:
+    definitions = _lookup_definitions(document, generator.definitions_path)
+    changed: typing.Dict[str, typing.Any] = {}
+    if recursive:
+        for name, definition in definitions.items():
+            if "required" in definition:
+                changed[name] = {
+                    key: value for key, value in definition.items() if key != "required"
+                }
+    else:
+        if partial is True:
+            optional = None
+        else:
+            optional = set()
+            for name in partial:
+                field = schema.fields.get(name)
+                if field is not None:
+                    optional.add(field.data_key or field.name)
+        root = schema.__class__.__name__
+        if root in definitions:
+            prefix = "#/{}/".format(generator.definitions_path)
+            _make_optional(definitions, root, root, optional, prefix, changed)
+    if not changed:
+        return document
+    variant_definitions = dict(definitions)
+    variant_definitions.update(changed)
+    key, value = _definitions_entry(generator.definitions_path, variant_definitions)
+    result = dict(document)
+    result[key] = value
+    return freeze(result)
+
+
+def _make_optional(definitions, name, new_name, optional, prefix, changed) -> bool:
+    """Store a copy of definition `name` under `new_name` in `changed`
+    with the `optional` keys (all, if `None`) dropped from `required`,
+    following its `allOf` into inherited shapes. False if nothing
+    changed."""
+    definition = definitions[name]
+    result = dict(definition)
+    modified = False
+
+    required = definition.get("required")
+    if required:
+        kept = [] if optional is None else [k for k in required if k not in optional]
+        if len(kept) != len(required):
+            modified = True
+            if kept:
+                result["required"] = kept
+            else:
+                del result["required"]
+
+    all_of = definition.get("allOf")
+    if isinstance(all_of, list):
+        entries = []
+        for entry in all_of:
+            ref = entry.get("$ref") if isinstance(entry, dict) else None
+            shape = ref[len(prefix) :] if isinstance(ref, str) else ""
+            if (
+                ref == prefix + shape
+                and shape.endswith(_SHAPE_SUFFIX)
+                and shape in definitions
+            ):
+                copy = shape + ".partial"
+                if _make_optional(definitions, shape, copy, optional, prefix, changed):
+                    entry = {"$ref": prefix + copy}
+                    modified = True
+            entries.append(entry)
+        result["allOf"] = entries
+
+    if modified:
+        changed[new_name] = result
+    return modified
@@ -0,0 +1,284 @@
+import re
+import typing
+
+from marshmallow import (
+    RAISE,
+    Schema,
+    ValidationError,
+    fields,
+    missing,
+    post_dump,
+    validate,
+)
+
+from .base import (
+    FIELD_VALIDATORS,
+    JSONSchema,
+    _is_oneof_schema,
+    _is_union_field,
+)
+from .frozen import thaw
+
+__all__ = ("PreloadJSONSchema", "PreloadValidator")
+
+# Fields whose `_deserialize` accepts exactly the JSON type they declare.
+_STRING_FIELDS = (fields.String, fields.Email, fields.Url)
+
+# JSON type -> the validators that translate to a keyword with exactly
+# marshmallow's semantics on values of that type.
+_SUPPORTED_VALIDATORS = {
+    "string": (validate.Length, validate.OneOf, validate.Equal, validate.Regexp),
+    "integer": (validate.Range, validate.OneOf, validate.Equal),
+    "array": (validate.Length,),
+}
+
+# Fields that coerce their input: only the JSON types they can possibly
+# deserialize from are checked.
+_NUMBER_FIELDS = (fields.Integer, fields.Float, fields.Decimal)
+_NUMBER_TYPES = ["number", "string"]
+_BOOLEAN_TYPES = ["boolean", "number", "string"]
+
+_MISSING_MESSAGE = "Missing data for required field."
+_UNKNOWN_MESSAGE = "Unknown field."
+
+
+def _has_pre_load(schema) -> bool:
+    return bool(schema._hooks.get("pre_load"))
+
+
+def _allow_null(types, field):
+    if isinstance(types, str):
+        types = [types]
+    return {"type": types + ["null"] if field.allow_none else list(types)}
+
+
+class PreloadJSONSchema(JSONSchema):
+    """A generator for the structural checks `PreloadValidator` runs
+    before `Schema.load`. Its output accepts every payload `load` would
+    accept, and is only as strict as that allows:
+
+    - properties are keyed by `data_key`, `dump_only` fields are left out
+    - coercing fields only constrain the JSON type (a non-strict
+      `Integer` takes `"1"`), dates, times and custom fields accept
+      anything
+    - validators are only applied where the JSON Schema keyword means
+      the same thing (`Length`, `OneOf`, `Equal` and `Regexp` on
+      strings, `Range` on strict integers, `Length` on containers)
+    - `additionalProperties` follows the schema's effective `unknown`
+    - metadata, titles and defaults are not emitted
+    """
+
+    def get_properties(self, obj) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+        properties = self.dict_class()
+        for field in obj.load_fields.values():
+            properties[field.data_key or field.name] = self._get_schema_for_field(
+                obj, field
+            )
+        return properties
+
+    def get_required(self, obj) -> typing.Union[typing.List[str], typing.Any]:
+        required = [
+            field.data_key or field.name
+            for field in obj.load_fields.values()
+            if field.required
+        ]
+        return required or missing
+
+    def _build_field_schema(self, obj, field):
+        if type(field) is fields.UUID:
+            # Validators see the `uuid.UUID`, not the string.
+            return _allow_null("string", field)
+        if type(field) in _STRING_FIELDS:
+            return self._apply_validators({"type": "string"}, field, obj)
+        if type(field) is fields.Integer and field.strict:
+            return self._apply_validators({"type": "integer"}, field, obj)
+        if type(field) in _NUMBER_FIELDS:
+            return _allow_null(_NUMBER_TYPES, field)
+        if type(field) is fields.Boolean:
+            return _allow_null(_BOOLEAN_TYPES, field)
+        if type(field) is fields.List:
+            schema = {
+                "type": "array",
+                "items": self._get_schema_for_field(obj, field.inner),
+            }
+            return self._apply_validators(schema, field, obj)
+        if hasattr(fields, "Tuple") and type(field) is fields.Tuple:
+            schema = _allow_null("array", field)
+            schema["items"] = [
+                self._get_schema_for_field(obj, sub) for sub in field.tuple_fields
+            ]
+            schema["minItems"] = schema["maxItems"] = len(field.tuple_fields)
+            return schema
+        if type(field) in (fields.Dict, fields.Mapping):
+            schema = _allow_null("object", field)
+            if field.value_field is not None:
+                schema["additionalProperties"] = self._get_schema_for_field(
+                    obj, field.value_field
+                )
+            return schema
+        if type(field) is fields.Nested and self._checks_nested(field):
+            return self._from_nested_schema(obj, field)
+        if _is_union_field(field):
+            candidates = [
+                self._get_schema_for_field(obj, sub) for sub in field._candidate_fields
+            ]
+            if field.allow_none:
+                candidates.append({"type": "null"})
+            return {"anyOf": candidates}
+        return {}
+
+    def _checks_nested(self, field) -> bool:
+        """Whether a `Nested` field's definition describes what its
+        `load` accepts. Anything that changes the payload or the nested
+        field set per field (`pre_load`, `only`/`exclude`, `unknown`
+        differing from the nested schema's own) isn't checked."""
+        if isinstance(field.nested, dict) or field.only or field.exclude:
+            return False
+        nested = field.schema
+        if _is_oneof_schema(nested) or _has_pre_load(nested):
+            return False
+        unknown = field.unknown
+        return unknown is None or (unknown == RAISE) == (nested.unknown == RAISE)
+
+    def _from_nested_schema(self, obj, field):
+        schema = super()._from_nested_schema(obj, field)
+        # Drop the metadata and default the base generator copies next to
+        # the `$ref`: they aren't checked by `load`.
+        ref = schema["items"] if field.many else schema
+        if field.allow_none:
+            ref = ref["anyOf"][0]
+        for key in list(ref):
+            if key not in ("type", "$ref"):
+                del ref[key]
+        if field.many and field.allow_none:
+            # `allow_none` admits a `null` list, not just `null` items.
+            schema["type"] = ["array", "null"]
+        return schema
+
+    def _apply_validators(self, schema, field, obj):
+        supported = _SUPPORTED_VALIDATORS[schema["type"]]
+        for validator in field.validators:
+            # Exact classes only: a subclass may change `__call__`.
+            if type(validator) not in supported:
+                continue
+            if isinstance(validator, validate.Regexp) and (
+                not isinstance(validator.regex.pattern, str)
+                or validator.regex.flags & ~re.UNICODE
+            ):
+                # `pattern` can't carry flags.
+                continue
+            schema = FIELD_VALIDATORS[type(validator)](schema, field, validator, obj)
+        # `OneOf` adds labels; they don't affect validation.
+        schema.pop("enumNames", None)
+        if not field.allow_none:
+            return schema
+        if "enum" in schema:
+            # Validators aren't run on `None`, but `enum` applies to it.
+            return {"anyOf": [schema, {"type": "null"}]}
+        schema["type"] = [schema["type"], "null"]
+        return schema
+
+    def _dump_nested_definition(self, nested_instance, nested_cls):
+        definition, definitions = super()._dump_nested_definition(
+            nested_instance, nested_cls
+        )
+        definition["additionalProperties"] = nested_instance.unknown != RAISE
+        for key in ("title", "description"):
+            definition.pop(key, None)
+        return definition, definitions
+
+    @post_dump
+    def wrap(self, data, **kwargs) -> typing.Dict[str, typing.Any]:
+        document = super().wrap(data, **kwargs)
+        if not self.nested:
+            data["additionalProperties"] = self.obj.unknown != RAISE
+            for key in ("title", "description"):
+                data.pop(key, None)
+        return document
+
+
+def _compile(document):
+    from jsonschema.validators import Draft7Validator
+
+    return Draft7Validator(document)
+
+
+def _set_message(messages, path, key, message) -> None:
+    node = messages
+    for part in path:
+        node = node.setdefault(part, {})
+    field_messages = node.setdefault(key, [])
+    # One `required` error is reported per missing key, each listing
+    # all of them.
+    if message not in field_messages:
+        field_messages.append(message)
+
+
+class PreloadValidator:
+    """Reject structurally invalid payloads with a compiled JSON Schema
+    before handing the rest to `Schema.load`.
+
+        loader = PreloadValidator(UserSchema())
+        user = loader.load(payload)  # ValidationError like `load`'s
+
+    The check is generated by `PreloadJSONSchema` and compiled once. It
+    never rejects a payload `load` would accept, so `load` still has the
+    final say on everything it lets through; its job is to turn away
+    bulk garbage (wrong types, missing required keys, unknown keys,
+    out-of-range strings) without paying for deserialization. Payloads
+    are expected as decoded from JSON.
+
+    The check is skipped - `load` runs directly - when the schema has a
+    `pre_load` hook or `partial` set, is a `OneOfSchema`, or when `load`
+    is called with `partial`, `unknown` or `many` overrides.
+    """
+
+    def __init__(self, schema) -> None:
+        if isinstance(schema, type):
+            schema = schema()
+        self.schema = schema
+        self.document: typing.Optional[typing.Dict[str, typing.Any]] = None
+        self._validator = None
+        if not (_has_pre_load(schema) or schema.partial or _is_oneof_schema(schema)):
+            self.document = thaw(PreloadJSONSchema().dump(schema))
+            self._validator = _compile(self.document)
+
+    def errors(self, data) -> typing.Dict[typing.Any, typing.Any]:
+        """Structural errors for `data`, shaped like `ValidationError.messages`
+        (`{}` when the check passes or is disabled)."""
+        messages: typing.Dict[typing.Any, typing.Any] = {}
+        if self._validator is None:
+            return messages
+        for error in self._validator.iter_errors(data):
+            path = list(error.absolute_path)
+            instance = error.instance
+            if error.validator == "required":
+                for key in error.validator_value:
+                    if key not in instance:
+                        _set_message(messages, path, key, _MISSING_MESSAGE)
+            elif error.validator == "additionalProperties" and isinstance(
+                instance, dict
+            ):
+                known = error.schema.get("properties", {})
+                for key in instance:
+                    if key not in known:
+                        _set_message(messages, path, key, _UNKNOWN_MESSAGE)
+            elif path:
+                _set_message(messages, path[:-1], path[-1], error.message)
+            else:
+                _set_message(messages, path, "_schema", error.message)
+        return messages
+
+    def validate(self, data) -> None:
+        """Raise `ValidationError` if `data` fails the structural check."""
+        messages = self.errors(data)
+        if messages:
+            raise ValidationError(messages, data=data)
+
+    def load(self, data, **kwargs):
+        """`self.schema.load(data, **kwargs)`, after the structural check."""
+        if not any(
+            kwargs.get(option) is not None for option in ("partial", "unknown", "many")
+        ):
+            self.validate(data)
+        return self.schema.load(data, **kwargs)
@@ -0,0 +1,82 @@
+import gc
+import threading
+import typing
+
+from .base import JSONSchema
+from .frozen import freeze
+
+__all__ = ("register", "unregister", "prewarm", "get_document", "registered")
+
+# name -> (schema class or instance, generator factory)
+_REGISTRY: typing.Dict[
+    str, typing.Tuple[typing.Any, typing.Callable[[], JSONSchema]]
+] = {}
+# name -> generated document
+_DOCUMENTS: typing.Dict[str, typing.Dict[str, typing.Any]] = {}
+_LOCK = threading.Lock()
+
+
+def register(
+    name: str,
+    schema: typing.Any,
+    generator_factory: typing.Callable[[], JSONSchema] = JSONSchema,
+) -> None:
+    """Register `schema` (a class or instance) under `name`, to be
+    generated by `prewarm()` or on first `get_document(name)`.
+    Re-registering a name discards its generated document."""
+    with _LOCK:
+        _REGISTRY[name] = (schema, generator_factory)
+        _DOCUMENTS.pop(name, None)
+
+
+def unregister(name: str) -> None:
+    with _LOCK:
+        _REGISTRY.pop(name, None)
+        _DOCUMENTS.pop(name, None)
+
+
+def registered() -> typing.Tuple[str, ...]:
+    return tuple(_REGISTRY)
+
+
+def _generate(name: str) -> typing.Dict[str, typing.Any]:
+    schema, generator_factory = _REGISTRY[name]
+    if isinstance(schema, type):
+        schema = schema()
+    return generator_factory().dump(schema)
+
+
+def get_document(name: str) -> typing.Dict[str, typing.Any]:
+    """The document registered under `name`, generated now if
+    `prewarm()` has not done so. The document is shared between callers
+    and so frozen (see `marshmallow_jsonschema.frozen`); `thaw()` it
+    for a mutable copy."""
+    document = _DOCUMENTS.get(name)
+    if document is not None:
+        return document
+    with _LOCK:
+        document = _DOCUMENTS.get(name)
+        if document is None:
+            document = freeze(_generate(name))
+            _DOCUMENTS[name] = document
+    return document
+
+
+def prewarm(freeze_gc: bool = True) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """Generate every registered document that has not been generated
+    yet, and return all of them by name.
+
+    Call this in the master process of a preforking server, before the
+    workers are forked, so the workers inherit the documents instead of
+    each generating its own copy. With `freeze_gc` (the default) the
+    garbage left over from generation is collected and every surviving
+    object is moved to the permanent generation with `gc.freeze()`, so
+    the workers' garbage collector never writes to (and so never
+    copies) the pages holding the shared documents.
+    """
+    for name in registered():
+        get_document(name)
+    if freeze_gc:
+        gc.collect()
+        gc.freeze()
+    return dict(_DOCUMENTS)
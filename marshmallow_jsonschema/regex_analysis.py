@@ -0,0 +1,365 @@
+import functools
+import re
+import typing
+
+try:
+    import re._constants as _sre  # type: ignore[import-not-found]
+    import re._parser as _sre_parse  # type: ignore[import-not-found]
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+__all__ = ("AMBIGUOUS_ALTERNATION", "NESTED_QUANTIFIER", "analyze_pattern")
+
+#: A quantified group whose body contains another variable-length
+#: quantifier that can consume the same characters, e.g. `(a+)+` or
+#: `(\w+\s?)*`: a failing match tries exponentially many ways to split
+#: the input between the two quantifiers.
+NESTED_QUANTIFIER = "nested quantifier"
+#: A quantified alternation whose branches can match the same text,
+#: e.g. `(a|aa)*` or `(\w|\d)+`.
+AMBIGUOUS_ALTERNATION = "ambiguous alternation"
+
+_REPEATS = (_sre.MAX_REPEAT, _sre.MIN_REPEAT)
+_ZERO_WIDTH = (_sre.AT, _sre.ASSERT, _sre.ASSERT_NOT)
+
+# Characters used to decide whether two character sets can match the same
+# character: Latin-1 plus a non-ASCII digit, space and letter, so `\d`,
+# `\s` and `\w` each keep a distinct Unicode-only member.
+_UNIVERSE = tuple(chr(c) for c in range(256)) + ("٣", " ", "中")
+_ALL = frozenset(_UNIVERSE)
+
+_CATEGORY_PATTERNS = {
+    _sre.CATEGORY_DIGIT: r"\d",
+    _sre.CATEGORY_NOT_DIGIT: r"\D",
+    _sre.CATEGORY_SPACE: r"\s",
+    _sre.CATEGORY_NOT_SPACE: r"\S",
+    _sre.CATEGORY_WORD: r"\w",
+    _sre.CATEGORY_NOT_WORD: r"\W",
+}
+_CATEGORY_CHARS = {
+    category: frozenset(c for c in _UNIVERSE if re.match(pattern, c))
+    for category, pattern in _CATEGORY_PATTERNS.items()
+}
+
+
+def _literal(code: int, ignorecase: bool) -> typing.FrozenSet[str]:
+    char = chr(code)
+    return frozenset((char, char.lower(), char.upper()) if ignorecase else (char,))
+
+
+def _set_chars(items, ignorecase: bool) -> typing.FrozenSet[str]:
+    """Characters matched by an `IN` (character class) node."""
+    chars: typing.Set[str] = set()
+    negate = False
+    for op, av in items:
+        if op is _sre.NEGATE:
+            negate = True
+        elif op is _sre.LITERAL:
+            chars |= _literal(av, ignorecase)
+        elif op is _sre.RANGE:
+            low, high = av
+            chars |= {c for c in _UNIVERSE if low <= ord(c) <= high}
+            if ignorecase:
+                chars |= {c.swapcase() for c in chars}
+        elif op is _sre.CATEGORY:
+            chars |= _CATEGORY_CHARS.get(av, _ALL)
+        else:
+            return _ALL
+    return _ALL - chars if negate else frozenset(chars)
+
+
+def _item_chars(op, av, ignorecase: bool) -> typing.FrozenSet[str]:
+    """Every character the node can consume, anywhere in its match."""
+    if op is _sre.LITERAL:
+        return _literal(av, ignorecase)
+    if op is _sre.NOT_LITERAL:
+        return _ALL - {chr(av)}
+    if op is _sre.IN:
+        return _set_chars(av, ignorecase)
+    if op in _ZERO_WIDTH:
+        return frozenset()
+    if op in _REPEATS:
+        return _chars(av[2], ignorecase)
+    if op is _sre.SUBPATTERN:
+        return _chars(av[-1], ignorecase)
+    if op is _sre.BRANCH:
+        return frozenset().union(*(_chars(alt, ignorecase) for alt in av[1]))
+    return _ALL
+
+
+def _chars(items, ignorecase: bool) -> typing.FrozenSet[str]:
+    return frozenset().union(*(_item_chars(op, av, ignorecase) for op, av in items))
+
+
+def _nullable(op, av) -> bool:
+    """Whether the node can match the empty string."""
+    if op in _ZERO_WIDTH:
+        return True
+    if op in _REPEATS:
+        return av[0] == 0 or all(_nullable(*item) for item in av[2])
+    if op is _sre.SUBPATTERN:
+        return all(_nullable(*item) for item in av[-1])
+    if op is _sre.BRANCH:
+        return any(all(_nullable(*item) for item in alt) for alt in av[1])
+    return op in (_sre.GROUPREF, _sre.GROUPREF_EXISTS)
+
+
+def _flatten(items) -> list:
+    """`items` with plain groups expanded in place."""
+    flat = []
+    for op, av in items:
+        if op is _sre.SUBPATTERN:
+            flat.extend(_flatten(av[-1]))
+        else:
+            flat.append((op, av))
+    return flat
+
+
+def _ambiguous_iteration(body, ignorecase: bool) -> bool:
+    """Whether repeating `body` lets one input be split between
+    iterations in many ways: the body contains a variable-length
+    quantifier whose characters overlap every mandatory part of it."""
+    items = _flatten(body)
+    if len(items) == 1 and items[0][0] is _sre.BRANCH:
+        return any(_ambiguous_iteration(alt, ignorecase) for alt in items[0][1][1])
+    mandatory = [
+        _item_chars(op, av, ignorecase) for op, av in items if not _nullable(op, av)
+    ]
+    for op, av in items:
+        if op in _REPEATS and av[0] != av[1]:
+            chars = _item_chars(op, av, ignorecase)
+            if all(chars & other for other in mandatory):
+                return True
+    return False
+
+
+def _find_nested_quantifiers(items, ignorecase: bool) -> bool:
+    for op, av in items:
+        if op in _REPEATS:
+            if av[1] > 1 and _ambiguous_iteration(av[2], ignorecase):
+                return True
+            if _find_nested_quantifiers(av[2], ignorecase):
+                return True
+        elif op is _sre.SUBPATTERN:
+            if _find_nested_quantifiers(av[-1], ignorecase):
+                return True
+        elif op is _sre.BRANCH:
+            if any(_find_nested_quantifiers(alt, ignorecase) for alt in av[1]):
+                return True
+        elif op in (_sre.ASSERT, _sre.ASSERT_NOT):
+            if _find_nested_quantifiers(av[1], ignorecase):
+                return True
+        # Atomic groups and possessive quantifiers never backtrack into
+        # their body, so they are deliberately not descended into.
+    return False
+
+
+# --- alternation -----------------------------------------------------------
+#
+# `re`'s parser rewrites alternations (`\w|\d` becomes the class
+# `[\w\d]`, `a|ab` becomes `a(?:|b)`), but browsers and other validators
+# run the pattern as written. Alternations are therefore located in the
+# pattern source, and each branch is parsed on its own.
+
+
+class _Group:
+    def __init__(self, parent: typing.Optional["_Group"], start: int) -> None:
+        self.parent = parent
+        self.start = start
+        self.splits: typing.List[int] = []
+        self.end = start
+        # Index just past the group's closing paren and quantifier.
+        self.after = start
+        self.repeated = False
+
+    def is_repeated(self) -> bool:
+        group: typing.Optional[_Group] = self
+        while group is not None:
+            if group.repeated:
+                return True
+            group = group.parent
+        return False
+
+
+_QUANTIFIER = re.compile(r"(?:[*+?]|\{(\d*)(,?)(\d*)\})[?+]?")
+
+
+def _quantifier(pattern: str, index: int) -> typing.Tuple[bool, int]:
+    """Whether the quantifier at `pattern[index]` (if any) allows more
+    than one repetition, and the index just past it."""
+    match = _QUANTIFIER.match(pattern, index)
+    if match is None:
+        return False, index
+    if pattern[index] in "*+":
+        return True, match.end()
+    if pattern[index] == "?":
+        return False, match.end()
+    low, comma, high = match.groups()
+    if not comma:
+        return bool(low) and int(low) > 1, match.end()
+    return not high or int(high) > 1, match.end()
+
+
+def _groups(pattern: str) -> typing.List[_Group]:
+    root = _Group(None, 0)
+    groups = [root]
+    current = root
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "[":
+            index += 1
+            if index < len(pattern) and pattern[index] == "^":
+                index += 1
+            if index < len(pattern) and pattern[index] == "]":
+                index += 1
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+        elif char == "(":
+            start = index + 1
+            if pattern.startswith("?#", start):
+                index = pattern.find(")", start)
+                if index < 0:
+                    break
+            else:
+                match = re.match(
+                    r"\?(?:P<\w+>|<\w+>|[:=!>]|<[=!]|[a-zA-Z-]*:?)", pattern[start:]
+                )
+                if match is not None:
+                    start += match.end()
+                current = _Group(current, start)
+                groups.append(current)
+        elif char == "|":
+            current.splits.append(index)
+        elif char == ")" and current.parent is not None:
+            current.end = index
+            current.repeated, current.after = _quantifier(pattern, index + 1)
+            current = current.parent
+        index += 1
+    root.end = len(pattern)
+    return groups
+
+
+def _positions(items, ignorecase: bool):
+    """The character sets of the fixed-length start of a branch, and
+    whether that is the whole branch. An incomplete branch ends with
+    the characters its first variable-length part can start with."""
+    positions = []
+    for op, av in _flatten(items):
+        if op in _ZERO_WIDTH:
+            continue
+        if op in (_sre.LITERAL, _sre.NOT_LITERAL, _sre.IN, _sre.ANY):
+            positions.append(_item_chars(op, av, ignorecase))
+        elif op in _REPEATS and av[0] == av[1] and len(av[2]) == 1:
+            positions.extend([_item_chars(op, av, ignorecase)] * av[0])
+        else:
+            positions.append(
+                _ALL if _nullable(op, av) else _item_chars(op, av, ignorecase)
+            )
+            return positions, False
+    return positions, True
+
+
+def _branches_overlap(first, second, follow) -> bool:
+    """Whether two branches can match the same text, given the
+    characters `follow` that can come after the group."""
+    (first_positions, first_complete), (second_positions, second_complete) = (
+        first,
+        second,
+    )
+    if (first_complete and not first_positions) or (
+        second_complete and not second_positions
+    ):
+        # An empty branch only makes the group optional.
+        return False
+    if not all(a & b for a, b in zip(first_positions, second_positions)):
+        return False
+    # A complete branch that is a strict prefix of the other only
+    # overlaps it if what follows the group can match the rest.
+    if first_complete and len(first_positions) < len(second_positions):
+        return bool(second_positions[len(first_positions)] & follow)
+    if second_complete and len(second_positions) < len(first_positions):
+        return bool(first_positions[len(second_positions)] & follow)
+    return True
+
+
+def _first_chars(pattern: str, start: int, end: int, flags: int, ignorecase: bool):
+    """Characters `pattern[start:end]` can start with; an empty set if
+    it matches nothing but the empty string, None if unknown."""
+    try:
+        parsed = _sre_parse.parse(pattern[start:end], flags)
+    except (re.error, OverflowError):
+        return None
+    positions, _ = _positions(list(parsed), ignorecase)
+    return positions[0] if positions else frozenset()
+
+
+def _follow(pattern: str, group: _Group, flags: int, ignorecase: bool):
+    """Characters that can come right after a match of `group`: its own
+    start if it repeats, then whatever follows it in the pattern. The
+    end of the pattern contributes nothing, since the match is over."""
+    follow: typing.FrozenSet[str] = frozenset()
+    if group.repeated:
+        first = _first_chars(pattern, group.start, group.end, flags, ignorecase)
+        follow |= _ALL if first is None else first
+    parent = group.parent
+    if parent is None:
+        return follow
+    stop = min([split for split in parent.splits if split > group.after] + [parent.end])
+    after = _first_chars(pattern, group.after, stop, flags, ignorecase)
+    if after is None:
+        return _ALL
+    if after:
+        return follow | after
+    return follow | _follow(pattern, parent, flags, ignorecase)
+
+
+def _find_ambiguous_alternation(pattern: str, flags: int) -> bool:
+    for group in _groups(pattern):
+        if not group.splits or not group.is_repeated():
+            continue
+        bounds = [group.start] + [s + 1 for s in group.splits]
+        ends = group.splits + [group.end]
+        try:
+            branches = [
+                _sre_parse.parse(pattern[start:end], flags)
+                for start, end in zip(bounds, ends)
+            ]
+        except (re.error, OverflowError):
+            # e.g. a branch referring to a group outside it.
+            continue
+        ignorecase = bool(flags & re.IGNORECASE)
+        shapes = [_positions(list(branch), ignorecase) for branch in branches]
+        follow = _follow(pattern, group, flags, ignorecase)
+        for i, first in enumerate(shapes):
+            if any(
+                _branches_overlap(first, second, follow) for second in shapes[i + 1 :]
+            ):
+                return True
+    return False
+
+
+@functools.lru_cache(maxsize=1024)
+def analyze_pattern(pattern: str, flags: int = 0) -> typing.Tuple[str, ...]:
+    """Known catastrophic-backtracking (ReDoS) shapes in `pattern`:
+    a tuple holding `NESTED_QUANTIFIER` and/or `AMBIGUOUS_ALTERNATION`,
+    empty if none were found. Results are cached per pattern.
+
+    This is a conservative, syntactic check: it can miss exotic cases
+    and flag some patterns that are safe in practice.
+    """
+    try:
+        parsed = _sre_parse.parse(pattern, flags)
+    except (re.error, OverflowError):
+        return ()
+    ignorecase = bool(parsed.state.flags & re.IGNORECASE)
+    findings = []
+    if _find_nested_quantifiers(list(parsed), ignorecase):
+        findings.append(NESTED_QUANTIFIER)
+    if _find_ambiguous_alternation(pattern, parsed.state.flags):
+        findings.append(AMBIGUOUS_ALTERNATION)
+    return tuple(findings)
@@ -0,0 +1,229 @@
+import gzip
+import hashlib
+import json
+import threading
+import typing
+
+from .base import JSONSchema, _lookup_definitions
+from .canonical import canonical_dumps, definition_hashes
+
+__all__ = ("SchemaApp",)
+
+_STATUS_TEXT = {
+    200: "200 OK",
+    304: "304 Not Modified",
+    404: "404 Not Found",
+    405: "405 Method Not Allowed",
+}
+
+
+# Resource key of a document's definition hash index; no definition
+# name contains `/`.
+_INDEX = "/"
+
+
+class _Resource:
+    """One served JSON document: its body, strong ETag and a gzip
+    variant that is compressed on first request and then reused.
+    `digest` is the content hash the ETag is made of (by default the
+    hash of the body)."""
+
+    def __init__(self, document, digest: typing.Optional[str] = None) -> None:
+        self.body = canonical_dumps(document)
+        if digest is None:
+            digest = hashlib.sha256(self.body).hexdigest()
+        self.etag = '"{}"'.format(digest)
+        self.gzip_etag = '"{}-gzip"'.format(digest)
+        self._gzip_body: typing.Optional[bytes] = None
+
+    @property
+    def gzip_body(self) -> bytes:
+        if self._gzip_body is None:
+            # `mtime=0` keeps the compressed bytes stable across processes.
+            self._gzip_body = gzip.compress(self.body, mtime=0)
+        return self._gzip_body
+
+
+class SchemaApp:
+    """Serve generated JSON Schema documents over HTTP, as a WSGI app
+    (call the instance) or an ASGI app (`app.asgi`).
+
+        app = SchemaApp({"user": UserSchema, "order": OrderSchema})
+
+    Routes:
+
+    - `GET /<name>` - the document for `schemas[name]`
+    - `GET /<name>/definitions` - the content hash of each of its
+      definitions, `{"<definition>": "<sha256 hex>", ...}`
+    - `GET /<name>/definitions/<definition>` - a single definition
+      from that document, whose `ETag` is its content hash (see
+      `marshmallow_jsonschema.canonical.definition_hash`)
+
+    Each document is generated once, on first request (or up front via
+    `prewarm()`), by a generator from `generator_factory` - pass e.g.
+    `lambda: JSONSchema(enum_definitions=True)` to configure it. Bodies
+    carry a content-hash `ETag`, `If-None-Match` is answered with `304
+    Not Modified`, and clients sending `Accept-Encoding: gzip` get a
+    gzip body that is compressed once and reused. `HEAD` is supported.
+
+    A definition's hash only changes with its own body, so after a
+    deploy clients can compare the index against what they hold and
+    fetch just the definitions that changed.
+    """
+
+    def __init__(
+        self,
+        schemas: typing.Mapping[str, typing.Any],
+        generator_factory: typing.Callable[[], JSONSchema] = JSONSchema,
+        cache_control: typing.Optional[str] = "no-cache",
+    ) -> None:
+        self.schemas = dict(schemas)
+        self.generator_factory = generator_factory
+        self.cache_control = cache_control
+        self._resources: typing.Dict[str, typing.Dict[str, _Resource]] = {}
+        self._lock = threading.Lock()
+
+    def prewarm(self) -> None:
+        """Generate and encode every document now rather than on first
+        request."""
+        for name in self.schemas:
+            self._document_resources(name)
+
+    def _document_resources(self, name: str) -> typing.Dict[str, _Resource]:
+        """Resources for document `name`, keyed by `""` for the whole
+        document, `_INDEX` for its hash index and by definition name for
+        each definition."""
+        resources = self._resources.get(name)
+        if resources is not None:
+            return resources
+        with self._lock:
+            resources = self._resources.get(name)
+            if resources is None:
+                resources = self._render(name)
+                self._resources[name] = resources
+        return resources
+
+    def _render(self, name: str) -> typing.Dict[str, _Resource]:
+        schema = self.schemas[name]
+        if isinstance(schema, type):
+            schema = schema()
+        generator = self.generator_factory()
+        document = generator.dump(schema)
+        definitions = _lookup_definitions(document, generator.definitions_path)
+        hashes = generator.definition_hashes or definition_hashes(
+            document, generator.definitions_path
+        )
+        resources = {"": _Resource(document), _INDEX: _Resource(hashes)}
+        for definition_name, definition in definitions.items():
+            resources[definition_name] = _Resource(definition, hashes[definition_name])
+        return resources
+
+    def _lookup(self, path: str) -> typing.Optional[_Resource]:
+        parts = path.strip("/").split("/")
+        if not parts[0] or parts[0] not in self.schemas:
+            return None
+        if len(parts) == 1:
+            key = ""
+        elif len(parts) == 2 and parts[1] == "definitions":
+            key = _INDEX
+        elif len(parts) == 3 and parts[1] == "definitions":
+            key = parts[2]
+        else:
+            return None
+        return self._document_resources(parts[0]).get(key)
+
+    def handle(
+        self, method: str, path: str, headers: typing.Mapping[str, str]
+    ) -> typing.Tuple[int, typing.List[typing.Tuple[str, str]], bytes]:
+        """Answer one request. `headers` maps lower-cased header names to
+        values. Returns `(status, response headers, body)`; shared by the
+        WSGI and ASGI entry points."""
+        if method not in ("GET", "HEAD"):
+            return 405, [("Allow", "GET, HEAD"), ("Content-Length", "0")], b""
+        resource = self._lookup(path)
+        if resource is None:
+            return 404, [("Content-Length", "0")], b""
+
+        use_gzip = _accepts_gzip(headers.get("accept-encoding", ""))
+        etag = resource.gzip_etag if use_gzip else resource.etag
+        response_headers = [("ETag", etag), ("Vary", "Accept-Encoding")]
+        if self.cache_control:
+            response_headers.append(("Cache-Control", self.cache_control))
+
+        if _etag_matches(
+            headers.get("if-none-match", ""), (resource.etag, resource.gzip_etag)
+        ):
+            return 304, response_headers, b""
+
+        body = resource.gzip_body if use_gzip else resource.body
+        response_headers.append(("Content-Type", "application/schema+json"))
+        if use_gzip:
+            response_headers.append(("Content-Encoding", "gzip"))
+        response_headers.append(("Content-Length", str(len(body))))
+        return 200, response_headers, b"" if method == "HEAD" else body
+
+    def __call__(self, environ, start_response):
+        headers = {
+            key[5:].replace("_", "-").lower(): value
+            for key, value in environ.items()
+            if key.startswith("HTTP_")
+        }
+        status, response_headers, body = self.handle(
+            environ.get("REQUEST_METHOD", "GET"), environ.get("PATH_INFO", "/"), headers
+        )
+        start_response(_STATUS_TEXT[status], response_headers)
+        return [body]
+
+    async def asgi(self, scope, receive, send) -> None:
+        """ASGI entry point. Also completes the lifespan protocol so the
+        app can be mounted directly under an ASGI server."""
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        if scope["type"] != "http":
+            raise ValueError("Unsupported ASGI scope type %r" % scope["type"])
+
+        headers = {
+            key.decode("latin-1").lower(): value.decode("latin-1")
+            for key, value in scope.get("headers", [])
+        }
+        status, response_headers, body = self.handle(
+            scope["method"], scope["path"], headers
+        )
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (key.lower().encode("latin-1"), value.encode("latin-1"))
+                    for key, value in response_headers
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.strip().partition(";")
+        if coding.strip().lower() not in ("gzip", "*"):
+            continue
+        params = params.strip().replace(" ", "")
+        return params not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _etag_matches(if_none_match: str, etags: typing.Iterable[str]) -> bool:
+    """Weak comparison, as RFC 7232 prescribes for `If-None-Match`."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    candidates = {tag[2:] if tag.startswith("W/") else tag for tag in candidates}
+    return any(etag in candidates for etag in etags)
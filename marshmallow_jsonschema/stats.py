@@ -0,0 +1,176 @@
+import typing
+
+__all__ = ("GenerationStats",)
+
+
+class GenerationStats:
+    """Counters describing the work done by `JSONSchema.dump`.
+
+    Opt in with `JSONSchema(stats=True)` (the generator then exposes a
+    fresh instance as `.stats`), or pass an instance to aggregate
+    several generators into one set of counters:
+
+        stats = GenerationStats()
+        JSONSchema(stats=stats).dump(UserSchema())
+        JSONSchema(stats=stats).dump(OrderSchema())
+        stats.as_dict()
+
+    When stats are disabled (the default) the generator skips all of the
+    bookkeeping below.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero every counter."""
+        #: Top-level `dump` calls; nested definition dumps aren't counted.
+        self.dumps = 0
+        self.dump_seconds_total = 0.0
+        self.last_dump_seconds = 0.0
+        #: Definitions built from scratch vs. satisfied by an existing
+        #: entry (already in the document, or served from a cache).
+        self.definitions_generated = 0
+        self.definitions_reused = 0
+        #: Fields visited, keyed by the handler that produced the schema:
+        #: `python_type`, `nested`, `pluck`, `tuple`, `constant`, `union`,
+        #: `raw`, `enum_definition` or `custom_mapping`.
+        self.fields_visited: typing.Dict[str, int] = {}
+        #: Validator handlers applied, keyed by validator class name.
+        self.validators_applied: typing.Dict[str, int] = {}
+        #: Size of the serialized (`json.dumps`) output.
+        self.output_bytes_total = 0
+        self.last_output_bytes = 0
+        #: `Regexp` patterns flagged by the ReDoS check, one entry per
+        #: field: `{"field": "Schema.field", "pattern": ..., "issues": [...]}`.
+        self.regex_findings: typing.List[typing.Dict[str, typing.Any]] = []
+
+    def record_dump(self, seconds: float, output_bytes: int) -> None:
+        self.dumps += 1
+        self.dump_seconds_total += seconds
+        self.last_dump_seconds = seconds
+        self.output_bytes_total += output_bytes
+        self.last_output_bytes = output_bytes
+
+    def record_field(self, handler: str) -> None:
+        self.fields_visited[handler] = self.fields_visited.get(handler, 0) + 1
+
+    def record_validator(self, validator_name: str) -> None:
+        self.validators_applied[validator_name] = (
+            self.validators_applied.get(validator_name, 0) + 1
+        )
+
+    def record_definition(self, reused: bool) -> None:
+        if reused:
+            self.definitions_reused += 1
+        else:
+            self.definitions_generated += 1
+
+    def record_regex_finding(
+        self, field_label: str, pattern: str, issues: typing.Sequence[str]
+    ) -> None:
+        self.regex_findings.append(
+            {"field": field_label, "pattern": pattern, "issues": list(issues)}
+        )
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        """A JSON-serializable snapshot of the counters."""
+        return {
+            "dumps": self.dumps,
+            "dump_seconds_total": self.dump_seconds_total,
+            "last_dump_seconds": self.last_dump_seconds,
+            "definitions_generated": self.definitions_generated,
+            "definitions_reused": self.definitions_reused,
+            "fields_visited": dict(self.fields_visited),
+            "validators_applied": dict(self.validators_applied),
+            "output_bytes_total": self.output_bytes_total,
+            "last_output_bytes": self.last_output_bytes,
+            "regex_findings": [dict(finding) for finding in self.regex_findings],
+        }
+
+    def to_prometheus(self, prefix: str = "marshmallow_jsonschema") -> str:
+        """Render the counters in the Prometheus text exposition format."""
+        lines: typing.List[str] = []
+
+        def metric(name, kind, help_text, samples):
+            full_name = "{}_{}".format(prefix, name)
+            lines.append("# HELP {} {}".format(full_name, help_text))
+            lines.append("# TYPE {} {}".format(full_name, kind))
+            for labels, value in samples:
+                lines.append("{}{} {}".format(full_name, labels, value))
+
+        metric(
+            "dumps_total",
+            "counter",
+            "Top-level JSONSchema.dump calls.",
+            [("", self.dumps)],
+        )
+        metric(
+            "dump_seconds_total",
+            "counter",
+            "Wall time spent in JSONSchema.dump.",
+            [("", repr(self.dump_seconds_total))],
+        )
+        metric(
+            "last_dump_seconds",
+            "gauge",
+            "Wall time of the most recent JSONSchema.dump.",
+            [("", repr(self.last_dump_seconds))],
+        )
+        metric(
+            "definitions_total",
+            "counter",
+            "Schema definitions generated or reused.",
+            [
+                ('{outcome="generated"}', self.definitions_generated),
+                ('{outcome="reused"}', self.definitions_reused),
+            ],
+        )
+        metric(
+            "fields_visited_total",
+            "counter",
+            "Fields converted, by handler.",
+            [
+                ('{{handler="{}"}}'.format(_escape_label(handler)), count)
+                for handler, count in sorted(self.fields_visited.items())
+            ],
+        )
+        metric(
+            "validators_applied_total",
+            "counter",
+            "Validator handlers applied, by validator class.",
+            [
+                ('{{validator="{}"}}'.format(_escape_label(name)), count)
+                for name, count in sorted(self.validators_applied.items())
+            ],
+        )
+        metric(
+            "output_bytes_total",
+            "counter",
+            "Serialized size of dumped documents.",
+            [("", self.output_bytes_total)],
+        )
+        metric(
+            "last_output_bytes",
+            "gauge",
+            "Serialized size of the most recent document.",
+            [("", self.last_output_bytes)],
+        )
+        issue_counts: typing.Dict[str, int] = {}
+        for finding in self.regex_findings:
+            for issue in finding["issues"]:
+                issue_counts[issue] = issue_counts.get(issue, 0) + 1
+        metric(
+            "regex_findings_total",
+            "counter",
+            "Regexp patterns flagged as catastrophic-backtracking risks, by issue.",
+            [
+                ('{{issue="{}"}}'.format(_escape_label(issue)), count)
+                for issue, count in sorted(issue_counts.items())
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -26,6 +26,8 @@ EXTRAS_REQUIRE = {
     "enum": ["marshmallow-enum"],
     "union": ["marshmallow-union"],
     "oneofschema": ["marshmallow-oneofschema"],
+    "numpy": ["numpy"],
+    "ndjson": ["jsonschema>=4"],
 }
 
 
@@ -0,0 +1,123 @@
+import pytest
+from marshmallow import Schema, ValidationError, fields, validate
+
+from marshmallow_jsonschema.batch import BatchValidator
+
+
+def even(value):
+    if value % 2:
+        raise ValidationError("odd")
+
+
+class BatchRowSchema(Schema):
+    name = fields.String(required=True, validate=validate.Length(min=2, max=5))
+    age = fields.Integer(validate=validate.Range(min=0, max=120, max_inclusive=False))
+    role = fields.String(validate=validate.OneOf(["admin", "user"]))
+    code = fields.String(validate=validate.Regexp(r"[A-Z]{2}\d$"), allow_none=True)
+    kind = fields.String(validate=validate.Equal("row"))
+    count = fields.Integer(validate=even)
+
+
+ROWS = [
+    {
+        "name": "ann",
+        "age": 30,
+        "role": "admin",
+        "code": "AB1",
+        "kind": "row",
+        "count": 2,
+    },
+    {"name": "b", "age": 30, "role": "user", "code": "AB1", "kind": "row", "count": 2},
+    {
+        "name": "carol",
+        "age": 120,
+        "role": "user",
+        "code": None,
+        "kind": "row",
+        "count": 4,
+    },
+    {
+        "name": "dave",
+        "age": -1,
+        "role": "root",
+        "code": "ab1",
+        "kind": "col",
+        "count": 3,
+    },
+    {
+        "name": "eve",
+        "age": 0,
+        "role": "user",
+        "code": "AB12",
+        "kind": "row",
+        "count": 0,
+    },
+    {"name": None, "age": 5, "role": None, "code": "ZZ9", "kind": "row", "count": 6},
+]
+
+
+def columns(rows):
+    return {name: [row[name] for row in rows] for name in rows[0]}
+
+
+def test_batch_mask_matches_marshmallow():
+    schema = BatchRowSchema()
+
+    result = BatchValidator(schema).validate(columns(ROWS))
+
+    assert result.mask == [bool(schema.validate(row)) for row in ROWS]
+    assert result.invalid_rows() == [1, 2, 3, 4, 5]
+    assert result.field_masks["age"] == [False, False, True, True, False, False]
+    assert result.field_masks["code"] == [False, False, False, True, True, False]
+    assert result.field_masks["count"] == [False, False, False, True, False, False]
+    assert result.error_count == 5
+
+
+def test_batch_missing_columns_and_lengths():
+    validator = BatchValidator(BatchRowSchema)
+
+    assert validator.validate({"age": [1, 2]}).mask == [True, True]
+    assert validator.validate({"name": ["ann", "bob"]}).mask == [False, False]
+    with pytest.raises(ValueError):
+        validator.validate({"name": ["ann"], "age": [1, 2]})
+
+
+def test_batch_numpy_columns():
+    np = pytest.importorskip("numpy")
+    schema = BatchRowSchema()
+    data = columns(ROWS)
+    data["age"] = np.array(data["age"])
+    data["kind"] = np.array(data["kind"])
+
+    result = BatchValidator(schema).validate(data)
+
+    assert result.mask.tolist() == [bool(schema.validate(row)) for row in ROWS]
+
+
+def test_batch_list_columns_next_to_numpy_columns():
+    np = pytest.importorskip("numpy")
+
+    class BatchTagsSchema(Schema):
+        tags = fields.List(fields.String(), validate=validate.Length(max=2))
+        score = fields.Integer(validate=validate.Range(min=0))
+        note = fields.String(allow_none=True, validate=validate.OneOf(["a", "b"]))
+
+    schema = BatchTagsSchema()
+    validator = BatchValidator(schema)
+    scores, notes = [1, -1, 2], ["a", None, "c"]
+    # Equal-length lists would become a 2-d array, ragged ones fail.
+    for tags in ([["x", "y"]] * 3, [["x", "y"], ["x"], ["x", "y", "z"]]):
+        result = validator.validate(
+            {
+                "tags": tags,
+                "score": np.array(scores),
+                "note": np.array(notes, dtype=object),
+            }
+        )
+
+        rows = [
+            {"tags": t, "score": s, "note": n} for t, s, n in zip(tags, scores, notes)
+        ]
+        assert result.mask.tolist() == [bool(schema.validate(row)) for row in rows]
+        assert result.field_masks["tags"].tolist() == [len(t) > 2 for t in tags]
+        assert result.field_masks["note"].tolist() == [False, False, True]
@@ -0,0 +1,197 @@
+import json
+import multiprocessing
+import os
+
+import pytest
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import JSONSchema
+from marshmallow_jsonschema.cache import (
+    DirectoryCache,
+    MemoryCache,
+    SQLiteCache,
+    fingerprint,
+    invalidate_fingerprints,
+    schema_cache_key,
+)
+from . import UserSchema
+
+
+@pytest.fixture(params=["directory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "directory":
+        return DirectoryCache(tmp_path / "cache")
+    return SQLiteCache(tmp_path / "cache.sqlite3")
+
+
+def test_cache_round_trip(cache):
+    plain = JSONSchema().dump(UserSchema())
+
+    first = JSONSchema(cache=cache).dump(UserSchema())
+    json_schema = JSONSchema(cache=cache, stats=True)
+    second = json_schema.dump(UserSchema())
+
+    assert first == plain
+    assert second == plain
+    assert json_schema.stats.definitions_generated == 0
+    assert json_schema._nested_schema_classes == plain["definitions"]
+
+
+def test_cache_regenerates_on_fingerprint_mismatch(cache):
+    def make(max_length):
+        class CachedItem(Schema):
+            name = fields.String(validate=validate.Length(max=max_length))
+
+        return CachedItem()
+
+    JSONSchema(cache=cache).dump(make(3))
+    dumped = JSONSchema(cache=cache).dump(make(5))
+
+    assert dumped["definitions"]["CachedItem"]["properties"]["name"]["maxLength"] == 5
+    # The changed schema replaced its previous entry.
+    assert schema_cache_key(make(3), JSONSchema()) == schema_cache_key(
+        make(5), JSONSchema()
+    )
+    assert (
+        cache.get(
+            schema_cache_key(make(3), JSONSchema()), fingerprint(make(3), JSONSchema())
+        )
+        is None
+    )
+
+
+def test_fingerprint_covers_nested_meta_and_options():
+    class FpLeaf(Schema):
+        value = fields.Integer()
+
+    class FpRoot(Schema):
+        leaf = fields.Nested(FpLeaf)
+        parent = fields.Nested("FpRoot")
+
+    base = fingerprint(FpRoot(), JSONSchema())
+    assert base == fingerprint(FpRoot(), JSONSchema())
+    assert base != fingerprint(FpRoot(), JSONSchema(props_ordered=True))
+    assert base != fingerprint(FpRoot(exclude=("leaf",)), JSONSchema())
+
+    FpLeaf._declared_fields["value"] = fields.Integer(validate=validate.Range(min=1))
+    try:
+        assert base != fingerprint(FpRoot(), JSONSchema())
+    finally:
+        FpLeaf._declared_fields["value"] = fields.Integer()
+
+    class Meta:
+        title = "Root"
+
+    FpRoot.Meta = Meta
+    try:
+        assert base != fingerprint(FpRoot(), JSONSchema())
+    finally:
+        del FpRoot.Meta
+
+
+def test_cache_key_covers_dump_only_and_load_only(cache):
+    class KeyedSchema(Schema):
+        name = fields.String()
+
+    keys = {
+        schema_cache_key(schema, JSONSchema())
+        for schema in (
+            KeyedSchema(),
+            KeyedSchema(dump_only=("name",)),
+            KeyedSchema(load_only=("name",)),
+        )
+    }
+    assert len(keys) == 3
+
+    # Both variants stay cached side by side.
+    JSONSchema(cache=cache).dump(KeyedSchema())
+    JSONSchema(cache=cache).dump(KeyedSchema(dump_only=("name",)))
+    generator = JSONSchema(cache=cache, stats=True)
+    for schema in (KeyedSchema(), KeyedSchema(dump_only=("name",))):
+        generator.dump(schema)
+    assert generator.stats.definitions_generated == 0
+
+
+def test_directory_cache_ignores_corrupt_entries(tmp_path):
+    cache = DirectoryCache(tmp_path)
+    key = schema_cache_key(UserSchema(), JSONSchema())
+    (tmp_path / (key + ".json")).write_text("{not json")
+
+    assert JSONSchema(cache=cache).dump(UserSchema()) == JSONSchema().dump(UserSchema())
+    assert [p for p in os.listdir(tmp_path) if p.startswith(".tmp-")] == []
+
+    cache.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def _dump_with(cache_factory, path):
+    return json.dumps(JSONSchema(cache=cache_factory(path)).dump(UserSchema()))
+
+
+@pytest.mark.parametrize("cache_factory", [DirectoryCache, SQLiteCache])
+def test_cache_concurrent_writers(tmp_path, cache_factory):
+    path = str(tmp_path / "shared")
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(4) as pool:
+        results = pool.starmap(_dump_with, [(cache_factory, path)] * 8)
+
+    expected = JSONSchema().dump(UserSchema())
+    assert all(json.loads(result) == expected for result in results)
+    assert JSONSchema(cache=cache_factory(path)).dump(UserSchema()) == expected
+
+
+def test_cache_hit_with_nested_definitions_path(cache):
+    def generator():
+        return JSONSchema(cache=cache, definitions_path="components/schemas")
+
+    first = generator().dump(UserSchema())
+    json_schema = generator()
+    second = json_schema.dump(UserSchema())
+
+    assert second == first
+    assert set(json_schema._nested_schema_classes) == set(
+        first["components"]["schemas"]
+    )
+
+
+def test_cache_hit_reuses_fingerprint_and_skips_generation(monkeypatch):
+    from marshmallow_jsonschema import cache as cache_module
+
+    class FpMemoItem(Schema):
+        name = fields.String(validate=validate.Length(max=3))
+
+    described = []
+    describe = cache_module._describe_schema
+    monkeypatch.setattr(
+        cache_module,
+        "_describe_schema",
+        lambda schema, seen: described.append(schema) or describe(schema, seen),
+    )
+    memory = MemoryCache()
+    expected = JSONSchema(cache=memory).dump(FpMemoItem())
+
+    def generate(self, obj, **kwargs):
+        raise AssertionError("cache hit generated the document")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(JSONSchema, "_generate", generate)
+        hit = JSONSchema(cache=memory).dump(FpMemoItem())
+        assert hit == expected
+        assert JSONSchema(cache=memory).dump(FpMemoItem()) is hit
+    assert len(described) == 1
+
+    # Changing a schema class at runtime needs an explicit invalidation.
+    FpMemoItem._declared_fields["name"] = fields.String(validate=validate.Length(max=5))
+    FpMemoItem._declared_fields["name"].name = "name"
+    try:
+        stale = JSONSchema(cache=memory).dump(FpMemoItem())
+        assert (
+            stale["definitions"]["FpMemoItem"]["properties"]["name"]["maxLength"] == 3
+        )
+        invalidate_fingerprints(FpMemoItem)
+        fresh = JSONSchema(cache=memory).dump(FpMemoItem())
+        assert (
+            fresh["definitions"]["FpMemoItem"]["properties"]["name"]["maxLength"] == 5
+        )
+    finally:
+        invalidate_fingerprints()
@@ -0,0 +1,180 @@
+import hashlib
+import json
+
+import jsonschema
+import pytest
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import JSONSchema, UnsupportedValueError
+from marshmallow_jsonschema.cache import MemoryCache
+from marshmallow_jsonschema.canonical import (
+    canonical_dumps,
+    canonicalize,
+    content_hash,
+    definition_hash,
+    definition_hashes,
+)
+from marshmallow_jsonschema.frozen import FrozenDict, freeze
+from marshmallow_jsonschema.serving import SchemaApp
+from . import UserSchema
+
+
+class CanonicalTag(Schema):
+    label = fields.String(metadata={"z": 1, "a": 2})
+
+
+class CanonicalPost(Schema):
+    title = fields.String(validate=validate.Length(max=10), metadata={"b": 1})
+    tags = fields.List(fields.Nested(CanonicalTag))
+
+
+def _all_sorted(value):
+    if isinstance(value, dict):
+        return list(value) == sorted(value) and all(map(_all_sorted, value.values()))
+    if isinstance(value, list):
+        return all(map(_all_sorted, value))
+    return True
+
+
+def test_canonicalize():
+    document = freeze({"b": [{"y": 1, "x": 2}], "a": ("z", "é")})
+
+    canonical = canonicalize(document)
+
+    assert canonical == {"a": ["z", "é"], "b": [{"x": 2, "y": 1}]}
+    assert list(canonical) == ["a", "b"]
+    assert list(canonical["b"][0]) == ["x", "y"]
+    assert isinstance(canonical["b"][0], FrozenDict)
+
+
+def test_canonical_dumps_is_order_independent():
+    first = {"b": 1, "a": {"d": [3, 1], "c": "é"}}
+    second = {"a": {"c": "é", "d": [3, 1]}, "b": 1}
+
+    assert canonical_dumps(first) == canonical_dumps(second)
+    assert canonical_dumps(first) == '{"a":{"c":"é","d":[3,1]},"b":1}'.encode("utf-8")
+    assert content_hash(first) == hashlib.sha256(canonical_dumps(second)).hexdigest()
+    assert content_hash({"d": [1, 3]}) != content_hash({"d": [3, 1]})
+    with pytest.raises(TypeError):
+        canonical_dumps({"a": object()})
+
+
+def test_canonical_generation():
+    plain = JSONSchema().dump(CanonicalPost())
+    canonical = JSONSchema(canonical=True).dump(CanonicalPost())
+
+    assert canonical == plain
+    assert not _all_sorted(plain)
+    assert _all_sorted(canonical)
+    assert json.dumps(canonical, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    ) == canonical_dumps(plain)
+
+    with pytest.raises(UnsupportedValueError):
+        JSONSchema(canonical=True, props_ordered=True)
+
+
+def test_serving_etag_is_content_hash():
+    app = SchemaApp({"user": UserSchema})
+    status, headers, body = app.handle("GET", "/user", {})
+    document = JSONSchema().dump(UserSchema())
+
+    assert status == 200
+    assert body == canonical_dumps(document)
+    assert dict(headers)["ETag"] == '"{}"'.format(content_hash(document))
+
+
+def test_content_hashes_option():
+    plain = JSONSchema().dump(CanonicalPost())
+    expected = definition_hashes(plain)
+
+    generator = JSONSchema(content_hashes=True)
+    assert generator.dump(CanonicalPost()) == plain
+    assert generator.definition_hashes == expected
+    assert expected["CanonicalTag"] == definition_hash(
+        plain["definitions"]["CanonicalTag"]
+    )
+
+    generator = JSONSchema(content_hashes="x-content-hash", canonical=True)
+    dumped = generator.dump(CanonicalPost())
+    assert dumped["definitions"]["CanonicalTag"]["x-content-hash"] == (
+        expected["CanonicalTag"]
+    )
+    assert _all_sorted(dumped)
+    assert definition_hashes(dumped) == expected
+
+    # Anchors don't change how `$ref`s inside the definition resolve.
+    dumped = JSONSchema(content_hashes="$id").dump(CanonicalPost())
+    assert dumped["definitions"]["CanonicalPost"]["$id"] == (
+        "#sha256-" + expected["CanonicalPost"]
+    )
+    assert definition_hashes(dumped) == expected
+    validator = jsonschema.Draft7Validator(dumped)
+    assert validator.is_valid({"tags": [{"label": "x"}]})
+    assert not validator.is_valid({"tags": [{"label": 1}]})
+
+    cache = MemoryCache()
+    JSONSchema(cache=cache, content_hashes=True).dump(CanonicalPost())
+    generator = JSONSchema(cache=cache, content_hashes=True)
+    generator.dump(CanonicalPost())
+    assert generator.definition_hashes == expected
+
+    with pytest.raises(UnsupportedValueError):
+        JSONSchema(content_hashes="x-hash")
+
+
+def test_non_string_keys():
+    assert canonical_dumps({10: 1, 2: None, "a": {True: 1.5, None: 0}}) == (
+        b'{"10":1,"2":null,"a":{"null":0,"true":1.5}}'
+    )
+    assert canonicalize({2: "x", "b": 1, 1.5: []}) == {"1.5": [], "2": "x", "b": 1}
+    with pytest.raises(ValueError):
+        canonical_dumps({1: "a", "1": "b"})
+    with pytest.raises(ValueError):
+        canonicalize({1: "a", "1": "b"})
+    with pytest.raises(TypeError):
+        canonical_dumps({(1, 2): "a"})
+
+    class CanonicalMixedKeys(Schema):
+        mapping = fields.Dict(dump_default={1: "a", "b": 2})
+
+    dumped = JSONSchema(canonical=True, content_hashes=True).dump(CanonicalMixedKeys())
+    default = dumped["definitions"]["CanonicalMixedKeys"]["properties"]["mapping"][
+        "default"
+    ]
+    assert default == {"1": "a", "b": 2}
+    status, _, body = SchemaApp({"mixed": CanonicalMixedKeys}).handle(
+        "GET", "/mixed", {}
+    )
+    assert status == 200
+    assert json.loads(body) == dumped
+
+
+def test_content_hash_anchors_are_unique():
+    class CanonicalPoint(Schema):
+        x = fields.Integer()
+
+    class CanonicalSpot(Schema):
+        x = fields.Integer()
+
+    class CanonicalMap(Schema):
+        spot = fields.Nested(CanonicalSpot)
+        point = fields.Nested(CanonicalPoint)
+
+    # No title or description: the two definitions are identical.
+    plain = JSONSchema().dump(CanonicalMap())
+    expected = definition_hashes(plain)
+    assert expected["CanonicalPoint"] == expected["CanonicalSpot"]
+
+    dumped = JSONSchema(content_hashes="$id").dump(CanonicalMap())
+    definitions = dumped["definitions"]
+    anchor = "#sha256-" + expected["CanonicalPoint"]
+    assert definitions["CanonicalPoint"]["$id"] == anchor
+    assert definitions["CanonicalSpot"] == {"$ref": anchor}
+    ids = [d["$id"] for d in definitions.values() if "$id" in d]
+    assert len(ids) == len(set(ids))
+    assert definition_hashes(dumped) == expected
+
+    validator = jsonschema.Draft7Validator(dumped)
+    assert validator.is_valid({"spot": {"x": 1}, "point": {"x": 2}})
+    assert not validator.is_valid({"spot": {"x": "1"}})
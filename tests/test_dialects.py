@@ -0,0 +1,118 @@
+import pytest
+from jsonschema import Draft7Validator, Draft202012Validator
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import JSONSchema, UnsupportedValueError
+from marshmallow_jsonschema.dialects import register_dialect, render, schema_ir
+from marshmallow_jsonschema.stats import GenerationStats
+
+
+class DialectAddress(Schema):
+    city = fields.String(required=True)
+
+
+class DialectUser(Schema):
+    name = fields.String(allow_none=True)
+    age = fields.Integer(validate=validate.Range(min=0, min_inclusive=False))
+    kind = fields.Constant("user")
+    pair = fields.Tuple((fields.Integer(), fields.String()))
+    address = fields.Nested(DialectAddress, allow_none=True)
+    history = fields.Nested(DialectAddress, many=True, metadata={"description": "d"})
+
+
+def test_one_traversal_for_every_dialect():
+    stats = GenerationStats()
+
+    documents = [
+        render(DialectUser(), dialect, JSONSchema(stats=stats))
+        for dialect in ("draft-07", "openapi-3.0", "openapi-3.1", "openapi-3.0")
+    ]
+
+    assert stats.dumps == 1
+    assert documents[1] is documents[3]
+    assert documents[0] is schema_ir(DialectUser, JSONSchema())
+    assert documents[0] == JSONSchema().dump(DialectUser())
+
+
+def test_render_openapi30():
+    rendered = render(DialectUser, "openapi-3.0")
+    schemas = rendered["components"]["schemas"]
+    properties = schemas["DialectUser"]["properties"]
+
+    assert rendered["schema"] == {"$ref": "#/components/schemas/DialectUser"}
+    assert set(schemas) == {"DialectUser", "DialectAddress"}
+    assert properties["name"] == {"title": "name", "type": "string", "nullable": True}
+    assert properties["age"] == {
+        "title": "age",
+        "type": "integer",
+        "minimum": 0,
+        "exclusiveMinimum": True,
+    }
+    assert properties["kind"]["enum"] == ["user"]
+    assert properties["pair"]["items"] == {
+        "anyOf": [
+            {"title": "pair", "type": "integer"},
+            {"title": "pair", "type": "string"},
+        ]
+    }
+    assert properties["address"] == {
+        "nullable": True,
+        "allOf": [{"$ref": "#/components/schemas/DialectAddress"}],
+    }
+    assert properties["history"]["items"] == {
+        "description": "d",
+        "allOf": [{"$ref": "#/components/schemas/DialectAddress"}],
+    }
+
+
+def test_render_openapi31_accepts_what_draft07_accepts():
+    rendered = render(DialectUser, "openapi-3.1")
+    document = dict(rendered["schema"], components=rendered["components"])
+    properties = rendered["components"]["schemas"]["DialectUser"]["properties"]
+
+    assert "items" not in properties["pair"]
+    assert len(properties["pair"]["prefixItems"]) == 2
+
+    draft07 = Draft7Validator(JSONSchema().dump(DialectUser()))
+    openapi31 = Draft202012Validator(document)
+    for instance in (
+        {},
+        {"name": None, "age": 1},
+        {"age": 0},
+        {"kind": "admin"},
+        {"pair": [1, "a"]},
+        {"pair": ["a", 1]},
+        {"address": None},
+        {"address": {}},
+        {"history": [{"city": "x"}]},
+        {"history": [{"city": 1}]},
+    ):
+        assert draft07.is_valid(instance) == openapi31.is_valid(instance), instance
+
+
+def test_register_dialect():
+    register_dialect("names", lambda document, path: {"names": sorted(document[path])})
+
+    assert render(DialectUser, "names") == {"names": ["DialectAddress", "DialectUser"]}
+    with pytest.raises(UnsupportedValueError):
+        render(DialectUser, "nope")
+
+
+def test_cache_tells_schemas_and_instances_apart():
+    first = Schema.from_dict({"a": fields.String()})
+    second = Schema.from_dict({"b": fields.String()})
+    assert first.__name__ == second.__name__
+
+    for dialect in ("draft-07", "openapi-3.0"):
+        for schema_cls, name in ((first, "a"), (second, "b")):
+            rendered = render(schema_cls(), dialect)
+            definitions = (
+                rendered.get("definitions") or rendered["components"]["schemas"]
+            )
+            assert list(definitions["GeneratedSchema"]["properties"]) == [name]
+
+    render(DialectAddress(dump_only=("city",)))
+    city = render(DialectAddress())["definitions"]["DialectAddress"]["properties"][
+        "city"
+    ]
+    assert "readOnly" not in city
@@ -3,12 +3,17 @@ from enum import Enum
 
 import jsonschema
 import pytest
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, fields, post_dump, validate
 from marshmallow_enum import EnumField
 from marshmallow_union import Union
 
 from marshmallow_jsonschema import JSONSchema, UnsupportedValueError
-from marshmallow_jsonschema.base import ALLOW_NATIVE_ENUM, MARSHMALLOW_MAJOR
+from marshmallow_jsonschema.base import (
+    ALLOW_NATIVE_ENUM,
+    MARSHMALLOW_MAJOR,
+    _is_json_serializable,
+)
+from marshmallow_jsonschema.stats import GenerationStats
 from . import UserSchema, validate_and_dump
 
 if ALLOW_NATIVE_ENUM:
@@ -52,6 +57,59 @@ def test_default_nonserializable_not_emitted():
     json.dumps(dumped)
 
 
+@pytest.mark.parametrize(
+    "value",
+    [
+        None,
+        True,
+        3,
+        1.5,
+        float("nan"),
+        "text",
+        [1, "a", None],
+        (1, (2.0, "b")),
+        {"a": [1, {"b": None}], 1: "int key", None: "none key"},
+        [1, uuid.UUID(int=0)],
+        {"a": {"b": {uuid.UUID(int=0)}}},
+        {(1, 2): "tuple key"},
+        uuid.UUID(int=0),
+        {1, 2},
+        b"bytes",
+    ],
+)
+def test_is_json_serializable_agrees_with_json_dumps(value):
+    import json
+
+    try:
+        json.dumps(value)
+        expected = True
+    except TypeError:
+        expected = False
+
+    assert _is_json_serializable(value) is expected
+    # Second call may be answered from the identity cache.
+    assert _is_json_serializable(value) is expected
+
+
+def test_is_json_serializable_rejects_cycles():
+    value: list = [1]
+    value.append(value)
+
+    assert _is_json_serializable(value) is False
+
+
+def test_default_structured_value_emitted():
+    class TestSchema(Schema):
+        tags = fields.List(fields.String(), dump_default=["a", "b"])
+        pair = fields.Raw(dump_default=(1, [2, uuid.UUID(int=0)]))
+
+    dumped = validate_and_dump(TestSchema())
+
+    props = dumped["definitions"]["TestSchema"]["properties"]
+    assert props["tags"]["default"] == ["a", "b"]
+    assert "default" not in props["pair"]
+
+
 def test_default_callable_not_serialized():
     class TestSchema(Schema):
         uid = fields.UUID(dump_default=uuid.uuid4)
@@ -99,6 +157,47 @@ def test_metadata():
     assert props["yourfield"]["baz"] == "waz"
 
 
+def test_metadata_not_mutated_by_dump():
+    """Dumping must not write into the user's metadata dicts. The legacy
+    nested `metadata={"metadata": {...}}` form used to absorb the
+    top-level keys on every dump."""
+
+    nested_md = {"description": "Nested form"}
+
+    class MetadataMutationSchema(Schema):
+        myfield = fields.String(metadata={"metadata": nested_md, "title": "T"})
+        nested = fields.Nested(
+            "MetadataMutationSchema", metadata={"metadata": {"description": "Self"}}
+        )
+
+    schema = MetadataMutationSchema()
+    first = validate_and_dump(schema)
+    second = validate_and_dump(schema)
+
+    assert first == second
+    assert nested_md == {"description": "Nested form"}
+    assert schema.fields["nested"].metadata["metadata"] == {"description": "Self"}
+    props = second["definitions"]["MetadataMutationSchema"]["properties"]
+    assert props["myfield"]["description"] == "Nested form"
+    assert props["myfield"]["title"] == "T"
+    assert props["nested"]["description"] == "Self"
+
+
+def test_metadata_type_mapping_not_mutated_by_dump():
+    mapping = {"type": "string"}
+
+    class TestSchema(Schema):
+        colour = fields.Field(
+            metadata={"_jsonschema_type_mapping": mapping, "title": "Colour"}
+        )
+
+    dumped = validate_and_dump(TestSchema())
+
+    prop = dumped["definitions"]["TestSchema"]["properties"]["colour"]
+    assert prop == {"type": "string", "title": "Colour"}
+    assert mapping == {"type": "string"}
+
+
 def test_descriptions():
     class TestSchema(Schema):
         myfield = fields.String(metadata={"description": "Brown Cow"})
@@ -391,6 +490,38 @@ def test_respect_default_for_nested_schema():
     assert default == nested_default
 
 
+def test_nested_default_dumped_once():
+    calls = []
+
+    class CountingNestedSchema(Schema):
+        myfield = fields.String()
+
+        @post_dump
+        def count(self, data, **kwargs):
+            calls.append(data)
+            return data
+
+    nested_default = {"myfield": "myval"}
+
+    class TestSchema(Schema):
+        nested = fields.Nested(CountingNestedSchema, dump_default=nested_default)
+        factory = fields.Nested(CountingNestedSchema, dump_default=dict)
+
+    first = validate_and_dump(TestSchema())
+    second = validate_and_dump(TestSchema())
+
+    props = second["definitions"]["TestSchema"]["properties"]
+    assert props["nested"]["default"] == {"myfield": "myval"}
+    assert "default" not in props["factory"]
+    assert first == second
+    assert calls == [{"myfield": "myval"}]
+    # The cached default is copied into each document.
+    assert type(props["nested"]["default"]) is dict
+    props["nested"]["default"]["myfield"] = "changed"
+    third = validate_and_dump(TestSchema())
+    assert third == first
+
+
 def test_nested_instance():
     """Should also work with nested schema instances"""
 
@@ -849,6 +980,99 @@ def test_marshmallow_enum_by_value_strings():
     assert sorted(prop["enum"]) == ["active", "inactive"]
 
 
+@pytest.mark.skipif(
+    not ALLOW_NATIVE_ENUM, reason="requires marshmallow>=3.18 for native Enum field"
+)
+def test_enum_definitions_shared_via_ref():
+    """`enum_definitions=True` emits each enum once as a definition and
+    points every field using it at that definition."""
+
+    class Country(str, Enum):
+        DE = "de"
+        FR = "fr"
+
+    class Address(Schema):
+        country = NativeEnumField(Country)
+
+    class S(Schema):
+        home = NativeEnumField(Country, metadata={"description": "Home"})
+        away = NativeEnumField(Country, allow_none=True)
+        code = NativeEnumField(Country, by_value=True)
+        legacy = EnumField(Country)
+        address = fields.Nested(Address)
+
+    dumped = JSONSchema(enum_definitions=True).dump(S())
+    jsonschema.Draft7Validator.check_schema(dumped)
+
+    definitions = dumped["definitions"]
+    assert definitions["Country"] == {"type": "string", "enum": ["DE", "FR"]}
+    assert definitions["CountryByValue"] == {"type": "string", "enum": ["de", "fr"]}
+    props = definitions["S"]["properties"]
+    assert props["home"] == {
+        "$ref": "#/definitions/Country",
+        "description": "Home",
+        "title": "home",
+    }
+    assert props["away"] == {
+        "anyOf": [{"$ref": "#/definitions/Country", "title": "away"}, {"type": "null"}]
+    }
+    assert props["code"]["$ref"] == "#/definitions/CountryByValue"
+    assert props["legacy"]["$ref"] == "#/definitions/Country"
+    assert definitions["Address"]["properties"]["country"]["$ref"] == (
+        "#/definitions/Country"
+    )
+
+    jsonschema.validate({"home": "DE", "away": None, "code": "fr"}, dumped)
+    with pytest.raises(jsonschema.ValidationError):
+        jsonschema.validate({"home": "de"}, dumped)
+
+
+def test_enum_definitions_name_collisions_raise():
+    def make_enum():
+        class Status(Enum):
+            ON = 1
+
+        return Status
+
+    first, second = make_enum(), make_enum()
+
+    class TwoEnums(Schema):
+        a = NativeEnumField(first)
+        b = NativeEnumField(second)
+
+    class Status(Schema):
+        x = fields.Integer()
+
+    class EnumThenSchema(Schema):
+        a = NativeEnumField(first)
+        b = fields.Nested(Status)
+
+    class SchemaThenEnum(Schema):
+        b = fields.Nested(Status)
+        a = NativeEnumField(first)
+
+    class InNested(Schema):
+        a = NativeEnumField(first)
+
+    class SchemaThenNestedEnum(Schema):
+        b = fields.Nested(Status)
+        c = fields.Nested(InNested)
+
+    RootStatus = Schema.from_dict({"a": NativeEnumField(first)}, name="Status")
+
+    for schema in (
+        TwoEnums,
+        EnumThenSchema,
+        SchemaThenEnum,
+        SchemaThenNestedEnum,
+        RootStatus,
+    ):
+        with pytest.raises(UnsupportedValueError, match="'Status'"):
+            JSONSchema(enum_definitions=True).dump(schema())
+        # Without enum definitions, enums are inlined: no collision.
+        JSONSchema().dump(schema())
+
+
 def test_oneofschema_top_level_emits_oneof():
     """`JSONSchema().dump(SomeOneOfSchema())` should emit a top-level
     `oneOf` with each variant inlined and its discriminator pinned via
@@ -1112,6 +1336,95 @@ def test_oneofschema_variant_field_collides_with_discriminator_raises():
         JSONSchema().dump(S())
 
 
+def test_oneofschema_definitions_shared_across_envelopes():
+    """`oneof_definitions=True` generates each variant once as a
+    definition and references it from every place the OneOfSchema
+    appears, pinning the discriminator through `allOf`."""
+    from marshmallow_oneofschema import OneOfSchema
+
+    class Point(Schema):
+        x = fields.Integer(required=True)
+
+    class Circle(Schema):
+        center = fields.Nested(Point, required=True)
+        radius = fields.Float(required=True)
+
+    class Square(Schema):
+        side = fields.Float(required=True)
+
+    class Shape(OneOfSchema):
+        type_schemas = {"circle": Circle, "square": Square}
+
+    class Drawing(Schema):
+        main = fields.Nested(Shape, required=True)
+        extras = fields.Nested(Shape, many=True)
+
+    dumped = JSONSchema(oneof_definitions=True).dump(Drawing())
+    jsonschema.Draft7Validator.check_schema(dumped)
+
+    definitions = dumped["definitions"]
+    assert set(definitions) == {"Drawing", "Point", "Shape.Circle", "Shape.Square"}
+    assert definitions["Shape.Circle"]["properties"]["type"] == {
+        "type": "string",
+        "title": "type",
+    }
+    assert "type" in definitions["Shape.Circle"]["required"]
+    main = definitions["Drawing"]["properties"]["main"]
+    assert main["oneOf"] == [
+        {
+            "allOf": [
+                {"$ref": "#/definitions/Shape.Circle"},
+                {"properties": {"type": {"const": "circle"}}},
+            ]
+        },
+        {
+            "allOf": [
+                {"$ref": "#/definitions/Shape.Square"},
+                {"properties": {"type": {"const": "square"}}},
+            ]
+        },
+    ]
+
+    circle = {"type": "circle", "center": {"x": 1}, "radius": 2.0}
+    jsonschema.validate(
+        {"main": circle, "extras": [{"type": "square", "side": 1}]}, dumped
+    )
+    with pytest.raises(jsonschema.ValidationError):
+        jsonschema.validate({"main": dict(circle, type="square")}, dumped)
+    with pytest.raises(jsonschema.ValidationError):
+        jsonschema.validate({"main": dict(circle, color="red")}, dumped)
+
+    # Variant bodies are reused by later dumps, as editable copies.
+    stats = GenerationStats()
+    again = JSONSchema(oneof_definitions=True, stats=stats).dump(Drawing())
+    assert stats.definitions_generated == 1
+    assert again == dumped
+    assert type(again["definitions"]["Shape.Circle"]["properties"]) is dict
+    again["definitions"]["Shape.Circle"]["properties"].clear()
+    assert JSONSchema(oneof_definitions=True).dump(Drawing()) == dumped
+
+
+def test_oneofschema_variant_cache_is_bounded(monkeypatch):
+    from marshmallow_oneofschema import OneOfSchema
+
+    from marshmallow_jsonschema import base
+
+    monkeypatch.setattr(base, "_ONEOF_VARIANT_CACHE_MAX", 2)
+    for _ in range(5):
+
+        class Variant(Schema):
+            x = fields.Integer()
+
+        class Dynamic(OneOfSchema):
+            type_schemas = {"variant": Variant}
+
+        class Holder(Schema):
+            value = fields.Nested(Dynamic)
+
+        JSONSchema(oneof_definitions=True).dump(Holder())
+        assert len(base._ONEOF_VARIANT_CACHE) <= 2
+
+
 def test_raw_field_accepts_any_json_value():
     """`fields.Raw` is "any value, no formatting"; the emitted schema
     must not pin a `type`, otherwise valid wire payloads get rejected.
@@ -1408,10 +1721,7 @@ def test_props_ordered_propagates_to_nested():
 
 def test_definitions_path_custom():
     """The `definitions_path` constructor argument reshapes both the root
-    key holding nested definitions and the emitted $ref paths. Must be
-    a single segment - multi-segment paths are rejected because they'd
-    produce a flat dict key with a slash in it rather than a nested
-    structure."""
+    key holding nested definitions and the emitted $ref paths."""
 
     class Inner(Schema):
         foo = fields.Integer()
@@ -1429,12 +1739,66 @@ def test_definitions_path_custom():
     )
 
 
-def test_definitions_path_rejects_multi_segment():
-    """A multi-segment path would silently produce a flat dict key with
-    slashes in it instead of the nested structure OpenAPI consumers
-    expect, so we reject it at construction time."""
-    with pytest.raises(UnsupportedValueError):
-        JSONSchema(definitions_path="components/schemas")
+def test_definitions_path_multi_segment():
+    """A multi-segment path nests the definitions (e.g. an OpenAPI
+    `components/schemas` section) and is used as-is in $refs."""
+
+    class Inner(Schema):
+        foo = fields.Integer(allow_none=True)
+
+    class Outer(Schema):
+        inner = fields.Nested(Inner)
+
+    for options in ({}, {"optimize": True}):
+        dumped = JSONSchema(definitions_path="components/schemas", **options).dump(
+            Outer()
+        )
+
+        assert list(dumped) == ["$schema", "components", "$ref"]
+        assert set(dumped["components"]) == {"schemas"}
+        schemas = dumped["components"]["schemas"]
+        assert dumped["$ref"] == "#/components/schemas/Outer"
+        assert schemas["Outer"]["properties"]["inner"]["$ref"] == (
+            "#/components/schemas/Inner"
+        )
+        validator = jsonschema.Draft7Validator(dumped)
+        assert validator.is_valid({"inner": {"foo": 1}})
+        assert not validator.is_valid({"inner": {"foo": "1"}})
+
+
+def test_definitions_path_rejects_empty_segments():
+    """Empty segments have no nested shape to produce."""
+    for path in ("/schemas", "schemas/", "components//schemas"):
+        with pytest.raises(UnsupportedValueError):
+            JSONSchema(definitions_path=path)
+
+
+def test_dump_definitions_merges_schemas():
+    """`dump_definitions` builds one definitions section for many
+    schemas, generating shared nested definitions once."""
+
+    class SharedAddress(Schema):
+        city = fields.String()
+
+    class SharedUser(Schema):
+        address = fields.Nested(SharedAddress)
+
+    class SharedOrder(Schema):
+        ship_to = fields.Nested(SharedAddress)
+
+    stats = GenerationStats()
+    json_schema = JSONSchema(definitions_path="components/schemas", stats=stats)
+
+    components = json_schema.dump_definitions([SharedUser, SharedOrder()])
+
+    assert list(components) == ["components"]
+    assert set(components["components"]["schemas"]) == {
+        "SharedAddress",
+        "SharedUser",
+        "SharedOrder",
+    }
+    assert stats.definitions_generated == 3
+    assert stats.definitions_reused == 1
 
 
 def test_sorting_properties():
@@ -1651,3 +2015,207 @@ def test_dumping_recursive_schema():
     lambda_schema = generate_recursive_schema_with_lambda()
     name_schema = generate_recursive_schema_with_name()
     assert lambda_schema == name_schema
+
+
+def test_inheritance_shares_base_shape():
+    """`inheritance=True` emits subclasses as `allOf` over one shape
+    definition per base, and still validates like the flat output."""
+
+    class EventBase(Schema):
+        id = fields.Integer(required=True)
+        source = fields.String()
+
+    class ClickEvent(EventBase):
+        x = fields.Integer(required=True)
+
+    class DoubleClickEvent(ClickEvent):
+        count = fields.Integer()
+
+    class RenamedEvent(EventBase):
+        source = fields.Integer()
+
+    class EventEnvelope(Schema):
+        click = fields.Nested(ClickEvent)
+        double = fields.Nested(DoubleClickEvent)
+        renamed = fields.Nested(RenamedEvent)
+        base = fields.Nested(EventBase)
+
+    flat_stats = GenerationStats()
+    stats = GenerationStats()
+    flat = JSONSchema(stats=flat_stats).dump(EventEnvelope())
+    dumped = JSONSchema(inheritance=True, stats=stats).dump(EventEnvelope())
+    definitions = dumped["definitions"]
+
+    assert definitions["ClickEvent"]["allOf"] == [
+        {"$ref": "#/definitions/EventBase.shape"}
+    ]
+    assert definitions["ClickEvent"]["properties"]["id"] == {}
+    assert definitions["ClickEvent"]["required"] == ["x"]
+    assert definitions["DoubleClickEvent"]["allOf"] == [
+        {"$ref": "#/definitions/ClickEvent.shape"}
+    ]
+    assert "additionalProperties" not in definitions["EventBase.shape"]
+    assert definitions["EventBase.shape"]["required"] == ["id"]
+    # Overriding an inherited field opts the subclass out.
+    assert "allOf" not in definitions["RenamedEvent"]
+    assert "allOf" not in definitions["EventBase"]
+    # `id` and `source` are generated once for both subclasses.
+    assert flat_stats.fields_visited["python_type"] == 11
+    assert stats.fields_visited["python_type"] == 9
+
+    flat_validator = jsonschema.Draft7Validator(flat)
+    validator = jsonschema.Draft7Validator(dumped)
+    for instance in (
+        {"click": {"id": 1, "x": 2}},
+        {"click": {"x": 2}},
+        {"click": {"id": 1, "x": 2, "extra": 1}},
+        {"double": {"id": 1, "x": 2, "count": 3}},
+        {"double": {"id": "1", "x": 2}},
+        {"double": {"id": 1}},
+        {"renamed": {"id": 1, "source": 1}},
+        {"base": {"id": 1, "x": 2}},
+    ):
+        assert flat_validator.is_valid(instance) == validator.is_valid(
+            instance
+        ), instance
+
+
+def test_inheritance_respects_meta_fields():
+    class MetaBase(Schema):
+        a = fields.String(required=True)
+        b = fields.String(required=True)
+
+    class MetaNarrowed(MetaBase):
+        class Meta:
+            fields = ("a",)
+
+    class MetaExcluded(MetaBase):
+        c = fields.String()
+
+        class Meta:
+            exclude = ("b",)
+
+    class MetaNarrowBase(Schema):
+        a = fields.String(required=True)
+        b = fields.String(required=True)
+
+        class Meta:
+            fields = ("a",)
+
+    class MetaWidened(MetaNarrowBase):
+        class Meta:
+            pass
+
+    for schema_cls, payload in (
+        (MetaNarrowed, {"a": "x"}),
+        (MetaExcluded, {"a": "x", "c": "y"}),
+        (MetaWidened, {"a": "x", "b": "y"}),
+    ):
+        schema = schema_cls()
+        dumped = JSONSchema(inheritance=True).dump(schema)
+        assert schema.validate(payload) == {}
+        assert "allOf" not in dumped["definitions"][schema_cls.__name__]
+        assert dumped == JSONSchema().dump(schema)
+        jsonschema.validate(payload, dumped)
+
+
+def test_dump_views_splits_load_and_dump():
+    """`dump_views` derives the request and response schemas from one
+    traversal, sharing the field schemas they have in common."""
+
+    class AccountSchema(Schema):
+        id = fields.Integer(dump_only=True)
+        password = fields.String(load_only=True, required=True)
+        email = fields.String(required=True, data_key="e-mail")
+
+    class SignupSchema(Schema):
+        account = fields.Nested(AccountSchema, required=True)
+        created = fields.DateTime(dump_only=True, required=True)
+        token = fields.String(load_only=True)
+        note = fields.String(required=True)
+
+    stats = GenerationStats()
+    request, response = JSONSchema(stats=stats).dump_views(
+        SignupSchema(partial=("note",))
+    )
+    assert stats.fields_visited["python_type"] == 6
+
+    account = request["definitions"]["AccountSchema"]
+    assert sorted(account["properties"]) == ["e-mail", "password"]
+    assert account["required"] == ["e-mail", "password"]
+    signup = request["definitions"]["SignupSchema"]
+    assert sorted(signup["properties"]) == ["account", "note", "token"]
+    assert signup["required"] == ["account"]
+
+    account = response["definitions"]["AccountSchema"]
+    assert sorted(account["properties"]) == ["e-mail", "id"]
+    assert account["required"] == ["e-mail"]
+    signup = response["definitions"]["SignupSchema"]
+    assert sorted(signup["properties"]) == ["account", "created", "note"]
+    # `partial` doesn't apply to dumping.
+    assert signup["required"] == ["account", "created", "note"]
+
+    assert (
+        request["definitions"]["AccountSchema"]["properties"]["e-mail"]
+        is response["definitions"]["AccountSchema"]["properties"]["e-mail"]
+    )
+    with pytest.raises(TypeError):
+        request["definitions"]["SignupSchema"]["required"].append("token")
+
+    validator = jsonschema.Draft7Validator(request)
+    assert validator.is_valid({"account": {"e-mail": "a@b.c", "password": "x"}})
+    assert not validator.is_valid({"account": {"e-mail": "a@b.c"}})
+    assert not validator.is_valid(
+        {"account": {"e-mail": "a@b.c", "password": "x", "id": 1}}
+    )
+    validator = jsonschema.Draft7Validator(response)
+    assert validator.is_valid(
+        {"account": {"e-mail": "a@b.c", "id": 1}, "created": "x", "note": "n"}
+    )
+    assert not validator.is_valid(
+        {"account": {"e-mail": "a@b.c", "password": "x"}, "created": "x", "note": "n"}
+    )
+
+
+def test_dump_views_inheritance_shapes():
+    class BaseUserSchema(Schema):
+        id = fields.Integer(dump_only=True, required=True)
+        name = fields.String(required=True)
+
+    class AdminSchema(BaseUserSchema):
+        secret = fields.String(load_only=True)
+
+    request, response = JSONSchema(inheritance=True).dump_views(AdminSchema)
+
+    shape = request["definitions"]["BaseUserSchema.shape"]
+    assert list(shape["properties"]) == ["name"]
+    assert shape["required"] == ["name"]
+    assert list(request["definitions"]["AdminSchema"]["properties"]) == [
+        "name",
+        "secret",
+    ]
+    shape = response["definitions"]["BaseUserSchema.shape"]
+    assert shape["required"] == ["id", "name"]
+    assert list(response["definitions"]["AdminSchema"]["properties"]) == [
+        "id",
+        "name",
+    ]
+    assert "required" not in response["definitions"]["AdminSchema"]
+
+
+def test_dump_views_twice_on_one_generator():
+    class ViewAddressSchema(Schema):
+        id = fields.Integer(dump_only=True)
+        street = fields.String()
+
+    class ViewUserSchema(Schema):
+        address = fields.Nested(ViewAddressSchema)
+
+    generator = JSONSchema()
+    generator.dump(ViewUserSchema())
+    for _ in range(2):
+        request, response = generator.dump_views(ViewUserSchema())
+        address = request["definitions"]["ViewAddressSchema"]
+        assert list(address["properties"]) == ["street"]
+        address = response["definitions"]["ViewAddressSchema"]
+        assert list(address["properties"]) == ["id", "street"]
@@ -0,0 +1,83 @@
+import copy
+import json
+import pickle
+
+import pytest
+
+from marshmallow import Schema, fields
+
+from marshmallow_jsonschema import JSONSchema
+from marshmallow_jsonschema.cache import MemoryCache
+from marshmallow_jsonschema.frozen import FrozenDict, FrozenList, freeze, thaw
+from . import UserSchema
+
+
+def test_freeze_blocks_mutation():
+    frozen = freeze({"a": [1, {"b": 2}], "c": (3,)})
+
+    assert isinstance(frozen, FrozenDict)
+    assert isinstance(frozen["a"], FrozenList)
+    assert isinstance(frozen["a"][1], FrozenDict)
+    assert frozen == {"a": [1, {"b": 2}], "c": [3]}
+    assert json.loads(json.dumps(frozen)) == frozen
+
+    for mutate in (
+        lambda: frozen.__setitem__("x", 1),
+        lambda: frozen.pop("a"),
+        lambda: frozen.update(x=1),
+        lambda: frozen.setdefault("x", 1),
+        lambda: frozen["a"].append(4),
+        lambda: frozen["a"].sort(),
+        lambda: frozen["a"][1].clear(),
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    with pytest.raises(TypeError):
+        frozen |= {"x": 1}
+    with pytest.raises(TypeError):
+        del frozen["a"][0]
+
+
+def test_freeze_copy_pickle_and_thaw():
+    frozen = freeze({"a": [1, {"b": 2}]})
+
+    assert freeze(frozen) is frozen
+    assert copy.copy(frozen) is frozen
+    assert copy.deepcopy(frozen) is frozen
+    unpickled = pickle.loads(pickle.dumps(frozen))
+    assert unpickled == frozen
+    assert isinstance(unpickled["a"], FrozenList)
+
+    thawed = thaw(frozen)
+    assert type(thawed) is dict and type(thawed["a"]) is list
+    thawed["a"][1]["b"] = 3
+    assert frozen["a"][1]["b"] == 2
+
+
+def test_memory_cache_returns_shared_frozen_document():
+    cache = MemoryCache()
+    first = JSONSchema(cache=cache).dump(UserSchema())
+    second = JSONSchema(cache=cache).dump(UserSchema())
+    third = JSONSchema(cache=cache).dump(UserSchema())
+
+    assert first == second
+    assert second is third
+    assert isinstance(second["definitions"]["Address"]["properties"], FrozenDict)
+    with pytest.raises(TypeError):
+        second["definitions"]["Address"]["properties"]["street"] = {}
+
+
+def test_memory_cache_hit_then_other_schema_on_same_instance():
+    class FrozenOther(Schema):
+        name = fields.String()
+
+    cache = MemoryCache()
+    json_schema = JSONSchema(cache=cache)
+    json_schema.dump(UserSchema())
+    json_schema.dump(UserSchema())
+
+    other = json_schema.dump(FrozenOther())
+
+    assert other["$ref"] == "#/definitions/FrozenOther"
+    assert "FrozenOther" in other["definitions"]
+    assert json_schema.dump(FrozenOther()) == other
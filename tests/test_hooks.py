@@ -0,0 +1,191 @@
+import contextlib
+
+import pytest
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import JSONSchema, UnsupportedValueError
+from marshmallow_jsonschema.hooks import (
+    GenerationHook,
+    SpanHook,
+    TopNReporter,
+    register_hook,
+    unregister_hook,
+)
+
+
+class HookAddress(Schema):
+    street = fields.String(validate=validate.Length(min=1))
+
+
+class HookUser(Schema):
+    name = fields.String()
+    address = fields.Nested(HookAddress)
+    previous = fields.Nested(HookAddress, many=True)
+
+
+class RecordingHook(GenerationHook):
+    def __init__(self):
+        self.events = []
+
+    def before_field(self, generator, obj, field):
+        self.events.append(("before_field", field.name))
+
+    def after_field(self, generator, obj, field, schema):
+        self.events.append(("after_field", field.name, schema is not None))
+
+    def before_definition(self, generator, name):
+        self.events.append(("before_definition", name))
+
+    def after_definition(self, generator, name, definition):
+        self.events.append(("after_definition", name, definition is not None))
+
+    def on_validator(self, generator, field, validator, schema):
+        self.events.append(("on_validator", field.name, schema["minLength"]))
+
+
+def test_hooks_called_around_fields_and_definitions():
+    hook = RecordingHook()
+    plain = JSONSchema().dump(HookUser())
+
+    dumped = JSONSchema(hooks=[hook]).dump(HookUser())
+
+    assert dumped == plain
+    assert hook.events == [
+        ("before_definition", "HookUser"),
+        ("before_field", "address"),
+        ("before_definition", "HookAddress"),
+        ("before_field", "street"),
+        ("on_validator", "street", 1),
+        ("after_field", "street", True),
+        ("after_definition", "HookAddress", True),
+        ("after_field", "address", True),
+        ("before_field", "name"),
+        ("after_field", "name", True),
+        ("before_field", "previous"),
+        ("after_field", "previous", True),
+        ("after_definition", "HookUser", True),
+    ]
+
+
+def test_hooks_after_callbacks_run_on_error():
+    class Broken(fields.Field):
+        pass
+
+    class BrokenSchema(Schema):
+        broken = Broken()
+
+    hook = RecordingHook()
+    with pytest.raises(UnsupportedValueError):
+        JSONSchema(hooks=[hook]).dump(BrokenSchema())
+
+    assert hook.events == [
+        ("before_definition", "BrokenSchema"),
+        ("before_field", "broken"),
+        ("after_field", "broken", False),
+        ("after_definition", "BrokenSchema", False),
+    ]
+
+
+def test_span_hook():
+    spans = []
+
+    class ListSpans(SpanHook):
+        @contextlib.contextmanager
+        def span(self, kind, name):
+            spans.append(("enter", kind, name))
+            yield
+            spans.append(("exit", kind, name))
+
+    JSONSchema(hooks=[ListSpans()]).dump(HookAddress())
+
+    assert spans == [
+        ("enter", "definition", "HookAddress"),
+        ("enter", "field", "HookAddress.street"),
+        ("exit", "field", "HookAddress.street"),
+        ("exit", "definition", "HookAddress"),
+    ]
+
+
+def test_top_n_reporter():
+    reporter = TopNReporter()
+    JSONSchema(hooks=[reporter]).dump(HookUser())
+
+    top = reporter.top(3)
+    assert len(top) == 3
+    assert top[0][:2] == ("definition", "HookUser")
+    assert [row[2] for row in top] == sorted((row[2] for row in top), reverse=True)
+    fields_only = reporter.top(10, kind="field")
+    assert {name for _, name, _, _ in fields_only} == {
+        "HookUser.name",
+        "HookUser.address",
+        "HookUser.previous",
+        "HookAddress.street",
+    }
+    assert "HookUser.address" in reporter.format()
+
+    reporter.reset()
+    assert reporter.top() == []
+
+
+def test_register_hook_globally():
+    hook = RecordingHook()
+    register_hook(hook)
+    try:
+        json_schema = JSONSchema()
+    finally:
+        unregister_hook(hook)
+    json_schema.dump(HookAddress())
+    JSONSchema().dump(HookAddress())
+
+    assert json_schema.hooks == (hook,)
+    assert hook.events.count(("before_definition", "HookAddress")) == 1
+
+
+def test_span_hook_tracks_spans_per_thread():
+    import threading
+
+    both_in_field = threading.Barrier(2, timeout=5)
+    first_done = threading.Event()
+    exits = []
+
+    class ThreadSpans(SpanHook):
+        @contextlib.contextmanager
+        def span(self, kind, name):
+            owner = threading.current_thread().name
+            yield
+            exits.append((owner, threading.current_thread().name))
+
+    class BlockingField(fields.Field):
+        def _jsonschema_type_mapping(self):
+            # Both threads have a field span open from here on; the
+            # first finishes its dump while the second is still inside.
+            both_in_field.wait()
+            if threading.current_thread().name == "second":
+                first_done.wait(5)
+            return {"type": "string"}
+
+    class BlockingSchema(Schema):
+        value = BlockingField()
+
+    hook = ThreadSpans()
+    errors = []
+
+    def run():
+        try:
+            JSONSchema(hooks=[hook]).dump(BlockingSchema())
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+        finally:
+            if threading.current_thread().name == "first":
+                first_done.set()
+
+    threads = [threading.Thread(target=run, name=name) for name in ("first", "second")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert errors == []
+    assert len(exits) == 4
+    # Every span is closed by the thread that opened it.
+    assert all(owner == closer for owner, closer in exits)
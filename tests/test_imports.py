@@ -24,3 +24,46 @@ def test_import_marshmallow_enum(monkeypatch):
     monkeypatch.undo()
 
     importlib.reload(marshmallow_jsonschema.base)
+
+
+def test_optional_integrations_imported_lazily():
+    """Importing the package must not pull in `importlib.metadata` or the
+    optional integrations; they load when a schema first needs them."""
+    import subprocess
+    import sys
+
+    code = """
+import sys
+import marshmallow_jsonschema
+from marshmallow import Schema, fields
+
+lazy = ("importlib.metadata", "marshmallow_union", "marshmallow_enum",
+        "marshmallow_oneofschema")
+assert not [m for m in lazy if m in sys.modules], sys.modules.keys()
+
+class Plain(Schema):
+    name = fields.String()
+
+marshmallow_jsonschema.JSONSchema().dump(Plain())
+assert not [m for m in lazy[1:] if m in sys.modules]
+
+from marshmallow_union import Union
+
+class WithUnion(Schema):
+    value = Union([fields.String(), fields.Integer()])
+
+dumped = marshmallow_jsonschema.JSONSchema().dump(WithUnion())
+assert "anyOf" in dumped["definitions"]["WithUnion"]["properties"]["value"]
+assert marshmallow_jsonschema.base.ALLOW_ONEOFSCHEMA
+assert "marshmallow_oneofschema" in sys.modules
+"""
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_module_attributes():
+    base = marshmallow_jsonschema.base
+
+    assert base.ALLOW_ENUMS is base.ALLOW_MARSHMALLOW_ENUM is True
+    assert base.MARSHMALLOW_MAJOR in (3, 4)
+    assert base.Union.__module__ == "marshmallow_union"
+    assert isinstance(marshmallow_jsonschema.__version__, str)
@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import JSONSchema
+from marshmallow_jsonschema.frozen import freeze
+from marshmallow_jsonschema.ndjson import validate_ndjson
+
+
+class NDJSONRecord(Schema):
+    name = fields.String(required=True)
+    tags = fields.List(fields.String(), validate=validate.Length(max=2))
+
+
+RECORDS = [
+    {"name": "ann"},
+    {"tags": ["a"]},
+    {"name": "bob", "tags": ["a", 1]},
+    {"name": "carol", "tags": ["a", "b", "c"]},
+    {"name": "dave"},
+]
+
+
+def write_ndjson(path):
+    lines = [json.dumps(record) for record in RECORDS]
+    lines.insert(2, "")
+    lines.append("{not json")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_validate_ndjson(tmp_path, workers):
+    path = write_ndjson(tmp_path / "records.ndjson")
+    seen = []
+
+    report = validate_ndjson(
+        str(path),
+        JSONSchema().dump(NDJSONRecord()),
+        workers=workers,
+        chunk_size=2,
+        max_pending=1,
+        error_sink=seen.append,
+    )
+
+    assert [(error["line"], error["path"]) for error in seen] == [
+        (2, ""),
+        (4, "/tags/1"),
+        (5, "/tags"),
+        (7, ""),
+    ]
+    assert seen[-1]["message"].startswith("Invalid JSON")
+    assert report.sample_errors == seen
+    assert report.lines == 7
+    assert report.bytes == path.stat().st_size
+    assert report.invalid_lines == 4
+    assert report.errors == 4
+    assert report.lines_per_second > 0
+    assert json.loads(json.dumps(report.as_dict()))["invalid_lines"] == 4
+
+
+def test_validate_ndjson_accepts_schemas_and_frozen_documents():
+    lines = [json.dumps(record) for record in RECORDS]
+
+    from_schema = validate_ndjson(lines, NDJSONRecord, workers=0)
+    from_frozen = validate_ndjson(
+        io.StringIO("\n".join(lines)),
+        freeze(JSONSchema().dump(NDJSONRecord())),
+        workers=0,
+        max_samples=1,
+    )
+
+    assert from_schema.invalid_lines == from_frozen.invalid_lines == 3
+    assert len(from_frozen.sample_errors) == 1
@@ -0,0 +1,124 @@
+import pytest
+from jsonschema import Draft7Validator
+from marshmallow import Schema, fields, validate
+from marshmallow_union import Union
+
+from marshmallow_jsonschema import JSONSchema, UnsupportedValueError
+from marshmallow_jsonschema.frozen import freeze
+from marshmallow_jsonschema.optimizer import (
+    collapse_nullable,
+    dedupe_any_of,
+    optimize,
+    register_pass,
+    single_enum_to_const,
+)
+
+
+class OptimizedPoint(Schema):
+    x = fields.Integer()
+
+
+class OptimizedSchema(Schema):
+    pair = fields.Tuple((fields.Integer(), fields.String()), allow_none=True)
+    kind = fields.String(validate=validate.Equal("point"))
+    amount = Union([fields.Integer(), fields.Integer(), fields.String()])
+    point = fields.Nested(OptimizedPoint, allow_none=True)
+
+
+def test_collapse_nullable():
+    nullable = {"anyOf": [{"type": "array", "maxItems": 2}, {"type": "null"}]}
+    assert collapse_nullable(nullable) == {"type": ["array", "null"], "maxItems": 2}
+
+    for kept in (
+        {"anyOf": [{"$ref": "#/definitions/A"}, {"type": "null"}]},
+        {"anyOf": [{"type": "string", "enum": ["a"]}, {"type": "null"}]},
+        {"anyOf": [{"enum": ["a"]}, {"type": "null"}]},
+        {"anyOf": [{"type": "string"}, {"type": "null"}], "title": "t"},
+    ):
+        assert collapse_nullable(kept) is kept
+
+
+def test_single_enum_to_const_and_dedupe():
+    assert single_enum_to_const({"type": "string", "enum": ["a"]}) == {
+        "type": "string",
+        "const": "a",
+    }
+    two = {"enum": ["a", "b"]}
+    assert single_enum_to_const(two) is two
+
+    assert dedupe_any_of({"anyOf": [{"type": "integer"}, {"type": "integer"}]}) == {
+        "type": "integer"
+    }
+    # JSON equality, not Python equality: `true` is not `1`.
+    distinct = {"anyOf": [{"const": True}, {"const": 1}]}
+    assert dedupe_any_of(distinct) is distinct
+
+
+def test_optimize_generated_document():
+    plain = JSONSchema().dump(OptimizedSchema())
+    frozen = freeze(plain)
+
+    optimized = optimize(frozen)
+    properties = optimized["definitions"]["OptimizedSchema"]["properties"]
+
+    assert properties["pair"]["type"] == ["array", "null"]
+    assert properties["kind"]["const"] == "point"
+    assert properties["amount"] == {
+        "anyOf": [
+            {"title": "", "type": "integer"},
+            {"title": "", "type": "string"},
+        ]
+    }
+    assert "anyOf" in properties["point"]
+    assert JSONSchema(optimize=True).dump(OptimizedSchema()) == optimized
+    assert frozen == plain
+
+    instances = [
+        {},
+        {"pair": None},
+        {"pair": [1, "a"]},
+        {"pair": ["a", 1]},
+        {"kind": "point"},
+        {"kind": "line"},
+        {"amount": 1},
+        {"amount": 1.5},
+        {"amount": "1"},
+        {"point": None},
+        {"point": {"x": 1}},
+        {"point": {"x": "1"}},
+    ]
+    plain_validator = Draft7Validator(plain)
+    optimized_validator = Draft7Validator(optimized)
+    for instance in instances:
+        assert plain_validator.is_valid(instance) == optimized_validator.is_valid(
+            instance
+        ), instance
+
+
+def test_optimizer_passes_are_toggleable():
+    plain = JSONSchema().dump(OptimizedSchema())
+
+    without_const = optimize(plain, exclude=["single_enum_to_const"])
+    only_const = JSONSchema(optimize=["single_enum_to_const"]).dump(OptimizedSchema())
+
+    props = without_const["definitions"]["OptimizedSchema"]["properties"]
+    assert props["kind"]["enum"] == ["point"]
+    assert props["pair"]["type"] == ["array", "null"]
+    props = only_const["definitions"]["OptimizedSchema"]["properties"]
+    assert props["kind"]["const"] == "point"
+    assert "anyOf" in props["pair"]
+
+    with pytest.raises(UnsupportedValueError):
+        optimize(plain, passes=["nope"])
+
+
+def test_register_pass():
+    register_pass(
+        "drop_titles", lambda schema: {k: v for k, v in schema.items() if k != "title"}
+    )
+
+    optimized = optimize(JSONSchema().dump(OptimizedPoint()), passes=["drop_titles"])
+
+    assert optimized["definitions"]["OptimizedPoint"]["properties"]["x"] == {
+        "type": "integer"
+    }
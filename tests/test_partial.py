@@ -0,0 +1,125 @@
+import pytest
+from jsonschema import Draft7Validator
+from marshmallow import Schema, fields
+from marshmallow_oneofschema import OneOfSchema
+
+from marshmallow_jsonschema import JSONSchema, UnsupportedValueError
+from marshmallow_jsonschema.dialects import schema_ir
+from marshmallow_jsonschema.partial import partial_variant
+from marshmallow_jsonschema.stats import GenerationStats
+
+
+class PartialAddress(Schema):
+    city = fields.String(required=True)
+    street = fields.String()
+
+
+class PartialUser(Schema):
+    name = fields.String(required=True, data_key="fullName")
+    email = fields.String(required=True)
+    age = fields.Integer()
+    address = fields.Nested(PartialAddress, required=True)
+
+
+def test_partial_variant_matches_partial_dump():
+    for partial in (True, ("name",), ("email", "address", "unknown")):
+        assert partial_variant(PartialUser(), partial) == JSONSchema().dump(
+            PartialUser(partial=partial)
+        )
+
+
+def test_partial_variant_reuses_full_document():
+    stats = GenerationStats()
+    full = schema_ir(PartialUser(), JSONSchema(stats=stats))
+    dumps = stats.dumps
+
+    patch = partial_variant(PartialUser, True, generator=JSONSchema(stats=stats))
+    rename = partial_variant(PartialUser, ["name"], generator=JSONSchema(stats=stats))
+
+    # Derived from the cached document: no field was generated again.
+    assert stats.dumps == dumps
+    assert "required" not in patch["definitions"]["PartialUser"]
+    assert rename["definitions"]["PartialUser"]["required"] == ["address", "email"]
+    assert (
+        patch["definitions"]["PartialAddress"] is full["definitions"]["PartialAddress"]
+    )
+    assert (
+        patch["definitions"]["PartialUser"]["properties"]
+        is full["definitions"]["PartialUser"]["properties"]
+    )
+    assert partial_variant(PartialUser, True) is patch
+    assert partial_variant(PartialUser, ()) is full
+    with pytest.raises(TypeError):
+        patch["definitions"]["PartialUser"]["properties"].pop("age")
+
+
+def test_partial_variant_recursive():
+    patch = partial_variant(PartialUser, True, recursive=True)
+
+    assert "required" not in patch["definitions"]["PartialAddress"]
+    assert Draft7Validator(patch).is_valid({"address": {}})
+    assert not Draft7Validator(partial_variant(PartialUser, True)).is_valid(
+        {"address": {}}
+    )
+    with pytest.raises(UnsupportedValueError):
+        partial_variant(PartialUser, ("name",), recursive=True)
+
+
+def test_partial_variant_inheritance_shapes():
+    class PartialBase(Schema):
+        id = fields.Integer(required=True)
+
+    class PartialChild(PartialBase):
+        label = fields.String(required=True)
+
+    class PartialHolder(Schema):
+        child = fields.Nested(PartialChild, required=True)
+        other = fields.Nested(PartialBase)
+
+    generator = JSONSchema(inheritance=True)
+    full = JSONSchema(inheritance=True).dump(PartialChild())
+    patch = partial_variant(PartialChild, ("id",), generator=generator)
+    definitions = patch["definitions"]
+
+    assert definitions["PartialChild"]["allOf"] == [
+        {"$ref": "#/definitions/PartialBase.shape.partial"}
+    ]
+    assert definitions["PartialChild"]["required"] == ["label"]
+    assert "required" not in definitions["PartialBase.shape.partial"]
+    assert definitions["PartialBase.shape"] == full["definitions"]["PartialBase.shape"]
+    validator = Draft7Validator(patch)
+    assert validator.is_valid({"label": "x"})
+    assert not validator.is_valid({"id": 1})
+
+    holder = partial_variant(PartialHolder, True, generator=generator)
+    # Nested definitions keep their shapes.
+    assert holder["definitions"]["PartialChild"]["allOf"] == [
+        {"$ref": "#/definitions/PartialBase.shape"}
+    ]
+    assert "required" not in holder["definitions"]["PartialHolder"]
+
+
+def test_partial_variant_rejects_oneof_root():
+    class PartialOneOf(OneOfSchema):
+        type_schemas = {"address": PartialAddress}
+
+    with pytest.raises(UnsupportedValueError):
+        partial_variant(PartialOneOf())
+
+
+def test_partial_variant_cache_tells_schemas_apart():
+    first = Schema.from_dict({"a": fields.String(required=True)})
+    second = Schema.from_dict({"b": fields.String(required=True)})
+
+    assert list(
+        partial_variant(first)["definitions"]["GeneratedSchema"]["properties"]
+    ) == ["a"]
+    assert list(
+        partial_variant(second)["definitions"]["GeneratedSchema"]["properties"]
+    ) == ["b"]
+
+    partial_variant(PartialAddress(dump_only=("city",)))
+    city = partial_variant(PartialAddress())["definitions"]["PartialAddress"][
+        "properties"
+    ]["city"]
+    assert "readOnly" not in city
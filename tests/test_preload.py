@@ -0,0 +1,184 @@
+import random
+
+import pytest
+from marshmallow import (
+    EXCLUDE,
+    INCLUDE,
+    Schema,
+    ValidationError,
+    fields,
+    pre_load,
+    validate,
+)
+from marshmallow_union import Union
+
+from marshmallow_jsonschema.preload import PreloadJSONSchema, PreloadValidator
+
+
+class PreloadTag(Schema):
+    label = fields.String(required=True, validate=validate.Length(min=1))
+
+
+class PreloadLoose(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    size = fields.Float()
+
+
+class PreloadHooked(Schema):
+    value = fields.Integer(strict=True)
+
+    @pre_load
+    def unwrap(self, data, **kwargs):
+        return {"value": data} if isinstance(data, int) else data
+
+
+class PreloadItem(Schema):
+    name = fields.String(
+        required=True, data_key="Name", validate=validate.Length(max=5)
+    )
+    code = fields.String(validate=validate.Regexp(r"[A-Z]{2}"))
+    kind = fields.String(validate=validate.OneOf(["a", "b"]), allow_none=True)
+    count = fields.Integer(strict=True, validate=validate.Range(min=0, max=10))
+    amount = fields.Integer(validate=validate.Range(min=0))
+    price = fields.Decimal()
+    active = fields.Boolean()
+    created = fields.DateTime()
+    uid = fields.UUID()
+    tags = fields.List(fields.Nested(PreloadTag), validate=validate.Length(max=2))
+    pair = fields.Tuple((fields.String(), fields.Integer()))
+    scores = fields.Dict(keys=fields.String(), values=fields.Float())
+    loose = fields.Nested(PreloadLoose, allow_none=True)
+    hooked = fields.Nested(PreloadHooked)
+    either = Union([fields.Integer(strict=True), fields.String()])
+    constant = fields.Constant("x")
+    secret = fields.String(dump_only=True)
+
+
+VALUES = {
+    "Name": ["ok", "toolong", "", 1, None],
+    "code": ["AB", "ABC", "ab", 12],
+    "kind": ["a", "c", None, 1],
+    "count": [0, 10, 11, -1, "3", 3.0, True],
+    "amount": [1, "2", "x", -3, 1.5, True, []],
+    "price": ["1.5", 2, "abc", None, {}],
+    "active": [True, "true", 1, "nope", None, []],
+    "created": ["2020-01-01T00:00:00", "yesterday", 5],
+    "uid": ["12345678-1234-5678-1234-567812345678", "nope", 5],
+    "tags": [[], [{"label": "a"}], [{"label": ""}], [{}], [{"x": 1}], "a", [1]],
+    "pair": [["a", 1], ["a", "1"], ["a"], [1, 1], "ab"],
+    "scores": [{"a": 1.5}, {"a": "1.5"}, {"a": "x"}, [], {"a": None}],
+    "loose": [None, {"size": 1}, {"size": "x", "other": 1}, {"size": []}, 1],
+    "hooked": [{"value": 1}, 1, {"value": "1"}, "x"],
+    "either": [1, "1", 1.5, None, []],
+    "constant": ["x", "y", 1],
+    "secret": ["s"],
+    "extra": [1],
+    "name": ["lowercase key"],
+}
+
+
+class PreloadLists(Schema):
+    labels = fields.Nested(PreloadTag, many=True, required=True, allow_none=True)
+    names = fields.List(fields.String(), allow_none=True)
+
+
+LIST_VALUES = {
+    "labels": [None, [], [{"label": "a"}], [None], {"label": "a"}, [{}]],
+    "names": [None, ["a"], [None], "a"],
+    "extra": [1],
+}
+
+
+def random_payloads(count, values=VALUES, seed=0):
+    rng = random.Random(seed)
+    keys = list(values)
+    for _ in range(count):
+        chosen = rng.sample(keys, rng.randint(0, len(keys)))
+        yield {key: rng.choice(values[key]) for key in chosen}
+
+
+@pytest.mark.parametrize(
+    "schema, values, min_rejected",
+    [(PreloadItem(), VALUES, 2000), (PreloadLists(), LIST_VALUES, 1000)],
+)
+def test_preload_never_rejects_what_load_accepts(schema, values, min_rejected):
+    loader = PreloadValidator(schema)
+    rejected = accepted = 0
+
+    for payload in random_payloads(3000, values):
+        errors = loader.errors(payload)
+        try:
+            schema.load(payload)
+        except ValidationError as exc:
+            # Everything flagged up front is flagged by `load` too.
+            assert set(errors) <= set(exc.messages), payload
+            rejected += bool(errors)
+        else:
+            assert errors == {}, payload
+            accepted += 1
+
+    assert rejected > min_rejected
+    assert accepted > 0
+
+
+def test_preload_document_omits_empty_required():
+    class PreloadOptional(Schema):
+        name = fields.String()
+
+    assert (
+        "required"
+        not in PreloadJSONSchema().dump(PreloadOptional())["definitions"][
+            "PreloadOptional"
+        ]
+    )
+    assert PreloadValidator(PreloadLists).errors({"labels": None}) == {}
+
+
+@pytest.mark.parametrize(
+    "payload, keys",
+    [
+        ({}, {"Name"}),
+        ({"Name": "ok", "count": "3"}, {"count"}),
+        ({"Name": "ok", "amount": "x"}, set()),
+        ({"Name": "ok", "amount": []}, {"amount"}),
+        ({"Name": "ok", "extra": 1, "secret": "s"}, {"extra", "secret"}),
+        ({"Name": "ok", "tags": [{"label": ""}]}, {"tags"}),
+        ({"Name": "ok", "loose": {"other": 1}}, set()),
+        ({"Name": "ok", "hooked": 1}, set()),
+    ],
+)
+def test_preload_errors(payload, keys):
+    assert set(PreloadValidator(PreloadItem).errors(payload)) == keys
+
+
+def test_preload_load():
+    loader = PreloadValidator(PreloadItem())
+
+    assert loader.load({"Name": "ok", "count": 3})["count"] == 3
+    with pytest.raises(ValidationError) as excinfo:
+        loader.load({"tags": [{}]})
+    assert excinfo.value.messages == {
+        "Name": ["Missing data for required field."],
+        "tags": {0: {"label": ["Missing data for required field."]}},
+    }
+    # Load-time overrides bypass the check and go straight to `load`.
+    assert "extra" not in loader.load({"extra": 1}, partial=True, unknown=EXCLUDE)
+
+
+def test_preload_skipped_for_unsupported_schemas():
+    assert PreloadValidator(PreloadHooked).document is None
+    assert PreloadValidator(PreloadItem(partial=True)).document is None
+    assert PreloadValidator(PreloadHooked).errors("x") == {}
+
+
+def test_preload_document_follows_unknown():
+    document = PreloadJSONSchema().dump(PreloadItem(unknown=INCLUDE))
+    definitions = document["definitions"]
+
+    assert definitions["PreloadItem"]["additionalProperties"] is True
+    assert definitions["PreloadLoose"]["additionalProperties"] is True
+    assert definitions["PreloadTag"]["additionalProperties"] is False
+    assert "secret" not in definitions["PreloadItem"]["properties"]
+    assert definitions["PreloadItem"]["properties"]["hooked"] == {}
@@ -0,0 +1,77 @@
+import gc
+import multiprocessing
+import sys
+
+import pytest
+from marshmallow import Schema, fields
+
+from marshmallow_jsonschema import JSONSchema, prewarm
+from . import UserSchema
+
+
+class PrewarmItem(Schema):
+    name = fields.String()
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    yield
+    for name in prewarm.registered():
+        prewarm.unregister(name)
+
+
+def test_prewarm_generates_registered_documents(monkeypatch):
+    frozen = []
+    monkeypatch.setattr(gc, "freeze", lambda: frozen.append(True))
+    generated = []
+
+    def factory():
+        generated.append(1)
+        return JSONSchema(props_ordered=True)
+
+    prewarm.register("user", UserSchema)
+    prewarm.register("item", PrewarmItem(), generator_factory=factory)
+
+    documents = prewarm.prewarm()
+
+    assert set(documents) == {"user", "item"}
+    assert documents["user"] == JSONSchema().dump(UserSchema())
+    assert frozen == [True]
+    assert prewarm.get_document("item") is documents["item"]
+    with pytest.raises(TypeError):
+        documents["item"]["definitions"] = {}
+    prewarm.prewarm(freeze_gc=False)
+    assert generated == [1]
+    assert frozen == [True]
+
+
+def test_get_document_generates_lazily_and_reregister_resets():
+    prewarm.register("item", PrewarmItem)
+    first = prewarm.get_document("item")
+
+    assert prewarm.get_document("item") is first
+    prewarm.register("item", PrewarmItem)
+    assert prewarm.get_document("item") is not first
+
+    prewarm.unregister("item")
+    with pytest.raises(KeyError):
+        prewarm.get_document("item")
+
+
+def _child_document_id(queue):
+    queue.put(id(prewarm.get_document("item")))
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="requires fork")
+def test_forked_workers_inherit_documents():
+    prewarm.register("item", PrewarmItem)
+    document = prewarm.prewarm(freeze_gc=False)["item"]
+
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    worker = context.Process(target=_child_document_id, args=(queue,))
+    worker.start()
+    worker.join()
+
+    # Same object at the same address: inherited, not regenerated.
+    assert queue.get() == id(document)
@@ -1,4 +1,5 @@
 import marshmallow as ma
+import pytest
 
 from marshmallow_jsonschema.extensions import ReactJsonSchemaFormJSONSchema
 
@@ -19,3 +20,83 @@ def test_can_dump_react_jsonschema_form():
         "last_name": {},
         "ui:order": ["first_name", "last_name"],
     }
+
+
+class UiAddress(ma.Schema):
+    street = ma.fields.String(metadata={"ui:widget": "textarea"})
+
+
+class UiUser(ma.Schema):
+    name = ma.fields.String(
+        data_key="fullName", metadata={"metadata": {"ui:autofocus": True}}
+    )
+    address = ma.fields.Nested(UiAddress, metadata={"ui:title": "Home"})
+    previous = ma.fields.List(ma.fields.Nested(UiAddress))
+    others = ma.fields.Nested(UiAddress, many=True)
+    parent = ma.fields.Nested("UiUser")
+
+
+def test_uischema_covers_nested_fields():
+    legacy_metadata = UiUser._declared_fields["name"].metadata["metadata"]
+    json_schema, uischema = ReactJsonSchemaFormJSONSchema().dump_with_uischema(UiUser())
+
+    street = {"street": {"ui:widget": "textarea"}}
+    assert uischema == {
+        "fullName": {"ui:autofocus": True},
+        "address": {"ui:title": "Home", **street},
+        "previous": {"items": street},
+        "others": {"items": street},
+        "parent": {},
+    }
+    assert set(uischema) == set(json_schema["definitions"]["UiUser"]["properties"])
+    assert legacy_metadata == {"ui:autofocus": True}
+
+
+def test_uischema_cached_per_schema_class():
+    first = ReactJsonSchemaFormJSONSchema().dump_with_uischema(UiUser())
+    second = ReactJsonSchemaFormJSONSchema().dump_with_uischema(UiUser())
+    excluded = ReactJsonSchemaFormJSONSchema().dump_with_uischema(
+        UiUser(exclude=("parent",))
+    )
+
+    assert first[0] is second[0] and first[1] is second[1]
+    assert "parent" not in excluded[1]
+    assert ReactJsonSchemaFormJSONSchema().dump_uischema(UiUser()) is first[1]
+    with pytest.raises(TypeError):
+        first[1]["address"]["ui:title"] = "Work"
+
+
+def test_uischema_with_persistent_cache(tmp_path):
+    from marshmallow_jsonschema.cache import DirectoryCache, MemoryCache
+    from marshmallow_jsonschema.extensions import react_jsonschema_form
+
+    class NotesSchema(ma.Schema):
+        a = ma.fields.String(metadata={"ui:widget": "textarea"})
+
+    for cache in (MemoryCache(), DirectoryCache(tmp_path)):
+        for _ in range(2):
+            react_jsonschema_form._UISCHEMA_CACHE.clear()
+            generator = ReactJsonSchemaFormJSONSchema(cache=cache)
+            generator.dump(NotesSchema())
+            _, uischema = generator.dump_with_uischema(NotesSchema())
+            assert uischema == {"a": {"ui:widget": "textarea"}}
+
+
+def test_uischema_after_nested_schema_was_generated():
+    from marshmallow_jsonschema.extensions import react_jsonschema_form
+
+    class UiHome(ma.Schema):
+        home = ma.fields.Nested(UiAddress)
+
+    class UiOffice(ma.Schema):
+        work = ma.fields.Nested(UiAddress)
+
+    react_jsonschema_form._UISCHEMA_CACHE.clear()
+    street = {"street": {"ui:widget": "textarea"}}
+    generator = ReactJsonSchemaFormJSONSchema()
+    assert generator.dump_with_uischema(UiHome())[1] == {"home": street}
+    json_schema, uischema = generator.dump_with_uischema(UiOffice())
+    assert uischema == {"work": street}
+    assert set(json_schema["definitions"]) == {"UiOffice", "UiAddress"}
+    # Nothing wrong was cached for other generators either.
+    assert ReactJsonSchemaFormJSONSchema().dump_uischema(UiOffice()) == {"work": street}
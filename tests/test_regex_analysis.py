@@ -0,0 +1,114 @@
+import warnings
+
+import pytest
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import (
+    JSONSchema,
+    RegexComplexityWarning,
+    UnsupportedValueError,
+)
+from marshmallow_jsonschema.regex_analysis import (
+    AMBIGUOUS_ALTERNATION,
+    NESTED_QUANTIFIER,
+    analyze_pattern,
+)
+
+IPV4 = (
+    r"^(([0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])\.){3}"
+    r"([0-9]|[1-9][0-9]|1[0-9]{2}|2[0-4][0-9]|25[0-5])$"
+)
+
+
+@pytest.mark.parametrize(
+    "pattern, issues",
+    [
+        (r"^(a+)+$", (NESTED_QUANTIFIER,)),
+        (r"^(\w+\s?)*$", (NESTED_QUANTIFIER,)),
+        (r"(?:x+x+)+y", (NESTED_QUANTIFIER,)),
+        (r"^(a|aa)+$", (AMBIGUOUS_ALTERNATION,)),
+        (r"^(\w|\d)+$", (AMBIGUOUS_ALTERNATION,)),
+        (r"(?i)^(A|a)+$", (AMBIGUOUS_ALTERNATION,)),
+        (r"^(\d+|\d+\.\d+)*$", (NESTED_QUANTIFIER, AMBIGUOUS_ALTERNATION)),
+        (r"^\d+$", ()),
+        (r"^([a-z]+\.)+[a-z]{2,}$", ()),
+        (r"^[\w.+-]+@[\w-]+\.[\w.-]+$", ()),
+        (r"^(\d{1,3}\.){3}\d{1,3}$", ()),
+        (r"^(ab|ac)*$", ()),
+        (r"^(a|ab)*$", ()),
+        (r"^((a|ab)c)*$", ()),
+        (IPV4, ()),
+        (r"[(|]+", ()),
+    ],
+)
+def test_analyze_pattern(pattern, issues):
+    assert analyze_pattern(pattern) == issues
+
+
+class RiskySchema(Schema):
+    code = fields.String(validate=validate.Regexp(r"^(a+)+$"))
+    safe = fields.String(validate=validate.Regexp(r"^\d+$"))
+
+
+def test_regex_safety_warns_by_default():
+    with pytest.warns(RegexComplexityWarning, match=r"RiskySchema\.code"):
+        JSONSchema().dump(RiskySchema())
+
+
+def test_regex_safety_error_and_off():
+    with pytest.raises(UnsupportedValueError, match="nested quantifier"):
+        JSONSchema(regex_safety="error").dump(RiskySchema())
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        dumped = JSONSchema(regex_safety="off").dump(RiskySchema())
+    props = dumped["definitions"]["RiskySchema"]["properties"]
+    assert props["code"]["pattern"] == r"^(a+)+$"
+
+    with pytest.raises(UnsupportedValueError):
+        JSONSchema(regex_safety="strict")
+
+
+def test_regex_findings_in_stats():
+    json_schema = JSONSchema(stats=True, regex_safety="error")
+    with pytest.raises(UnsupportedValueError):
+        json_schema.dump(RiskySchema())
+
+    with pytest.warns(RegexComplexityWarning):
+        json_schema = JSONSchema(stats=True)
+        json_schema.dump(RiskySchema())
+
+    assert json_schema.stats.as_dict()["regex_findings"] == [
+        {
+            "field": "RiskySchema.code",
+            "pattern": r"^(a+)+$",
+            "issues": [NESTED_QUANTIFIER],
+        }
+    ]
+    assert (
+        'marshmallow_jsonschema_regex_findings_total{issue="nested quantifier"} 1'
+        in json_schema.stats.to_prometheus().splitlines()
+    )
+
+
+def test_regex_safety_not_bypassed_by_caches():
+    from marshmallow_oneofschema import OneOfSchema
+
+    from marshmallow_jsonschema.cache import MemoryCache
+
+    class RiskyChoice(OneOfSchema):
+        type_schemas = {"risky": RiskySchema}
+
+    class RiskyHolder(Schema):
+        choice = fields.Nested(RiskyChoice)
+
+    cache = MemoryCache()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        JSONSchema(regex_safety="off", cache=cache).dump(RiskySchema())
+        JSONSchema(regex_safety="off", oneof_definitions=True).dump(RiskyHolder())
+
+    with pytest.raises(UnsupportedValueError):
+        JSONSchema(regex_safety="error", cache=cache).dump(RiskySchema())
+    with pytest.raises(UnsupportedValueError):
+        JSONSchema(regex_safety="error", oneof_definitions=True).dump(RiskyHolder())
@@ -0,0 +1,182 @@
+import asyncio
+import gzip
+import json
+from wsgiref.util import setup_testing_defaults
+
+from marshmallow import Schema, fields
+
+from marshmallow_jsonschema import JSONSchema
+from marshmallow_jsonschema.serving import SchemaApp
+from . import UserSchema
+
+
+def wsgi_get(app, path, method="GET", **headers):
+    """Minimal in-process WSGI client: returns (status, headers, body)."""
+    environ = {"PATH_INFO": path, "REQUEST_METHOD": method}
+    for name, value in headers.items():
+        environ["HTTP_" + name.upper()] = value
+    setup_testing_defaults(environ)
+    captured = {}
+
+    def start_response(status, response_headers):
+        captured["status"] = status
+        captured["headers"] = dict(response_headers)
+
+    body = b"".join(app(environ, start_response))
+    return captured["status"], captured["headers"], body
+
+
+def test_serves_document_and_definitions():
+    app = SchemaApp({"user": UserSchema})
+
+    status, headers, body = wsgi_get(app, "/user")
+    assert status == "200 OK"
+    assert headers["Content-Type"] == "application/schema+json"
+    assert json.loads(body) == JSONSchema().dump(UserSchema())
+
+    status, headers, body = wsgi_get(app, "/user/definitions/Address")
+    assert status == "200 OK"
+    assert json.loads(body) == JSONSchema().dump(UserSchema())["definitions"]["Address"]
+
+
+def test_not_found_and_method_not_allowed():
+    app = SchemaApp({"user": UserSchema})
+
+    assert wsgi_get(app, "/nope")[0] == "404 Not Found"
+    assert wsgi_get(app, "/user/definitions/Nope")[0] == "404 Not Found"
+    assert wsgi_get(app, "/user/other/Address")[0] == "404 Not Found"
+    assert wsgi_get(app, "/")[0] == "404 Not Found"
+    status, headers, _ = wsgi_get(app, "/user", method="POST")
+    assert status == "405 Method Not Allowed"
+    assert headers["Allow"] == "GET, HEAD"
+
+
+def test_etag_and_conditional_get():
+    app = SchemaApp({"user": UserSchema})
+
+    _, headers, body = wsgi_get(app, "/user")
+    etag = headers["ETag"]
+    assert etag.startswith('"') and etag.endswith('"')
+
+    status, headers, body = wsgi_get(app, "/user", if_none_match=etag)
+    assert status == "304 Not Modified"
+    assert body == b""
+    assert headers["ETag"] == etag
+
+    status, _, _ = wsgi_get(app, "/user", if_none_match='"other", W/' + etag)
+    assert status == "304 Not Modified"
+    assert wsgi_get(app, "/user", if_none_match='"other"')[0] == "200 OK"
+
+    # Definitions get their own ETags.
+    _, def_headers, _ = wsgi_get(app, "/user/definitions/Address")
+    assert def_headers["ETag"] != etag
+
+
+def test_gzip_compressed_once():
+    app = SchemaApp({"user": UserSchema})
+
+    status, headers, body = wsgi_get(app, "/user", accept_encoding="br, gzip")
+    assert status == "200 OK"
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["Vary"] == "Accept-Encoding"
+    assert int(headers["Content-Length"]) == len(body)
+    plain = wsgi_get(app, "/user")[2]
+    assert gzip.decompress(body) == plain
+
+    _, _, again = wsgi_get(app, "/user", accept_encoding="gzip")
+    assert again is body
+
+    _, headers, _ = wsgi_get(app, "/user", accept_encoding="gzip;q=0")
+    assert "Content-Encoding" not in headers
+
+    # A gzip ETag revalidates against either representation.
+    status, _, _ = wsgi_get(app, "/user", if_none_match=headers["ETag"])
+    assert status == "304 Not Modified"
+
+
+def test_head_and_generator_factory():
+    class Item(Schema):
+        name = fields.String()
+
+    generated = []
+
+    def factory():
+        generated.append(1)
+        return JSONSchema(props_ordered=True)
+
+    app = SchemaApp({"item": Item}, generator_factory=factory, cache_control=None)
+    app.prewarm()
+    status, headers, body = wsgi_get(app, "/item", method="HEAD")
+    wsgi_get(app, "/item")
+
+    assert status == "200 OK"
+    assert body == b""
+    assert int(headers["Content-Length"]) > 0
+    assert "Cache-Control" not in headers
+    assert generated == [1]
+
+
+def test_asgi():
+    app = SchemaApp({"user": UserSchema})
+    sent = []
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/user/definitions/GithubProfile",
+        "headers": [(b"accept-encoding", b"gzip")],
+    }
+    asyncio.run(app.asgi(scope, receive, send))
+
+    start, body = sent
+    assert start["status"] == 200
+    headers = dict(start["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert json.loads(gzip.decompress(body["body"]))["properties"]["uri"]
+
+    sent.clear()
+    scope["headers"] = [(b"if-none-match", headers[b"etag"])]
+    asyncio.run(app.asgi(scope, receive, send))
+    assert sent[0]["status"] == 304
+
+
+def test_definition_hash_index_and_etags():
+    class Address(Schema):
+        city = fields.String()
+
+    class Customer(Schema):
+        name = fields.String()
+        address = fields.Nested(Address)
+
+    class RenamedCustomer(Schema):
+        full_name = fields.String()
+        address = fields.Nested(Address)
+
+    before = SchemaApp({"user": Customer})
+    after = SchemaApp(
+        {"user": RenamedCustomer},
+        generator_factory=lambda: JSONSchema(content_hashes="x-content-hash"),
+    )
+
+    status, _, body = wsgi_get(before, "/user/definitions")
+    assert status == "200 OK"
+    hashes = json.loads(body)
+    assert sorted(hashes) == ["Address", "Customer"]
+    _, headers, _ = wsgi_get(before, "/user/definitions/Address")
+    assert headers["ETag"] == '"{}"'.format(hashes["Address"])
+
+    # An untouched definition keeps its ETag across a deploy, even once
+    # its hash is embedded in the body.
+    _, headers, body = wsgi_get(after, "/user/definitions/Address")
+    assert headers["ETag"] == '"{}"'.format(hashes["Address"])
+    assert json.loads(body)["x-content-hash"] == hashes["Address"]
+    status, _, _ = wsgi_get(
+        after, "/user/definitions/Address", if_none_match=headers["ETag"]
+    )
+    assert status == "304 Not Modified"
@@ -0,0 +1,85 @@
+import json
+
+from marshmallow import Schema, fields, validate
+
+from marshmallow_jsonschema import JSONSchema
+from marshmallow_jsonschema.stats import GenerationStats
+from . import UserSchema
+
+
+def test_stats_disabled_by_default():
+    json_schema = JSONSchema()
+    json_schema.dump(UserSchema())
+
+    assert json_schema.stats is None
+
+
+def test_stats_counts_fields_definitions_and_validators():
+    json_schema = JSONSchema(stats=True)
+    dumped = json_schema.dump(UserSchema())
+
+    stats = json_schema.stats.as_dict()
+    assert stats["dumps"] == 1
+    assert stats["dump_seconds_total"] > 0
+    # UserSchema, Address and GithubProfile.
+    assert stats["definitions_generated"] == 3
+    assert stats["definitions_reused"] == 0
+    assert stats["fields_visited"]["nested"] == 2
+    assert stats["fields_visited"]["raw"] == 2
+    # Nested definitions' fields are counted too.
+    assert sum(stats["fields_visited"].values()) == (
+        len(UserSchema().fields) + 2 + 5 + 1
+    )
+    assert stats["validators_applied"] == {
+        "Length": 3,
+        "OneOf": 1,
+        "Equal": 1,
+        "Range": 1,
+    }
+    assert stats["last_output_bytes"] == len(json.dumps(dumped).encode("utf-8"))
+    json.dumps(stats)
+
+
+def test_stats_reused_definitions_and_shared_instance():
+    class Leaf(Schema):
+        name = fields.String()
+
+    class StatsTree(Schema):
+        left = fields.Nested(Leaf)
+        right = fields.Nested(Leaf)
+        parent = fields.Nested("StatsTree")
+
+    stats = GenerationStats()
+    JSONSchema(stats=stats).dump(StatsTree())
+    JSONSchema(stats=stats).dump(StatsTree())
+
+    assert stats.dumps == 2
+    # Per dump: Leaf and StatsTree are generated, the second Leaf reference and
+    # the self-reference are reused.
+    assert stats.definitions_generated == 4
+    assert stats.definitions_reused == 4
+    assert stats.output_bytes_total == 2 * stats.last_output_bytes
+
+
+def test_stats_prometheus_format():
+    class S(Schema):
+        name = fields.String(validate=validate.Length(max=3))
+
+    json_schema = JSONSchema(stats=True)
+    json_schema.dump(S())
+
+    text = json_schema.stats.to_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE marshmallow_jsonschema_dumps_total counter" in lines
+    assert "marshmallow_jsonschema_dumps_total 1" in lines
+    assert 'marshmallow_jsonschema_definitions_total{outcome="generated"} 1' in lines
+    assert 'marshmallow_jsonschema_fields_visited_total{handler="python_type"} 1' in (
+        lines
+    )
+    assert 'marshmallow_jsonschema_validators_applied_total{validator="Length"} 1' in (
+        lines
+    )
+    assert text.endswith("\n")
+
+    json_schema.stats.reset()
+    assert json_schema.stats.as_dict()["dumps"] == 0